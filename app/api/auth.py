@@ -9,6 +9,8 @@ from app.exceptions.auth import (
     UserNotFoundHTTPError,
     InvalidPasswordError,
     InvalidPasswordHTTPError,
+    PasswordHashingBusyError,
+    PasswordHashingBusyHTTPError,
 )
 from app.schemas.user import SUserAddRequest, SUserAuth
 from app.schemas.relations_users_roles import SUserGetWithRels
@@ -26,6 +28,8 @@ async def register_user(
         await AuthService(db).register_user(user_data)
     except UserAlreadyExistsError:
         raise UserAlreadyExistsHTTPError
+    except PasswordHashingBusyError:
+        raise PasswordHashingBusyHTTPError
     return {"status": "OK"}
 
 
@@ -41,6 +45,8 @@ async def login_user(
         raise UserNotFoundHTTPError
     except InvalidPasswordError:
         raise InvalidPasswordHTTPError
+    except PasswordHashingBusyError:
+        raise PasswordHashingBusyHTTPError
     response.set_cookie("access_token", access_token)
     return {"access_token": access_token}
 
@@ -1,31 +1,169 @@
-from typing import Annotated
+from typing import Annotated, Sequence
 
-from fastapi import Depends, Request
-from pydantic import BaseModel, Field
+from fastapi import Depends, Query, Request, Response
 
+from app.config import settings
 from app.database.database import async_session_maker, get_db
+from app.database.replicas import needs_primary, replica_set
 from app.exceptions.auth import (
     InvalidJWTTokenError,
     InvalidTokenHTTPError,
+    JWTTokenExpiredError,
+    JWTTokenExpiredHTTPError,
     NoAccessTokenHTTPError,
 )
+from app.exceptions.expand import (
+    ExpandTooDeepError,
+    ExpandTooDeepHTTPError,
+    InvalidExpandError,
+    InvalidExpandHTTPError,
+)
+from app.exceptions.pagination import (
+    InvalidCursorError,
+    InvalidCursorHTTPError,
+    InvalidIdsHTTPError,
+    TooManyIdsHTTPError,
+)
 from app.services.auth import AuthService
+from app.services.roles import role_registry
 from app.database.db_manager import DBManager
 from app.models.users import UserModel
-from app.models.roles import RoleModel
+from app.schemas.user import SUserPrincipal
+from app.utils.cache import TTLCache
+from app.utils.expand import Expansion, Expansions
+from app.utils.pagination import (
+    SortKey,
+    decode_cursor,
+    encode_cursor,
+    keyset_condition,
+    sort_keys,
+)
+from sqlalchemy.exc import DBAPIError
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import Select, select
 from fastapi import HTTPException, status
 
 
-class PaginationParams(BaseModel):
-    page: int | None = Field(default=1, ge=1)
-    per_page: int | None = Field(default=5, ge=1, le=30)
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+# Наибольший id, который помещается в BIGINT: больший драйвер не передаст в БД
+MAX_ID = 2 ** 63 - 1
+
+
+class PaginationParams:
+    """
+    Параметры пагинации списков: смещение (skip/limit) или курсор (keyset).
+    Курсор следующей страницы возвращается в заголовке X-Next-Cursor.
+    """
+
+    def __init__(
+        self,
+        skip: int = Query(0, ge=0, description="Количество записей для пропуска"),
+        limit: int = Query(100, ge=1, le=100, description="Лимит записей"),
+        cursor: str | None = Query(
+            None, description="Курсор следующей страницы (заголовок X-Next-Cursor)"
+        ),
+    ) -> None:
+        self.skip = skip
+        self.limit = limit
+        self.cursor = cursor
+        self._keys: list[SortKey] = []
+
+    def paginate(self, query: Select, *order_by) -> Select:
+        """
+        Сортирует запрос и ограничивает его текущей страницей.
+        Последний ключ сортировки должен быть уникальным (обычно id).
+        """
+        self._keys = sort_keys(order_by)
+        query = query.order_by(*order_by)
+
+        if self.cursor:
+            try:
+                values = decode_cursor(self._keys, self.cursor)
+            except InvalidCursorError:
+                raise InvalidCursorHTTPError
+            query = query.where(keyset_condition(self._keys, values))
+        else:
+            query = query.offset(self.skip)
+
+        return query.limit(self.limit)
+
+    def paginate_offset(self, query: Select) -> Select:
+        """Пагинация только смещением - для сортировок, которые нельзя закодировать в курсор"""
+        if self.cursor:
+            raise InvalidCursorHTTPError
+        return query.offset(self.skip).limit(self.limit)
+
+    def set_next_cursor(self, response: Response, items: Sequence) -> None:
+        # Полная страница - возможно, есть следующая
+        if self._keys and len(items) == self.limit:
+            response.headers[NEXT_CURSOR_HEADER] = encode_cursor(self._keys, items[-1])
 
 
 PaginationDep = Annotated[PaginationParams, Depends()]
 
 
+class BatchIds:
+    """
+    Пакетная выборка по id (?ids=1,2,3) вместо запроса на каждый объект.
+    Ответ - список в порядке переданных id, null на месте ненайденных.
+    """
+
+    def __init__(
+        self,
+        ids: str | None = Query(
+            None, description=f"Id через запятую (до {settings.BATCH_MAX_IDS}); фильтры и пагинация не применяются"
+        ),
+    ) -> None:
+        self.ids: list[int] | None = None
+        if ids is None:
+            return
+        parts = [part for part in ids.split(",") if part.strip()]
+        # Лимит проверяется до разбора, чтобы не конвертировать весь параметр
+        if len(parts) > settings.BATCH_MAX_IDS:
+            raise TooManyIdsHTTPError
+        try:
+            self.ids = [int(part) for part in parts]
+        except ValueError:
+            raise InvalidIdsHTTPError
+        if not self.ids or any(not 1 <= id_ <= MAX_ID for id_ in self.ids):
+            raise InvalidIdsHTTPError
+
+    def filter(self, query: Select, id_column) -> Select:
+        """Один запрос с IN по уникальным id"""
+        return query.where(id_column.in_(set(self.ids)))
+
+    def arrange(self, items: Sequence) -> list:
+        by_id = {item.id: item for item in items}
+        return [by_id.get(id_) for id_ in self.ids]
+
+
+BatchIdsDep = Annotated[BatchIds, Depends()]
+
+
+class ExpandParams:
+    """
+    Раскрытие связей в списке (?expand=client,freelancer.user): связанные
+    объекты загружаются вместе со страницей и вкладываются в ответ.
+    Использование: expansion: Expansion = Depends(ExpandParams(PROJECT_EXPANSIONS))
+    """
+
+    def __init__(self, expansions: Expansions) -> None:
+        self.expansions = expansions
+
+    def __call__(
+        self,
+        expand: str | None = Query(
+            None, description=f"Связи через запятую, вложенные через точку (до {settings.EXPAND_MAX_DEPTH} уровней)"
+        ),
+    ) -> Expansion:
+        try:
+            return self.expansions.parse(expand, settings.EXPAND_MAX_DEPTH)
+        except ExpandTooDeepError:
+            raise ExpandTooDeepHTTPError
+        except InvalidExpandError:
+            raise InvalidExpandHTTPError
+
+
 def get_token(request: Request) -> str:
     token = request.cookies.get("access_token", None)
     if token is None:
@@ -33,21 +171,48 @@ def get_token(request: Request) -> str:
     return token
 
 
-def get_current_user_id(token: str = Depends(get_token)) -> int:
+def get_token_payload(token: str = Depends(get_token)) -> dict:
     try:
-        data = AuthService.decode_token(token)
+        return AuthService.decode_token(token)
     except InvalidJWTTokenError:
         raise InvalidTokenHTTPError
-    return data["user_id"]
+    except JWTTokenExpiredError:
+        raise JWTTokenExpiredHTTPError
+
+
+def get_current_user_id(payload: dict = Depends(get_token_payload)) -> int:
+    user_id = payload.get("user_id")
+    if user_id is None:
+        raise InvalidTokenHTTPError
+    return user_id
 
 
 UserIdDep = Annotated[int, Depends(get_current_user_id)]
 
 
+# Кэш аутентифицированных пользователей: ключ - (user_id, время выпуска токена)
+principal_cache = TTLCache(
+    maxsize=settings.PRINCIPAL_CACHE_SIZE,
+    ttl=settings.PRINCIPAL_CACHE_TTL_SECONDS,
+)
+
+
+def invalidate_principal(user_id: int) -> None:
+    """Сбрасывает закэшированные данные пользователя после их изменения"""
+    principal_cache.pop_where(lambda key: key[0] == user_id)
+
+
 async def get_current_user(
-    user_id: int = Depends(get_current_user_id),
+    user_id: UserIdDep,
+    payload: dict = Depends(get_token_payload),
     db: AsyncSession = Depends(get_db)
-) -> UserModel:
+) -> SUserPrincipal:
+    cache_key = (user_id, payload.get("iat"))
+
+    principal: SUserPrincipal | None = principal_cache.get(cache_key)
+    if principal is not None:
+        return principal
+
     result = await db.execute(
         select(UserModel).where(UserModel.id == user_id)
     )
@@ -57,19 +222,25 @@ async def get_current_user(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Пользователь не найден"
         )
-    return user
+
+    principal = SUserPrincipal.model_validate(user, from_attributes=True)
+    principal_cache.set(cache_key, principal)
+    return principal
+
+
+def get_token_role(payload: dict = Depends(get_token_payload)) -> str | None:
+    """Роль из подписанного токена (выставляется при логине)"""
+    return payload.get("role")
 
 
 async def get_current_admin(
-    user: UserModel = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db)
-) -> UserModel:
-    # Проверяем, что пользователь админ
-    result = await db.execute(
-        select(RoleModel).where(RoleModel.id == user.role_id)
-    )
-    role = result.scalar_one_or_none()
-    if not role or role.name != "admin":
+    user: SUserPrincipal = Depends(get_current_user),
+    token_role: str | None = Depends(get_token_role),
+) -> SUserPrincipal:
+    # Проверяем, что пользователь админ. Название роли берем из таблицы ролей
+    # в памяти (актуально после переименования), иначе - из claim токена
+    role_name = role_registry.get_name(user.role_id) or token_role
+    if role_name != "admin":
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Недостаточно прав администратора"
@@ -82,4 +253,25 @@ async def get_db():
         yield db
 
 
-DBDep = Annotated[DBManager, Depends(get_db)]
\ No newline at end of file
+DBDep = Annotated[DBManager, Depends(get_db)]
+
+
+async def get_read_db(request: Request) -> AsyncSession:
+    """
+    Сессия для эндпоинтов, которые только читают данные: реплика или основная
+    БД, если пользователь недавно писал или ответ попадет в кэш ответов
+    (см. app/database/replicas.py)
+    """
+    session = await replica_set.open_session(primary=needs_primary(request))
+    try:
+        yield session
+    except DBAPIError as ex:
+        # Соединение оборвалось во время запроса - реплика исключается
+        if ex.connection_invalidated:
+            replica_set.eject(session.bind, ex)
+        raise
+    finally:
+        await session.close()
+
+
+ReadDBDep = Annotated[AsyncSession, Depends(get_read_db)]
\ No newline at end of file
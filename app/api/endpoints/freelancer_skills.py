@@ -9,6 +9,7 @@ from app.models.skills import SkillModel
 from app.models.users import UserModel
 from app.schemas.freelancer_skills import FreelancerSkill, FreelancerSkillCreate
 from app.api.dependencies import get_current_user
+from app.services.matching import matching_engine
 
 router = APIRouter()
 
@@ -93,6 +94,10 @@ async def create_freelancer_skill(
     await db.commit()
     await db.refresh(db_freelancer_skill)
     
+    matching_engine.add_freelancer_skill(
+        freelancer_skill.freelancer_id, freelancer_skill.skill_id
+    )
+    
     return db_freelancer_skill
 
 @router.delete("/")
@@ -135,4 +140,6 @@ async def delete_freelancer_skill(
     await db.delete(db_freelancer_skill)
     await db.commit()
     
+    matching_engine.remove_freelancer_skill(freelancer_id, skill_id)
+    
     return {"message": "Связь фрилансер-навык удалена"}
\ No newline at end of file
@@ -1,4 +1,4 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, and_
 from typing import List, Optional
@@ -6,27 +6,43 @@ from app.database.database import get_db
 from app.models.freelancers import FreelancerModel
 from app.models.users import UserModel
 from app.schemas.freelancers import Freelancer, FreelancerCreate, FreelancerUpdate
-from app.api.dependencies import get_current_user
+from app.schemas.expanded import FreelancerExpanded
+from app.models.freelancer_skills import FreelancerSkillModel
+from app.models.projects import ProjectModel
+from app.schemas.matching import ProjectMatch
+from app.api.expansions import FREELANCER_EXPANSIONS
+from app.api.dependencies import BatchIdsDep, ExpandParams, PaginationDep, get_current_user, get_read_db
+from app.utils.expand import Expansion
+from app.services.matching import matching_engine
 
 router = APIRouter()
 
 # ==================== CRUD для фрилансеров ====================
 
 # GET /api/freelancers/ - Получить всех фрилансеров
-@router.get("/", response_model=List[Freelancer])
+@router.get("/", response_model=List[Optional[FreelancerExpanded]], response_model_exclude_unset=True)
 async def get_freelancers(
-    skip: int = Query(0, ge=0),
-    limit: int = Query(100, ge=1, le=100),
+    response: Response,
+    pagination: PaginationDep,
+    batch: BatchIdsDep,
+    expansion: Expansion = Depends(ExpandParams(FREELANCER_EXPANSIONS)),
     min_rate: Optional[float] = Query(None, ge=0),
     max_rate: Optional[float] = Query(None, ge=0),
     search: Optional[str] = Query(None, min_length=1),
-    db: AsyncSession = Depends(get_db)
+    min_avg_rating: Optional[float] = Query(None, ge=1, le=5),
+    db: AsyncSession = Depends(get_read_db)
 ):
     """
     Получить список фрилансеров с пагинацией и фильтрацией.
     """
+    # Пакетная выборка по id: один запрос вместо запроса на каждый объект
+    if batch.ids is not None:
+        query = expansion.apply(batch.filter(select(FreelancerModel), FreelancerModel.id))
+        result = await db.execute(query)
+        return expansion.render(batch.arrange(result.unique().scalars().all()))
+    
     # Начинаем запрос с join таблицы пользователей, чтобы можно было искать по имени
-    query = select(FreelancerModel).join(UserModel)
+    query = expansion.apply(select(FreelancerModel).join(UserModel))
     
     if min_rate is not None:
         query = query.where(FreelancerModel.hourly_rate >= min_rate)
@@ -40,15 +56,23 @@ async def get_freelancers(
             FreelancerModel.bio.ilike(f"%{search}%")
         )
     
-    query = query.offset(skip).limit(limit)
+    # Средний рейтинг по сохраненным агрегатам, без обращения к отзывам
+    if min_avg_rating is not None:
+        query = query.where(
+            FreelancerModel.rating_count > 0,
+            FreelancerModel.rating_sum >= min_avg_rating * FreelancerModel.rating_count
+        )
+    
+    query = pagination.paginate(query, FreelancerModel.id)
     
     result = await db.execute(query)
-    freelancers = result.scalars().all()
-    return freelancers
+    freelancers = result.unique().scalars().all()
+    pagination.set_next_cursor(response, freelancers)
+    return expansion.render(freelancers)
 
 # GET /api/freelancers/{freelancer_id} - Получить фрилансера по ID
 @router.get("/{freelancer_id}", response_model=Freelancer)
-async def get_freelancer(freelancer_id: int, db: AsyncSession = Depends(get_db)):
+async def get_freelancer(freelancer_id: int, db: AsyncSession = Depends(get_read_db)):
     result = await db.execute(
         select(FreelancerModel).where(FreelancerModel.id == freelancer_id)
     )
@@ -62,6 +86,34 @@ async def get_freelancer(freelancer_id: int, db: AsyncSession = Depends(get_db))
     
     return freelancer
 
+# GET /api/freelancers/{freelancer_id}/matches - Подходящие открытые проекты
+@router.get("/{freelancer_id}/matches", response_model=List[ProjectMatch])
+async def get_freelancer_matches(
+    freelancer_id: int,
+    limit: int = Query(20, ge=1, le=100),
+    db: AsyncSession = Depends(get_read_db)
+):
+    """
+    Открытые проекты, ранжированные по доле требуемых навыков,
+    которые есть у фрилансера.
+    """
+    result = await db.execute(
+        select(FreelancerSkillModel.skill_id)
+        .where(FreelancerSkillModel.freelancer_id == freelancer_id)
+    )
+    matches = matching_engine.rank_projects(list(result.scalars()), limit)
+    if not matches:
+        return []
+    
+    result = await db.execute(
+        select(ProjectModel).where(ProjectModel.id.in_([m.id for m in matches]))
+    )
+    projects = {project.id: project for project in result.scalars()}
+    return [
+        ProjectMatch(project=projects[m.id], score=m.score, matched_skills=m.matched_skills)
+        for m in matches if m.id in projects
+    ]
+
 # POST /api/freelancers/ - Создать профиль фрилансера
 @router.post("/", response_model=Freelancer, status_code=status.HTTP_201_CREATED)
 async def create_freelancer(
@@ -99,6 +151,8 @@ async def create_freelancer(
     await db.commit()
     await db.refresh(db_freelancer)
     
+    matching_engine.upsert_freelancer(db_freelancer.id, db_freelancer.hourly_rate)
+    
     return db_freelancer
 
 # PUT /api/freelancers/{freelancer_id} - Обновить профиль фрилансера
@@ -132,6 +186,8 @@ async def update_freelancer(
     await db.commit()
     await db.refresh(db_freelancer)
     
+    matching_engine.upsert_freelancer(db_freelancer.id, db_freelancer.hourly_rate)
+    
     return db_freelancer
 
 # DELETE /api/freelancers/{freelancer_id} - Удалить профиль фрилансера
@@ -159,4 +215,6 @@ async def delete_freelancer(
     await db.delete(db_freelancer)
     await db.commit()
     
+    matching_engine.remove_freelancer(freelancer_id)
+    
     return {"message": "Профиль фрилансера удален"}
\ No newline at end of file
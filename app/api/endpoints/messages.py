@@ -1,12 +1,29 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+import asyncio
+import json
+
+from fastapi import (
+    APIRouter, Depends, HTTPException, status, Query, Request, Response,
+    WebSocket, WebSocketDisconnect,
+)
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, and_
+from sqlalchemy.orm import selectinload
 from typing import List, Optional
 from app.database.database import get_db
+from app.models.conversations import ConversationModel
 from app.models.messages import MessageModel
 from app.models.users import UserModel
-from app.schemas.messages import Message, MessageCreate, MessageUpdate
-from app.api.dependencies import get_current_user
+from app.schemas.messages import (
+    Conversation, Message, MessageCreate, MessageUpdate, UnreadCount,
+)
+from app.repositories.conversations import ConversationsRepository
+from app.repositories.unread_counters import UnreadCountersRepository
+from app.api.dependencies import PaginationDep, UserIdDep, get_current_user
+from app.config import settings
+from app.exceptions.auth import InvalidJWTTokenError, JWTTokenExpiredError
+from app.services.auth import AuthService
+from app.services.notifications import notification_hub
 
 router = APIRouter()
 
@@ -14,8 +31,8 @@ router = APIRouter()
 
 @router.get("/", response_model=List[Message])
 async def get_messages(
-    skip: int = Query(0, ge=0),
-    limit: int = Query(100, ge=1, le=100),
+    response: Response,
+    pagination: PaginationDep,
     sender_id: Optional[int] = None,
     recipient_id: Optional[int] = None,
     unread_only: Optional[bool] = Query(False),
@@ -37,13 +54,151 @@ async def get_messages(
     if unread_only:
         query = query.where(MessageModel.is_read == False)
     
-    query = query.order_by(MessageModel.timestamp.desc())
-    query = query.offset(skip).limit(limit)
+    query = pagination.paginate(
+        query, MessageModel.timestamp.desc(), MessageModel.id.desc()
+    )
     
     result = await db.execute(query)
     messages = result.scalars().all()
+    pagination.set_next_cursor(response, messages)
     return messages
 
+@router.get("/unread-count", response_model=UnreadCount)
+async def get_unread_count(
+    db: AsyncSession = Depends(get_db),
+    current_user: UserModel = Depends(get_current_user)
+):
+    """Получить количество непрочитанных входящих сообщений"""
+    count = await UnreadCountersRepository(db).get_count(current_user.id)
+    return {"unread_count": count}
+
+# ==================== Диалоги ====================
+
+def conversation_to_schema(conversation: ConversationModel, user_id: int) -> Conversation:
+    return Conversation(
+        id=conversation.id,
+        peer_id=conversation.peer_of(user_id),
+        last_message_id=conversation.last_message_id,
+        last_message_at=conversation.last_message_at,
+        unread_count=conversation.unread_for(user_id),
+        last_message=conversation.last_message,
+    )
+
+@router.get("/conversations", response_model=List[Conversation])
+async def get_conversations(
+    response: Response,
+    pagination: PaginationDep,
+    db: AsyncSession = Depends(get_db),
+    current_user: UserModel = Depends(get_current_user)
+):
+    """Получить список диалогов, начиная с последних"""
+    query = (
+        ConversationsRepository(db)
+        .user_conversations_query(current_user.id)
+        .options(selectinload(ConversationModel.last_message))
+    )
+    query = pagination.paginate(
+        query, ConversationModel.last_message_at.desc(), ConversationModel.id.desc()
+    )
+    
+    result = await db.execute(query)
+    conversations = result.scalars().all()
+    pagination.set_next_cursor(response, conversations)
+    return [
+        conversation_to_schema(conversation, current_user.id)
+        for conversation in conversations
+    ]
+
+@router.get("/conversations/{peer_id}", response_model=List[Message])
+async def get_conversation_messages(
+    peer_id: int,
+    response: Response,
+    pagination: PaginationDep,
+    db: AsyncSession = Depends(get_db),
+    current_user: UserModel = Depends(get_current_user)
+):
+    """Получить историю переписки с пользователем, начиная с последних сообщений"""
+    conversation = await ConversationsRepository(db).get_by_pair(current_user.id, peer_id)
+    if conversation is None:
+        return []
+    
+    query = select(MessageModel).where(MessageModel.conversation_id == conversation.id)
+    query = pagination.paginate(
+        query, MessageModel.timestamp.desc(), MessageModel.id.desc()
+    )
+    
+    result = await db.execute(query)
+    messages = result.scalars().all()
+    pagination.set_next_cursor(response, messages)
+    return messages
+
+# ==================== Push-уведомления ====================
+
+@router.websocket("/ws")
+async def messages_websocket(websocket: WebSocket):
+    """
+    Push-канал новых сообщений. Аутентификация - cookie access_token,
+    как и у REST-эндпоинтов. Клиент только слушает: входящие кадры игнорируются.
+    """
+    token = websocket.cookies.get("access_token")
+    try:
+        user_id = AuthService.decode_token(token).get("user_id") if token else None
+    except (InvalidJWTTokenError, JWTTokenExpiredError):
+        user_id = None
+    if user_id is None:
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
+        return
+
+    await websocket.accept()
+    subscription = notification_hub.subscribe(user_id)
+
+    async def send_events():
+        while True:
+            await websocket.send_json(await subscription.get())
+
+    async def wait_disconnect():
+        try:
+            while True:
+                await websocket.receive_text()
+        except WebSocketDisconnect:
+            pass
+
+    sender = asyncio.create_task(send_events())
+    receiver = asyncio.create_task(wait_disconnect())
+    try:
+        await asyncio.wait({sender, receiver}, return_when=asyncio.FIRST_COMPLETED)
+    finally:
+        sender.cancel()
+        receiver.cancel()
+        notification_hub.unsubscribe(subscription)
+
+
+@router.get("/stream")
+async def messages_stream(request: Request, user_id: UserIdDep):
+    """Push-канал новых сообщений через Server-Sent Events (если WebSocket недоступен)"""
+    subscription = notification_hub.subscribe(user_id)
+
+    async def events():
+        try:
+            while not await request.is_disconnected():
+                try:
+                    event = await asyncio.wait_for(
+                        subscription.get(), timeout=settings.NOTIFY_HEARTBEAT_SECONDS
+                    )
+                except asyncio.TimeoutError:
+                    # Комментарий-пинг держит соединение открытым через прокси
+                    yield ": ping\n\n"
+                    continue
+                yield f"event: {event['type']}\ndata: {json.dumps(event, default=str)}\n\n"
+        finally:
+            notification_hub.unsubscribe(subscription)
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
 @router.get("/{message_id}", response_model=Message)
 async def get_message(
     message_id: int,
@@ -97,15 +252,25 @@ async def create_message(
             detail="Нельзя отправлять сообщение самому себе"
         )
     
+    conversations = ConversationsRepository(db)
     db_message = MessageModel(
         content=message.content,
         sender_id=current_user.id,
-        recipient_id=message.recipient_id
+        recipient_id=message.recipient_id,
+        conversation_id=await conversations.get_or_create_id(current_user.id, message.recipient_id),
     )
     db.add(db_message)
+    await db.flush()
+    await conversations.add_message(db_message)
+    await UnreadCountersRepository(db).add_delta(message.recipient_id, 1)
     await db.commit()
     await db.refresh(db_message)
     
+    await notification_hub.publish(message.recipient_id, {
+        "type": "message.created",
+        "message": Message.model_validate(db_message).model_dump(mode="json"),
+    })
+    
     return db_message
 
 @router.put("/{message_id}", response_model=Message)
@@ -124,17 +289,24 @@ async def update_message(
     if not db_message:
         raise HTTPException(status_code=404, detail="Сообщение не найдено")
     
-    # Проверка прав: только отправитель может обновлять сообщение
-    if current_user.id != db_message.sender_id:
+    # Проверка прав: отмечать сообщение прочитанным может только получатель
+    if current_user.id != db_message.recipient_id:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Недостаточно прав для редактирования этого сообщения"
         )
     
+    was_read = db_message.is_read
     update_data = message_update.dict(exclude_unset=True)
     for field, value in update_data.items():
         setattr(db_message, field, value)
     
+    if db_message.is_read != was_read:
+        delta = -1 if db_message.is_read else 1
+        await db.flush()
+        await UnreadCountersRepository(db).add_delta(db_message.recipient_id, delta)
+        await ConversationsRepository(db).add_unread(db_message, delta)
+    
     await db.commit()
     await db.refresh(db_message)
     
@@ -162,7 +334,17 @@ async def delete_message(
             detail="Недостаточно прав для удаления этого сообщения"
         )
     
+    conversations = ConversationsRepository(db)
+    if db_message.conversation_id is not None:
+        # Сначала переносим ссылку на последнее сообщение, затем удаляем
+        await conversations.refresh_last_message(
+            db_message.conversation_id, exclude_message_id=db_message.id
+        )
     await db.delete(db_message)
+    if not db_message.is_read:
+        await db.flush()
+        await UnreadCountersRepository(db).add_delta(db_message.recipient_id, -1)
+        await conversations.add_unread(db_message, -1)
     await db.commit()
     
     return {"message": "Сообщение удалено"}
\ No newline at end of file
@@ -1,4 +1,4 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 from typing import List, Optional
@@ -8,7 +8,7 @@ from app.models.payments import PaymentModel
 from app.models.proposals import ProposalModel
 from app.models.users import UserModel
 from app.schemas.payments import Payment, PaymentCreate, PaymentUpdate
-from app.api.dependencies import get_current_user
+from app.api.dependencies import PaginationDep, get_current_user
 
 router = APIRouter()
 
@@ -16,8 +16,8 @@ router = APIRouter()
 
 @router.get("/", response_model=List[Payment])
 async def get_payments(
-    skip: int = Query(0, ge=0),
-    limit: int = Query(100, ge=1, le=100),
+    response: Response,
+    pagination: PaginationDep,
     status: Optional[str] = None,
     proposal_id: Optional[int] = None,
     db: AsyncSession = Depends(get_db),
@@ -32,10 +32,11 @@ async def get_payments(
     if proposal_id:
         query = query.where(PaymentModel.proposal_id == proposal_id)
     
-    query = query.offset(skip).limit(limit)
+    query = pagination.paginate(query, PaymentModel.id)
     
     result = await db.execute(query)
     payments = result.scalars().all()
+    pagination.set_next_cursor(response, payments)
     return payments
 
 @router.get("/{payment_id}", response_model=Payment)
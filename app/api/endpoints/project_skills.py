@@ -0,0 +1,143 @@
+from fastapi import APIRouter, Depends, HTTPException, status, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, and_
+from typing import List, Optional
+from app.database.database import get_db
+from app.models.project_skills import ProjectSkillModel
+from app.models.projects import ProjectModel
+from app.models.skills import SkillModel
+from app.models.users import UserModel
+from app.schemas.project_skills import ProjectSkill, ProjectSkillCreate
+from app.api.dependencies import get_current_user
+from app.services.matching import matching_engine
+
+router = APIRouter()
+
+# ==================== CRUD операции ====================
+
+@router.get("/", response_model=List[ProjectSkill])
+async def get_project_skills(
+    project_id: Optional[int] = Query(None),
+    skill_id: Optional[int] = Query(None),
+    db: AsyncSession = Depends(get_db)
+):
+    """Получить список связей проект-навык"""
+    query = select(ProjectSkillModel)
+    
+    if project_id:
+        query = query.where(ProjectSkillModel.project_id == project_id)
+    
+    if skill_id:
+        query = query.where(ProjectSkillModel.skill_id == skill_id)
+    
+    result = await db.execute(query)
+    project_skills = result.scalars().all()
+    return project_skills
+
+@router.post("/", response_model=ProjectSkill, status_code=status.HTTP_201_CREATED)
+async def create_project_skill(
+    project_skill: ProjectSkillCreate,
+    db: AsyncSession = Depends(get_db),
+    current_user: UserModel = Depends(get_current_user)
+):
+    """Добавить проекту требуемый навык"""
+    # Проверяем существование проекта
+    result = await db.execute(
+        select(ProjectModel).where(ProjectModel.id == project_skill.project_id)
+    )
+    project = result.scalar_one_or_none()
+    
+    if not project:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Проект не найден"
+        )
+    
+    # Проверяем существование навыка
+    result = await db.execute(
+        select(SkillModel).where(SkillModel.id == project_skill.skill_id)
+    )
+    skill = result.scalar_one_or_none()
+    
+    if not skill:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Навык не найден"
+        )
+    
+    # Проверяем права: только клиент проекта может указывать навыки
+    if current_user.id != project.client_id:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Недостаточно прав для изменения навыков этого проекта"
+        )
+    
+    # Проверяем, не добавлен ли уже этот навык
+    result = await db.execute(
+        select(ProjectSkillModel).where(
+            and_(
+                ProjectSkillModel.project_id == project_skill.project_id,
+                ProjectSkillModel.skill_id == project_skill.skill_id
+            )
+        )
+    )
+    existing = result.scalar_one_or_none()
+    
+    if existing:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Этот навык уже добавлен проекту"
+        )
+    
+    db_project_skill = ProjectSkillModel(**project_skill.dict())
+    db.add(db_project_skill)
+    await db.commit()
+    await db.refresh(db_project_skill)
+    
+    matching_engine.add_project_skill(project_skill.project_id, project_skill.skill_id)
+    
+    return db_project_skill
+
+@router.delete("/")
+async def delete_project_skill(
+    project_id: int,
+    skill_id: int,
+    db: AsyncSession = Depends(get_db),
+    current_user: UserModel = Depends(get_current_user)
+):
+    """Удалить связь проект-навык"""
+    result = await db.execute(
+        select(ProjectSkillModel).where(
+            and_(
+                ProjectSkillModel.project_id == project_id,
+                ProjectSkillModel.skill_id == skill_id
+            )
+        )
+    )
+    db_project_skill = result.scalar_one_or_none()
+    
+    if not db_project_skill:
+        raise HTTPException(status_code=404, detail="Связь не найдена")
+    
+    # Проверяем существование проекта
+    result = await db.execute(
+        select(ProjectModel).where(ProjectModel.id == project_id)
+    )
+    project = result.scalar_one_or_none()
+    
+    if not project:
+        raise HTTPException(status_code=404, detail="Проект не найден")
+    
+    # Проверяем права: только клиент проекта может удалять навыки
+    if current_user.id != project.client_id:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Недостаточно прав для изменения навыков этого проекта"
+        )
+    
+    await db.delete(db_project_skill)
+    await db.commit()
+    
+    matching_engine.remove_project_skill(project_id, skill_id)
+    
+    return {"message": "Связь проект-навык удалена"}
@@ -1,33 +1,49 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Response
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, and_
+from sqlalchemy import select, and_, delete
 from typing import List, Optional
 from app.database.database import get_db
-from app.models.projects import ProjectModel
+from app.database.search import project_search
+from app.models.freelancers import FreelancerModel
+from app.models.project_skills import ProjectSkillModel
+from app.models.projects import ProjectModel, ProjectStatus
 from app.models.users import UserModel
+from app.schemas.matching import FreelancerMatch
 from app.schemas.projects import Project, ProjectCreate, ProjectUpdate
-from app.api.dependencies import get_current_user
+from app.schemas.expanded import ProjectExpanded
+from app.api.expansions import PROJECT_EXPANSIONS
+from app.api.dependencies import BatchIdsDep, ExpandParams, PaginationDep, get_current_user, get_read_db
+from app.utils.expand import Expansion
+from app.services.matching import matching_engine
 
 router = APIRouter()
 
 # ==================== CRUD для проектов ====================
 
 # GET /api/projects/ - Получить все проекты
-@router.get("/", response_model=List[Project])
+@router.get("/", response_model=List[Optional[ProjectExpanded]], response_model_exclude_unset=True)
 async def get_projects(
-    skip: int = Query(0, ge=0),
-    limit: int = Query(100, ge=1, le=100),
+    response: Response,
+    pagination: PaginationDep,
+    batch: BatchIdsDep,
+    expansion: Expansion = Depends(ExpandParams(PROJECT_EXPANSIONS)),
     status: Optional[str] = None,
     min_budget: Optional[float] = Query(None, ge=0),
     max_budget: Optional[float] = Query(None, ge=0),
     search: Optional[str] = Query(None, min_length=1),
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     current_user: UserModel = Depends(get_current_user)
 ):
     """
     Получить список проектов с пагинацией и фильтрацией.
     """
-    query = select(ProjectModel)
+    # Пакетная выборка по id: один запрос вместо запроса на каждый объект
+    if batch.ids is not None:
+        query = expansion.apply(batch.filter(select(ProjectModel), ProjectModel.id))
+        result = await db.execute(query)
+        return expansion.render(batch.arrange(result.unique().scalars().all()))
+    
+    query = expansion.apply(select(ProjectModel))
     
     if status:
         query = query.where(ProjectModel.status == status)
@@ -38,23 +54,31 @@ async def get_projects(
     if max_budget is not None:
         query = query.where(ProjectModel.budget <= max_budget)
     
+    rank = None
     if search:
-        query = query.where(
-            (ProjectModel.title.ilike(f"%{search}%")) | 
-            (ProjectModel.description.ilike(f"%{search}%"))
-        )
+        query, rank = project_search.apply(query, search)
     
-    # Показываем сначала открытые проекты
-    query = query.order_by(ProjectModel.status, ProjectModel.created_at.desc())
-    query = query.offset(skip).limit(limit)
+    if rank is not None:
+        # При поиске сначала самые релевантные проекты. Ранг не хранится
+        # в строке, поэтому курсор для поисковой выдачи не выдается
+        query = query.order_by(
+            rank, ProjectModel.status, ProjectModel.created_at.desc(), ProjectModel.id.desc()
+        )
+        query = pagination.paginate_offset(query)
+    else:
+        # Показываем сначала открытые проекты
+        query = pagination.paginate(
+            query, ProjectModel.status, ProjectModel.created_at.desc(), ProjectModel.id.desc()
+        )
     
     result = await db.execute(query)
-    projects = result.scalars().all()
-    return projects
+    projects = result.unique().scalars().all()
+    pagination.set_next_cursor(response, projects)
+    return expansion.render(projects)
 
 # GET /api/projects/{project_id} - Получить проект по ID
 @router.get("/{project_id}", response_model=Project)
-async def get_project(project_id: int, db: AsyncSession = Depends(get_db)):
+async def get_project(project_id: int, db: AsyncSession = Depends(get_read_db)):
     result = await db.execute(
         select(ProjectModel).where(ProjectModel.id == project_id)
     )
@@ -68,6 +92,34 @@ async def get_project(project_id: int, db: AsyncSession = Depends(get_db)):
     
     return project
 
+# GET /api/projects/{project_id}/matches - Подходящие фрилансеры
+@router.get("/{project_id}/matches", response_model=List[FreelancerMatch])
+async def get_project_matches(
+    project_id: int,
+    limit: int = Query(20, ge=1, le=100),
+    max_hourly_rate: Optional[float] = Query(None, gt=0),
+    db: AsyncSession = Depends(get_read_db)
+):
+    """
+    Фрилансеры, ранжированные по покрытию навыков проекта, рейтингу
+    и соответствию ставки лимиту max_hourly_rate.
+    """
+    result = await db.execute(
+        select(ProjectSkillModel.skill_id).where(ProjectSkillModel.project_id == project_id)
+    )
+    matches = matching_engine.rank_freelancers(list(result.scalars()), limit, max_hourly_rate)
+    if not matches:
+        return []
+    
+    result = await db.execute(
+        select(FreelancerModel).where(FreelancerModel.id.in_([m.id for m in matches]))
+    )
+    freelancers = {freelancer.id: freelancer for freelancer in result.scalars()}
+    return [
+        FreelancerMatch(freelancer=freelancers[m.id], score=m.score, matched_skills=m.matched_skills)
+        for m in matches if m.id in freelancers
+    ]
+
 # POST /api/projects/ - Создать новый проект
 @router.post("/", response_model=Project, status_code=status.HTTP_201_CREATED)
 async def create_project(
@@ -81,6 +133,8 @@ async def create_project(
     await db.commit()
     await db.refresh(db_project)
 
+    matching_engine.set_project_open(db_project.id, db_project.status == ProjectStatus.OPEN)
+
     return db_project
 
 # PUT /api/projects/{project_id} - Обновить проект
@@ -113,6 +167,8 @@ async def update_project(
     await db.commit()
     await db.refresh(db_project)
     
+    matching_engine.set_project_open(db_project.id, db_project.status == ProjectStatus.OPEN)
+    
     return db_project
 
 # DELETE /api/projects/{project_id} - Удалить проект
@@ -137,7 +193,12 @@ async def delete_project(
             detail="Недостаточно прав для удаления этого проекта"
         )
     
+    await db.execute(
+        delete(ProjectSkillModel).where(ProjectSkillModel.project_id == project_id)
+    )
     await db.delete(db_project)
     await db.commit()
     
+    matching_engine.set_project_open(project_id, False)
+    
     return {"message": "Проект удален"}
\ No newline at end of file
@@ -1,24 +1,31 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, and_
 from typing import List, Optional
 from app.database.database import get_db
 from app.models.proposals import ProposalModel
-from app.models.projects import ProjectModel
+from app.models.projects import ProjectModel, ProjectStatus
 from app.models.freelancers import FreelancerModel
 from app.models.users import UserModel
 from app.schemas.proposals import Proposal, ProposalCreate, ProposalUpdate
-from app.api.dependencies import get_current_user
+from app.schemas.expanded import ProposalExpanded
+from app.api.expansions import PROPOSAL_EXPANSIONS
+from app.api.dependencies import ExpandParams, PaginationDep, get_current_user
+from app.utils.expand import Expansion
+from app.exceptions.base import ObjectAlreadyExistsError
+from app.exceptions.proposals import ProposalAlreadyExistsHTTPError
+from app.repositories.proposals import ProposalsRepository
 
 router = APIRouter()
 
 # ==================== CRUD для предложений ====================
 
 # GET /api/proposals/ - Получить все предложения (с фильтрами)
-@router.get("/", response_model=List[Proposal])
+@router.get("/", response_model=List[ProposalExpanded], response_model_exclude_unset=True)
 async def get_proposals(
-    skip: int = Query(0, ge=0),
-    limit: int = Query(100, ge=1, le=100),
+    response: Response,
+    pagination: PaginationDep,
+    expansion: Expansion = Depends(ExpandParams(PROPOSAL_EXPANSIONS)),
     status: Optional[str] = None,
     project_id: Optional[int] = None,
     freelancer_id: Optional[int] = None,
@@ -28,7 +35,7 @@ async def get_proposals(
     """
     Получить список предложений с пагинацией и фильтрацией.
     """
-    query = select(ProposalModel)
+    query = expansion.apply(select(ProposalModel))
     
     if status:
         query = query.where(ProposalModel.status == status)
@@ -39,12 +46,14 @@ async def get_proposals(
     if freelancer_id:
         query = query.where(ProposalModel.freelancer_id == freelancer_id)
     
-    query = query.order_by(ProposalModel.submitted_at.desc())
-    query = query.offset(skip).limit(limit)
+    query = pagination.paginate(
+        query, ProposalModel.submitted_at.desc(), ProposalModel.id.desc()
+    )
     
     result = await db.execute(query)
-    proposals = result.scalars().all()
-    return proposals
+    proposals = result.unique().scalars().all()
+    pagination.set_next_cursor(response, proposals)
+    return expansion.render(proposals)
 
 # GET /api/proposals/{proposal_id} - Получить предложение по ID
 @router.get("/{proposal_id}", response_model=Proposal)
@@ -69,68 +78,48 @@ async def create_proposal(
     db: AsyncSession = Depends(get_db),
     current_user: UserModel = Depends(get_current_user)
 ):
-    # Проверяем существование проекта
-    result = await db.execute(
-        select(ProjectModel).where(ProjectModel.id == proposal.project_id)
+    proposals = ProposalsRepository(db)
+    
+    # Проект, фрилансер и его владелец проверяются одним запросом
+    precheck = await proposals.get_write_precheck(
+        proposal.project_id, proposal.freelancer_id
     )
-    project = result.scalar_one_or_none()
     
-    if not project:
+    if precheck.project_status is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Проект не найден"
         )
     
-    # Проверяем существование фрилансера
-    result = await db.execute(
-        select(FreelancerModel).where(FreelancerModel.id == proposal.freelancer_id)
-    )
-    freelancer = result.scalar_one_or_none()
-    
-    if not freelancer:
+    if precheck.freelancer_user_id is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Фрилансер не найден"
         )
     
     # Проверяем, что текущий пользователь - это фрилансер, который создает предложение
-    if current_user.id != freelancer.user_id:
+    if current_user.id != precheck.freelancer_user_id:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Вы можете создавать предложения только от своего имени"
         )
     
     # Проверяем, не закрыт ли проект
-    if project.status != "open":
+    if precheck.project_status != ProjectStatus.OPEN:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Нельзя оставлять предложения на закрытый проект"
         )
     
-    # Проверяем, не оставлял ли уже этот фрилансер предложение на этот проект
-    result = await db.execute(
-        select(ProposalModel).where(
-            and_(
-                ProposalModel.project_id == proposal.project_id,
-                ProposalModel.freelancer_id == proposal.freelancer_id
-            )
-        )
-    )
-    existing = result.scalar_one_or_none()
-    
-    if existing:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Вы уже оставляли предложение на этот проект"
-        )
-    
-    # Создаем предложение
-    db_proposal = ProposalModel(**proposal.dict())
-    db.add(db_proposal)
+    # Повторное предложение на проект отсекает уникальный индекс
+    try:
+        new_proposal = await proposals.add(proposal)
+    except ObjectAlreadyExistsError:
+        await db.rollback()
+        raise ProposalAlreadyExistsHTTPError
     await db.commit()
-    await db.refresh(db_proposal)
     
-    return db_proposal
+    return new_proposal
 
 # PUT /api/proposals/{proposal_id} - Обновить предложение
 @router.put("/{proposal_id}", response_model=Proposal)
@@ -1,4 +1,4 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, and_
 from typing import List, Optional
@@ -8,23 +8,29 @@ from app.models.projects import ProjectModel
 from app.models.freelancers import FreelancerModel
 from app.models.users import UserModel
 from app.schemas.reviews import Review, ReviewCreate, ReviewUpdate
-from app.api.dependencies import get_current_user
+from app.schemas.expanded import ReviewExpanded
+from app.api.expansions import REVIEW_EXPANSIONS
+from app.api.dependencies import ExpandParams, PaginationDep, get_current_user, get_read_db
+from app.utils.expand import Expansion
+from app.repositories.freelancers import FreelancersRepository
+from app.services.matching import matching_engine
 
 router = APIRouter()
 
 # ==================== CRUD операции ====================
 
-@router.get("/", response_model=List[Review])
+@router.get("/", response_model=List[ReviewExpanded], response_model_exclude_unset=True)
 async def get_reviews(
-    skip: int = Query(0, ge=0),
-    limit: int = Query(100, ge=1, le=100),
+    response: Response,
+    pagination: PaginationDep,
+    expansion: Expansion = Depends(ExpandParams(REVIEW_EXPANSIONS)),
     project_id: Optional[int] = None,
     freelancer_id: Optional[int] = None,
     min_rating: Optional[int] = Query(None, ge=1, le=5),
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
     """Получить список отзывов"""
-    query = select(ReviewModel)
+    query = expansion.apply(select(ReviewModel))
     
     if project_id:
         query = query.where(ReviewModel.project_id == project_id)
@@ -35,15 +41,17 @@ async def get_reviews(
     if min_rating:
         query = query.where(ReviewModel.rating >= min_rating)
     
-    query = query.order_by(ReviewModel.created_at.desc())
-    query = query.offset(skip).limit(limit)
+    query = pagination.paginate(
+        query, ReviewModel.created_at.desc(), ReviewModel.id.desc()
+    )
     
     result = await db.execute(query)
-    reviews = result.scalars().all()
-    return reviews
+    reviews = result.unique().scalars().all()
+    pagination.set_next_cursor(response, reviews)
+    return expansion.render(reviews)
 
 @router.get("/{review_id}", response_model=Review)
-async def get_review(review_id: int, db: AsyncSession = Depends(get_db)):
+async def get_review(review_id: int, db: AsyncSession = Depends(get_read_db)):
     """Получить отзыв по ID"""
     result = await db.execute(
         select(ReviewModel).where(ReviewModel.id == review_id)
@@ -115,9 +123,12 @@ async def create_review(
     
     db_review = ReviewModel(**review.dict())
     db.add(db_review)
+    await FreelancersRepository(db).apply_rating(review.freelancer_id, added=review.rating)
     await db.commit()
     await db.refresh(db_review)
     
+    matching_engine.apply_rating(review.freelancer_id, added=review.rating)
+    
     return db_review
 
 @router.put("/{review_id}", response_model=Review)
@@ -143,13 +154,19 @@ async def update_review(
             detail="Недостаточно прав для редактирования этого отзыва"
         )
     
+    old_rating = db_review.rating
     update_data = review_update.dict(exclude_unset=True)
     for field, value in update_data.items():
         setattr(db_review, field, value)
     
+    await FreelancersRepository(db).apply_rating(
+        db_review.freelancer_id, added=db_review.rating, removed=old_rating
+    )
     await db.commit()
     await db.refresh(db_review)
     
+    matching_engine.apply_rating(db_review.freelancer_id, added=db_review.rating, removed=old_rating)
+    
     return db_review
 
 @router.delete("/{review_id}")
@@ -174,6 +191,11 @@ async def delete_review(
         )
     
     await db.delete(db_review)
+    await FreelancersRepository(db).apply_rating(
+        db_review.freelancer_id, removed=db_review.rating
+    )
     await db.commit()
     
+    matching_engine.apply_rating(db_review.freelancer_id, removed=db_review.rating)
+    
     return {"message": "Отзыв удален"}
\ No newline at end of file
@@ -1,4 +1,4 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 from typing import List, Optional
@@ -6,34 +6,40 @@ from app.database.database import get_db
 from app.models.skills import SkillModel
 from app.models.users import UserModel
 from app.schemas.skills import Skill, SkillCreate, SkillUpdate
-from app.api.dependencies import get_current_user
+from app.api.dependencies import BatchIdsDep, PaginationDep, get_current_user, get_read_db
 
 router = APIRouter()
 
 # ==================== CRUD операции ====================
 
-@router.get("/", response_model=List[Skill])
+@router.get("/", response_model=List[Optional[Skill]])
 async def get_skills(
-    skip: int = Query(0, ge=0),
-    limit: int = Query(100, ge=1, le=100),
+    response: Response,
+    pagination: PaginationDep,
+    batch: BatchIdsDep,
     search: Optional[str] = Query(None, min_length=1),
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
     """Получить список навыков"""
+    # Пакетная выборка по id: один запрос вместо запроса на каждый объект
+    if batch.ids is not None:
+        result = await db.execute(batch.filter(select(SkillModel), SkillModel.id))
+        return batch.arrange(result.scalars().all())
+    
     query = select(SkillModel)
     
     if search:
         query = query.where(SkillModel.name.ilike(f"%{search}%"))
     
-    query = query.order_by(SkillModel.name)
-    query = query.offset(skip).limit(limit)
+    query = pagination.paginate(query, SkillModel.name, SkillModel.id)
     
     result = await db.execute(query)
     skills = result.scalars().all()
+    pagination.set_next_cursor(response, skills)
     return skills
 
 @router.get("/{skill_id}", response_model=Skill)
-async def get_skill(skill_id: int, db: AsyncSession = Depends(get_db)):
+async def get_skill(skill_id: int, db: AsyncSession = Depends(get_read_db)):
     """Получить навык по ID"""
     result = await db.execute(
         select(SkillModel).where(SkillModel.id == skill_id)
@@ -1,22 +1,30 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, update
 from typing import List, Optional
 from app.database.database import get_db
 from app.models.users import UserModel
 from app.schemas.user import User, UserCreate, UserUpdate
-from app.api.dependencies import get_current_user, get_current_admin
-from app.utils.security import get_password_hash, verify_password
+from app.api.dependencies import (
+    BatchIdsDep,
+    PaginationDep,
+    get_current_admin,
+    get_current_user,
+    invalidate_principal,
+)
+from app.exceptions.auth import PasswordHashingBusyError, PasswordHashingBusyHTTPError
+from app.utils.hashing import password_hasher
 import logging
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
 
 # GET /api/users/ - Получить всех пользователей (только админ)
-@router.get("/", response_model=List[User])
+@router.get("/", response_model=List[Optional[User]])
 async def get_users(
-    skip: int = Query(0, ge=0, description="Количество записей для пропуска"),
-    limit: int = Query(100, ge=1, le=100, description="Лимит записей"),
+    response: Response,
+    pagination: PaginationDep,
+    batch: BatchIdsDep,
     role_id: Optional[int] = Query(None, description="Фильтр по роли"),
     search: Optional[str] = Query(None, min_length=2, description="Поиск по имени или email"),
     db: AsyncSession = Depends(get_db),
@@ -27,6 +35,11 @@ async def get_users(
     Требуются права администратора.
     """
     try:
+        # Пакетная выборка по id: один запрос вместо запроса на каждый объект
+        if batch.ids is not None:
+            result = await db.execute(batch.filter(select(UserModel), UserModel.id))
+            return batch.arrange(result.scalars().all())
+        
         query = select(UserModel)
         
         # Применяем фильтры
@@ -40,14 +53,16 @@ async def get_users(
             )
         
         # Сортировка по ID
-        query = query.order_by(UserModel.id)
-        query = query.offset(skip).limit(limit)
+        query = pagination.paginate(query, UserModel.id)
         
         result = await db.execute(query)
         users = result.scalars().all()
+        pagination.set_next_cursor(response, users)
         
         return users
     
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Ошибка при получении пользователей: {e}")
         raise HTTPException(
@@ -130,7 +145,7 @@ async def create_user(
             )
         
         # Хешируем пароль
-        hashed_password = get_password_hash(user_data.password)
+        hashed_password = await password_hasher.hash(user_data.password)
         
         # Создаем пользователя
         new_user = UserModel(
@@ -149,6 +164,8 @@ async def create_user(
     
     except HTTPException:
         raise
+    except PasswordHashingBusyError:
+        raise PasswordHashingBusyHTTPError
     except Exception as e:
         logger.error(f"Ошибка при создании пользователя: {e}")
         await db.rollback()
@@ -210,6 +227,7 @@ async def update_user(
         
         await db.commit()
         await db.refresh(user)
+        invalidate_principal(user_id)
         
         logger.info(f"Обновлен пользователь ID: {user_id}")
         return user
@@ -262,7 +280,7 @@ async def change_password(
                     detail="Требуется старый пароль"
                 )
             
-            if not verify_password(passwords["old_password"], user.hashed_password):
+            if not await password_hasher.verify(passwords["old_password"], user.hashed_password):
                 raise HTTPException(
                     status_code=status.HTTP_400_BAD_REQUEST,
                     detail="Неверный старый пароль"
@@ -282,14 +300,17 @@ async def change_password(
             )
         
         # Обновляем пароль
-        user.hashed_password = get_password_hash(passwords["new_password"])
+        user.hashed_password = await password_hasher.hash(passwords["new_password"])
         await db.commit()
+        invalidate_principal(user_id)
         
         logger.info(f"Изменен пароль пользователя ID: {user_id}")
         return {"message": "Пароль успешно изменен"}
     
     except HTTPException:
         raise
+    except PasswordHashingBusyError:
+        raise PasswordHashingBusyHTTPError
     except Exception as e:
         logger.error(f"Ошибка при изменении пароля: {e}")
         await db.rollback()
@@ -339,6 +360,7 @@ async def delete_user(
         
         await db.delete(user)
         await db.commit()
+        invalidate_principal(user_id)
         
         logger.info(f"Удален пользователь ID: {user_id}, Email: {user.email}")
         return {"message": "Пользователь успешно удален"}
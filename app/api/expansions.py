@@ -0,0 +1,51 @@
+from app.models.freelancer_skills import FreelancerSkillModel
+from app.models.freelancers import FreelancerModel
+from app.models.project_skills import ProjectSkillModel
+from app.models.projects import ProjectModel
+from app.models.proposals import ProposalModel
+from app.models.reviews import ReviewModel
+from app.models.users import UserModel
+from app.schemas.expanded import UserPublic
+from app.schemas.freelancers import Freelancer
+from app.schemas.projects import Project
+from app.schemas.proposals import Proposal
+from app.schemas.reviews import Review
+from app.schemas.roles import SRoleGet
+from app.schemas.skills import Skill
+from app.utils.expand import Expansions, Relation
+
+# Связи, доступные в параметре expand списков. Вложенные связи пишутся
+# через точку: expand=freelancer.user,freelancer.skills
+
+
+def user_relation(attribute) -> Relation:
+    return Relation(attribute, UserPublic, {"role": Relation(UserModel.role, SRoleGet)})
+
+
+def freelancer_relations() -> dict[str, Relation]:
+    return {
+        "user": user_relation(FreelancerModel.user),
+        "skills": Relation(FreelancerModel.skills_assoc, Skill, through=FreelancerSkillModel.skill),
+    }
+
+
+def project_relations() -> dict[str, Relation]:
+    return {
+        "client": user_relation(ProjectModel.client),
+        "skills": Relation(ProjectModel.skills_assoc, Skill, through=ProjectSkillModel.skill),
+    }
+
+
+PROJECT_EXPANSIONS = Expansions(Project, project_relations())
+
+FREELANCER_EXPANSIONS = Expansions(Freelancer, freelancer_relations())
+
+PROPOSAL_EXPANSIONS = Expansions(Proposal, {
+    "project": Relation(ProposalModel.project, Project, project_relations()),
+    "freelancer": Relation(ProposalModel.freelancer, Freelancer, freelancer_relations()),
+})
+
+REVIEW_EXPANSIONS = Expansions(Review, {
+    "reviewer": user_relation(ReviewModel.reviewer),
+    "freelancer": Relation(ReviewModel.freelancer, Freelancer, freelancer_relations()),
+})
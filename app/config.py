@@ -9,11 +9,89 @@ class Settings(BaseSettings):
     
     # Database
     DATABASE_URL: str = os.getenv("DATABASE_URL", "sqlite+aiosqlite:///test.db")
+
+    # Пул соединений (для SQLite в памяти не используется)
+    DB_POOL_SIZE: int = int(os.getenv("DB_POOL_SIZE", 5))
+    DB_MAX_OVERFLOW: int = int(os.getenv("DB_MAX_OVERFLOW", 10))
+    DB_POOL_TIMEOUT_SECONDS: int = int(os.getenv("DB_POOL_TIMEOUT_SECONDS", 30))
+    # Проверка соединения перед выдачей из пула (обрывы после рестарта БД)
+    DB_POOL_PRE_PING: bool = os.getenv("DB_POOL_PRE_PING", "true").lower() == "true"
+    # Пересоздавать соединения старше N секунд (-1 - не пересоздавать)
+    DB_POOL_RECYCLE_SECONDS: int = int(os.getenv("DB_POOL_RECYCLE_SECONDS", 1800))
+    # Ограничение времени выполнения запроса в PostgreSQL (0 - без ограничения)
+    DB_STATEMENT_TIMEOUT_MS: int = int(os.getenv("DB_STATEMENT_TIMEOUT_MS", 30000))
+
+    # Реплики для чтения через запятую (пусто - чтение с основной БД)
+    DATABASE_REPLICA_URLS: str = os.getenv("DATABASE_REPLICA_URLS", "")
+    # На сколько секунд недоступная реплика исключается из ротации
+    DB_REPLICA_EJECT_SECONDS: int = int(os.getenv("DB_REPLICA_EJECT_SECONDS", 30))
+    # Сколько секунд после записи пользователь читает с основной БД (отставание реплик)
+    DB_READ_YOUR_WRITES_SECONDS: int = int(os.getenv("DB_READ_YOUR_WRITES_SECONDS", 5))
+
+    # PRAGMA для каждого нового соединения SQLite
+    SQLITE_JOURNAL_MODE: str = os.getenv("SQLITE_JOURNAL_MODE", "WAL")
+    SQLITE_SYNCHRONOUS: str = os.getenv("SQLITE_SYNCHRONOUS", "NORMAL")
+    SQLITE_MMAP_SIZE: int = int(os.getenv("SQLITE_MMAP_SIZE", 256 * 1024 * 1024))
+    # Сколько ждать снятия блокировки записи вместо ошибки "database is locked"
+    SQLITE_BUSY_TIMEOUT_MS: int = int(os.getenv("SQLITE_BUSY_TIMEOUT_MS", 5000))
     
     # Security
     SECRET_KEY: str = os.getenv("SECRET_KEY", "your-secret-key-here-change-in-production")
     ALGORITHM: str = os.getenv("ALGORITHM", "HS256")
     ACCESS_TOKEN_EXPIRE_MINUTES: int = int(os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES", 30))
+
+    # Кэш аутентифицированных пользователей (в пределах процесса)
+    PRINCIPAL_CACHE_SIZE: int = int(os.getenv("PRINCIPAL_CACHE_SIZE", 10000))
+    PRINCIPAL_CACHE_TTL_SECONDS: int = int(os.getenv("PRINCIPAL_CACHE_TTL_SECONDS", 60))
+
+    # Пул для bcrypt-хеширования паролей: "thread" или "process"
+    PASSWORD_HASH_EXECUTOR: str = os.getenv("PASSWORD_HASH_EXECUTOR", "thread")
+    PASSWORD_HASH_WORKERS: int = int(os.getenv("PASSWORD_HASH_WORKERS", 4))
+    PASSWORD_HASH_MAX_QUEUE: int = int(os.getenv("PASSWORD_HASH_MAX_QUEUE", 64))
+
+    # Версии таблиц для инвалидации кэшей: "memory" (один процесс)
+    # или "sqlite" (общий файл для всех воркеров на машине)
+    VERSIONS_BACKEND: str = os.getenv("VERSIONS_BACKEND", "memory")
+    VERSIONS_DB_PATH: str = os.getenv("VERSIONS_DB_PATH", "versions.db")
+    # Период перечитывания версий из файла (изменения других воркеров видны
+    # с этой задержкой) и максимальное ожидание блокировки файла при записи
+    VERSIONS_REFRESH_MS: int = int(os.getenv("VERSIONS_REFRESH_MS", 500))
+    VERSIONS_BUMP_TIMEOUT_MS: int = int(os.getenv("VERSIONS_BUMP_TIMEOUT_MS", 50))
+
+    # Предупреждение о N+1: один и тот же SQL выполнен в запросе больше N раз
+    QUERY_REPEAT_THRESHOLD: int = int(os.getenv("QUERY_REPEAT_THRESHOLD", 10))
+
+    # Кэш ответов публичных GET-эндпоинтов (ETag/If-None-Match)
+    RESPONSE_CACHE_SIZE: int = int(os.getenv("RESPONSE_CACHE_SIZE", 1000))
+    RESPONSE_CACHE_TTL_SECONDS: int = int(os.getenv("RESPONSE_CACHE_TTL_SECONDS", 60))
+
+    # Максимум id в пакетном запросе списка (?ids=1,2,3)
+    BATCH_MAX_IDS: int = int(os.getenv("BATCH_MAX_IDS", 100))
+
+    # Максимальная вложенность раскрытия связей (?expand=freelancer.user - 2 уровня)
+    EXPAND_MAX_DEPTH: int = int(os.getenv("EXPAND_MAX_DEPTH", 2))
+
+    # Push-уведомления: "memory" (один процесс) или "broker" (общий брокер для воркеров)
+    NOTIFY_BACKEND: str = os.getenv("NOTIFY_BACKEND", "memory")
+    NOTIFY_BROKER_HOST: str = os.getenv("NOTIFY_BROKER_HOST", "127.0.0.1")
+    NOTIFY_BROKER_PORT: int = int(os.getenv("NOTIFY_BROKER_PORT", 8765))
+    # Очередь строк на отправку между воркером и брокером; при переполнении строки отбрасываются
+    NOTIFY_BROKER_QUEUE_SIZE: int = int(os.getenv("NOTIFY_BROKER_QUEUE_SIZE", 1000))
+    # Сколько неотправленных событий хранится на одно соединение
+    NOTIFY_QUEUE_SIZE: int = int(os.getenv("NOTIFY_QUEUE_SIZE", 100))
+    NOTIFY_HEARTBEAT_SECONDS: int = int(os.getenv("NOTIFY_HEARTBEAT_SECONDS", 15))
+
+    # Подбор фрилансеров и проектов по навыкам: веса составляющих оценки
+    MATCHING_SKILL_WEIGHT: float = float(os.getenv("MATCHING_SKILL_WEIGHT", 0.6))
+    MATCHING_RATING_WEIGHT: float = float(os.getenv("MATCHING_RATING_WEIGHT", 0.25))
+    MATCHING_RATE_WEIGHT: float = float(os.getenv("MATCHING_RATE_WEIGHT", 0.15))
+    # Сколько изменений связей копится до перестроения CSR
+    MATCHING_COMPACT_THRESHOLD: int = int(os.getenv("MATCHING_COMPACT_THRESHOLD", 10000))
+    # Период полной перезагрузки индекса из БД (подхватывает записи других воркеров)
+    MATCHING_RELOAD_SECONDS: int = int(os.getenv("MATCHING_RELOAD_SECONDS", 300))
+
+    # Кодировщик JSON-ответов: "auto" (orjson, если установлен), "orjson" или "stdlib"
+    JSON_ENCODER: str = os.getenv("JSON_ENCODER", "auto")
     
     class Config:
         env_file = ".env"
@@ -21,4 +99,7 @@ class Settings(BaseSettings):
     def get_db_url(self) -> str:
         return self.DATABASE_URL
 
+    def get_replica_urls(self) -> list[str]:
+        return [url.strip() for url in self.DATABASE_REPLICA_URLS.split(",") if url.strip()]
+
 settings = Settings()
@@ -1,25 +1,160 @@
+import time
 from datetime import datetime
-from typing import TYPE_CHECKING
+from typing import Any
 
-from sqlalchemy import NullPool, func, text
+from sqlalchemy import AsyncAdaptedQueuePool, event, func, make_url, text
+from sqlalchemy.engine import URL
 from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
     AsyncSession,
     async_sessionmaker,
     create_async_engine,
 )
-from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column
+from sqlalchemy.orm import DeclarativeBase, Mapped, Session, mapped_column
 
 from app.config import settings
+from app.services.metrics import metrics
+from app.services.versions import table_versions
 
-engine = create_async_engine(settings.get_db_url())
+SQLITE_SYNCHRONOUS = {0: "OFF", 1: "NORMAL", 2: "FULL", 3: "EXTRA"}
 
-engine_null_pool = create_async_engine(settings.get_db_url(), poolclass=NullPool)
 
+class TimedQueuePool(AsyncAdaptedQueuePool):
+    """Пул соединений, который замеряет ожидание свободного соединения (/metrics)"""
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            metrics.pool_wait.observe(time.perf_counter() - started)
+            metrics.pool_checkouts += 1
+
+
+def is_sqlite_memory(url: URL) -> bool:
+    return url.database in (None, "", ":memory:") or "mode=memory" in str(url)
+
+
+def engine_options(url: URL) -> dict[str, Any]:
+    """Параметры create_async_engine из настроек для диалекта и драйвера URL"""
+    options: dict[str, Any] = {"pool_pre_ping": settings.DB_POOL_PRE_PING}
+
+    if url.get_backend_name() == "sqlite" and is_sqlite_memory(url):
+        # База в памяти живет, пока открыто ее единственное соединение (StaticPool)
+        return options
+
+    # Для файлового SQLite aiosqlite по умолчанию открывает новое соединение
+    # (и поток) на каждую сессию, поэтому пул задается явно
+    options.update(
+        poolclass=TimedQueuePool,
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        pool_timeout=settings.DB_POOL_TIMEOUT_SECONDS,
+        pool_recycle=settings.DB_POOL_RECYCLE_SECONDS,
+    )
+
+    timeout = settings.DB_STATEMENT_TIMEOUT_MS
+    if url.get_backend_name() == "postgresql" and timeout > 0:
+        driver = url.get_driver_name()
+        if driver == "asyncpg":
+            options["connect_args"] = {"server_settings": {"statement_timeout": str(timeout)}}
+        elif driver == "psycopg":
+            options["connect_args"] = {"options": f"-c statement_timeout={timeout}"}
+    return options
+
+
+def set_sqlite_pragmas(dbapi_connection, connection_record) -> None:
+    cursor = dbapi_connection.cursor()
+    cursor.execute(f"PRAGMA journal_mode={settings.SQLITE_JOURNAL_MODE}")
+    cursor.execute(f"PRAGMA synchronous={settings.SQLITE_SYNCHRONOUS}")
+    cursor.execute(f"PRAGMA mmap_size={settings.SQLITE_MMAP_SIZE}")
+    cursor.execute(f"PRAGMA busy_timeout={settings.SQLITE_BUSY_TIMEOUT_MS}")
+    cursor.close()
+
+
+def build_engine(database_url: str) -> AsyncEngine:
+    url = make_url(database_url)
+    new_engine = create_async_engine(url, **engine_options(url))
+    if url.get_backend_name() == "sqlite":
+        event.listen(new_engine.sync_engine, "connect", set_sqlite_pragmas)
+    return new_engine
+
+
+async def describe_engine(checked_engine: AsyncEngine) -> dict[str, Any]:
+    """
+    Фактическая конфигурация подключения: выполняет запрос к БД и читает
+    значения, которые применились к соединению
+    """
+    description: dict[str, Any] = {
+        "url": checked_engine.url.render_as_string(hide_password=True),
+        "pool": type(checked_engine.pool).__name__,
+    }
+    if isinstance(checked_engine.pool, AsyncAdaptedQueuePool):
+        description["pool_size"] = checked_engine.pool.size()
+        description["max_overflow"] = checked_engine.pool._max_overflow
+
+    async with checked_engine.connect() as conn:
+        if checked_engine.dialect.name == "sqlite":
+            pragmas = {}
+            for pragma in ("journal_mode", "synchronous", "mmap_size", "busy_timeout"):
+                pragmas[pragma] = (await conn.execute(text(f"PRAGMA {pragma}"))).scalar()
+            pragmas["synchronous"] = SQLITE_SYNCHRONOUS.get(pragmas["synchronous"], pragmas["synchronous"])
+            description.update(pragmas)
+            description["version"] = (await conn.execute(text("SELECT sqlite_version()"))).scalar()
+        elif checked_engine.dialect.name == "postgresql":
+            description["statement_timeout"] = (
+                await conn.execute(text("SHOW statement_timeout"))
+            ).scalar()
+            description["version"] = (await conn.execute(text("SHOW server_version"))).scalar()
+    return description
+
+
+engine = build_engine(settings.get_db_url())
 
 async_session_maker = async_sessionmaker(bind=engine, expire_on_commit=False)
-async_session_maker_null_pool = async_sessionmaker(
-    bind=engine_null_pool, expire_on_commit=False
-)
+
+
+# ========== ВЕРСИИ ТАБЛИЦ ==========
+# Таблицы, измененные в текущей транзакции, копятся в session.info и после
+# commit увеличивают свои версии; при rollback изменения отбрасываются
+
+CHANGED_TABLES = "changed_tables"
+
+
+def changed_tables(session: Session) -> set[str]:
+    return session.info.setdefault(CHANGED_TABLES, set())
+
+
+@event.listens_for(Session, "after_flush")
+def collect_flushed_tables(session: Session, flush_context) -> None:
+    dirty = [obj for obj in session.dirty if session.is_modified(obj, include_collections=False)]
+    for obj in (*session.new, *dirty, *session.deleted):
+        table = getattr(obj, "__table__", None)
+        if table is not None:
+            changed_tables(session).add(table.name)
+
+
+@event.listens_for(Session, "do_orm_execute")
+def collect_statement_tables(orm_execute_state) -> None:
+    # Массовые INSERT/UPDATE/DELETE через session.execute минуют unit of work
+    if orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete:
+        table = getattr(orm_execute_state.statement, "table", None)
+        if table is not None:
+            changed_tables(orm_execute_state.session).add(table.name)
+
+
+@event.listens_for(Session, "after_commit")
+def bump_table_versions(session: Session) -> None:
+    tables = session.info.pop(CHANGED_TABLES, None)
+    if tables:
+        table_versions.bump(*tables)
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def forget_changed_tables(session: Session, previous_transaction) -> None:
+    # Откат SAVEPOINT не отменяет изменений внешней транзакции
+    if not previous_transaction.nested:
+        session.info.pop(CHANGED_TABLES, None)
 
 
 class Base(DeclarativeBase):
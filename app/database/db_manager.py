@@ -1,14 +1,31 @@
 from app.database.database import async_session_maker
+from app.database.replicas import replica_set
 from app.repositories.roles import RolesRepository
 from app.repositories.users import UsersRepository
 
 
 class DBManager:
-    def __init__(self, session_factory: async_session_maker):
+    """
+    Сессия и репозитории на время операции. В режиме read_only сессия
+    открывается на реплике (см. app/database/replicas.py); primary=True
+    оставляет чтение на основной БД, например сразу после записи пользователя.
+    """
+
+    def __init__(
+        self,
+        session_factory: async_session_maker = async_session_maker,
+        read_only: bool = False,
+        primary: bool = False,
+    ):
         self.session_factory = session_factory
+        self.read_only = read_only
+        self.primary = primary
 
     async def __aenter__(self):
-        self.session = self.session_factory()
+        if self.read_only:
+            self.session = await replica_set.open_session(primary=self.primary)
+        else:
+            self.session = self.session_factory()
         # TODO Добавить сюда созданные репозитории
         # Пример:
         self.users = UsersRepository(self.session)
@@ -20,4 +37,6 @@ class DBManager:
         await self.session.close()
 
     async def commit(self):
+        if self.read_only:
+            raise RuntimeError("DBManager открыт только для чтения")
         await self.session.commit()
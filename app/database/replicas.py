@@ -0,0 +1,122 @@
+import logging
+import time
+
+from fastapi import Request
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker
+
+from app.config import settings
+from app.database.database import async_session_maker, build_engine
+
+logger = logging.getLogger(__name__)
+
+# Cookie с моментом (unix time), до которого чтения пользователя идут в основную БД
+PRIMARY_UNTIL_COOKIE = "db_primary_until"
+# Ключ request.state: ответ сохраняется в кэш ответов и должен читаться с основной БД
+CACHE_FILL_STATE = "cache_fill"
+
+
+class ReplicaSet:
+    """
+    Реплики для чтения. Реплики выбираются по кругу (round-robin); реплика,
+    к которой не удалось подключиться, исключается из ротации на eject_seconds.
+    Если доступных реплик нет, чтение идет в основную БД.
+    """
+
+    def __init__(self, urls: list[str], primary: async_sessionmaker, eject_seconds: float) -> None:
+        self.primary = primary
+        self.eject_seconds = eject_seconds
+        self.engines: list[AsyncEngine] = [build_engine(url) for url in urls]
+        self._session_makers = [
+            async_sessionmaker(bind=engine, expire_on_commit=False) for engine in self.engines
+        ]
+        self._ejected_until = [0.0] * len(self.engines)
+        self._next = 0
+
+        # Метрики
+        self.reads = [0] * len(self.engines)
+        self.failures = [0] * len(self.engines)
+        self.primary_reads = 0
+
+    def _candidates(self) -> list[int]:
+        """Доступные реплики в порядке round-robin"""
+        count = len(self.engines)
+        now = time.monotonic()
+        start, self._next = self._next, (self._next + 1) % count if count else 0
+        return [
+            index
+            for index in ((start + offset) % count for offset in range(count))
+            if self._ejected_until[index] <= now
+        ]
+
+    def eject(self, engine: AsyncEngine, reason: Exception) -> None:
+        if engine not in self.engines:
+            return
+        index = self.engines.index(engine)
+        self.failures[index] += 1
+        self._ejected_until[index] = time.monotonic() + self.eject_seconds
+        logger.warning(
+            "Реплика %s исключена на %s с: %s",
+            engine.url.render_as_string(hide_password=True), self.eject_seconds, reason,
+        )
+
+    async def open_session(self, primary: bool = False) -> AsyncSession:
+        """
+        Сессия для чтения. Соединение с репликой открывается сразу, чтобы
+        недоступная реплика была пропущена до выполнения запросов.
+        """
+        if not primary:
+            for index in self._candidates():
+                session = self._session_makers[index]()
+                try:
+                    await session.connection()
+                except (DBAPIError, OSError) as ex:
+                    await session.close()
+                    self.eject(self.engines[index], ex)
+                    continue
+                self.reads[index] += 1
+                return session
+
+        self.primary_reads += 1
+        return self.primary()
+
+    async def dispose(self) -> None:
+        for engine in self.engines:
+            await engine.dispose()
+
+    def stats(self) -> list[dict]:
+        now = time.monotonic()
+        return [
+            {
+                "url": engine.url.render_as_string(hide_password=True),
+                "available": self._ejected_until[index] <= now,
+                "reads": self.reads[index],
+                "failures": self.failures[index],
+            }
+            for index, engine in enumerate(self.engines)
+        ]
+
+
+def wrote_recently(request: Request) -> bool:
+    """Пользователь недавно писал - его чтения должны видеть эти записи"""
+    value = request.cookies.get(PRIMARY_UNTIL_COOKIE)
+    try:
+        return value is not None and float(value) > time.time()
+    except ValueError:
+        return False
+
+
+def needs_primary(request: Request) -> bool:
+    """
+    Чтение идет в основную БД: пользователь недавно писал или ответ заполняет
+    кэш ответов. Кэш хранит ответ под ETag из текущих версий таблиц, и ответ
+    отстающей реплики остался бы под этим ETag до конца TTL.
+    """
+    return wrote_recently(request) or getattr(request.state, CACHE_FILL_STATE, False)
+
+
+replica_set = ReplicaSet(
+    urls=settings.get_replica_urls(),
+    primary=async_session_maker,
+    eject_seconds=settings.DB_REPLICA_EJECT_SECONDS,
+)
@@ -0,0 +1,149 @@
+import logging
+import re
+
+from sqlalchemy import Select, bindparam, column, func, literal_column, table, text
+from sqlalchemy.engine import Connection
+from sqlalchemy.exc import DBAPIError
+
+from app.models.projects import ProjectModel
+
+logger = logging.getLogger(__name__)
+
+# Полнотекстовый индекс проектов для SQLite (FTS5, внешний контент - таблица projects).
+# Синхронизацию с projects выполняют триггеры, поэтому индекс актуален при любом
+# способе записи (эндпоинты, репозитории, миграции, сидеры).
+SQLITE_FTS_DDL = [
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS projects_fts USING fts5(
+        title, description,
+        content='projects', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2'
+    )
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS projects_fts_ai AFTER INSERT ON projects BEGIN
+        INSERT INTO projects_fts(rowid, title, description)
+        VALUES (new.id, new.title, new.description);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS projects_fts_ad AFTER DELETE ON projects BEGIN
+        INSERT INTO projects_fts(projects_fts, rowid, title, description)
+        VALUES ('delete', old.id, old.title, old.description);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS projects_fts_au AFTER UPDATE OF title, description ON projects BEGIN
+        INSERT INTO projects_fts(projects_fts, rowid, title, description)
+        VALUES ('delete', old.id, old.title, old.description);
+        INSERT INTO projects_fts(rowid, title, description)
+        VALUES (new.id, new.title, new.description);
+    END
+    """,
+]
+SQLITE_FTS_REBUILD = "INSERT INTO projects_fts(projects_fts) VALUES ('rebuild')"
+
+# Аналог для PostgreSQL: вычисляемая колонка tsvector + GIN-индекс
+POSTGRES_FTS_DDL = [
+    """
+    ALTER TABLE projects ADD COLUMN IF NOT EXISTS search_vector tsvector
+    GENERATED ALWAYS AS (
+        setweight(to_tsvector('simple', coalesce(title, '')), 'A') ||
+        setweight(to_tsvector('simple', coalesce(description, '')), 'B')
+    ) STORED
+    """,
+    "CREATE INDEX IF NOT EXISTS ix_projects_search_vector ON projects USING gin (search_vector)",
+]
+
+# Вес заголовка относительно описания при ранжировании BM25
+TITLE_WEIGHT = 4.0
+DESCRIPTION_WEIGHT = 1.0
+
+projects_fts = table("projects_fts", column("rowid"))
+
+
+def search_terms(search: str) -> list[str]:
+    """Разбивает поисковую строку на слова (без операторов FTS)"""
+    return re.findall(r"\w+", search.lower())
+
+
+class ProjectSearch:
+    """
+    Полнотекстовый поиск по проектам с ранжированием.
+    Если полнотекстовый индекс недоступен, используется ILIKE.
+    """
+
+    def __init__(self) -> None:
+        self.dialect: str | None = None
+
+    @property
+    def enabled(self) -> bool:
+        return self.dialect is not None
+
+    def setup(self, conn: Connection) -> None:
+        """
+        Создает индекс и триггеры (идемпотентно). Вызывается при старте в
+        транзакции create_all, поэтому DDL выполняется в SAVEPOINT: в
+        PostgreSQL ошибка иначе прервала бы всю транзакцию, и создание таблиц
+        откатилось бы вместе с индексом.
+        """
+        dialect = conn.dialect.name
+        if dialect not in ("sqlite", "postgresql"):
+            logger.warning(f"Полнотекстовый поиск не поддерживается для {dialect}")
+            return
+        try:
+            with conn.begin_nested():
+                if dialect == "sqlite":
+                    exists = conn.execute(
+                        text("SELECT 1 FROM sqlite_master WHERE name = 'projects_fts'")
+                    ).scalar()
+                    for ddl in SQLITE_FTS_DDL:
+                        conn.execute(text(ddl))
+                    if not exists:
+                        # Индексируем проекты, созданные до появления FTS-таблицы
+                        conn.execute(text(SQLITE_FTS_REBUILD))
+                else:
+                    for ddl in POSTGRES_FTS_DDL:
+                        conn.execute(text(ddl))
+        except DBAPIError as e:
+            logger.warning(f"Полнотекстовый индекс недоступен, используется ILIKE: {e}")
+            return
+        self.dialect = dialect
+
+    def apply(self, query: Select, search: str) -> tuple[Select, object | None]:
+        """
+        Добавляет к запросу условие поиска.
+        Возвращает запрос и выражение ранга (меньше - релевантнее) либо None для ILIKE.
+        """
+        terms = search_terms(search)
+        if not self.enabled or not terms:
+            query = query.where(
+                (ProjectModel.title.ilike(f"%{search}%")) |
+                (ProjectModel.description.ilike(f"%{search}%"))
+            )
+            return query, None
+
+        if self.dialect == "sqlite":
+            # Префиксный поиск по каждому слову: "web"* "dev"*
+            match = " ".join(f'"{term}"*' for term in terms)
+            query = query.join(
+                projects_fts, projects_fts.c.rowid == ProjectModel.id
+            ).where(
+                literal_column("projects_fts").op("MATCH")(bindparam("fts_match", match))
+            )
+            rank = func.bm25(
+                literal_column("projects_fts"), TITLE_WEIGHT, DESCRIPTION_WEIGHT
+            )
+            return query, rank
+
+        # PostgreSQL: web:* & dev:*
+        tsquery = func.to_tsquery(
+            "simple", bindparam("fts_match", " & ".join(f"{term}:*" for term in terms))
+        )
+        search_vector = literal_column("projects.search_vector")
+        query = query.where(search_vector.op("@@")(tsquery))
+        rank = -func.ts_rank_cd(search_vector, tsquery)
+        return query, rank
+
+
+project_search = ProjectSearch()
@@ -21,6 +21,10 @@ class UserNotFoundError(MyAppError):
     detail = "Пользователя не существует"
 
 
+class PasswordHashingBusyError(MyAppError):
+    detail = "Сервер перегружен, повторите попытку позже"
+
+
 class InvalidTokenHTTPError(MyAppHTTPError):
     status_code = 401
     detail = "Неверный токен доступа"
@@ -49,3 +53,8 @@ class UserNotFoundHTTPError(MyAppHTTPError):
 class InvalidPasswordHTTPError(MyAppHTTPError):
     status_code = 401
     detail = "Неверный пароль"
+
+
+class PasswordHashingBusyHTTPError(MyAppHTTPError):
+    status_code = 503
+    detail = "Сервер перегружен, повторите попытку позже"
@@ -0,0 +1,19 @@
+from app.exceptions.base import MyAppError, MyAppHTTPError
+
+
+class InvalidExpandError(MyAppError):
+    detail = "Неизвестная связь в параметре expand"
+
+
+class InvalidExpandHTTPError(MyAppHTTPError):
+    status_code = 400
+    detail = "Неизвестная связь в параметре expand"
+
+
+class ExpandTooDeepError(MyAppError):
+    detail = "Слишком глубокое раскрытие связей"
+
+
+class ExpandTooDeepHTTPError(MyAppHTTPError):
+    status_code = 400
+    detail = "Слишком глубокое раскрытие связей"
@@ -0,0 +1,20 @@
+from app.exceptions.base import MyAppError, MyAppHTTPError
+
+
+class InvalidCursorError(MyAppError):
+    detail = "Неверный курсор пагинации"
+
+
+class InvalidCursorHTTPError(MyAppHTTPError):
+    status_code = 400
+    detail = "Неверный курсор пагинации"
+
+
+class InvalidIdsHTTPError(MyAppHTTPError):
+    status_code = 400
+    detail = "Параметр ids - список целых id через запятую"
+
+
+class TooManyIdsHTTPError(MyAppHTTPError):
+    status_code = 400
+    detail = "Слишком много id в одном запросе"
@@ -0,0 +1,6 @@
+from app.exceptions.base import MyAppHTTPError
+
+
+class ProposalAlreadyExistsHTTPError(MyAppHTTPError):
+    status_code = 400
+    detail = "Вы уже оставляли предложение на этот проект"
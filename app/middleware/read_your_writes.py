@@ -0,0 +1,35 @@
+import math
+import time
+
+from app.database.replicas import PRIMARY_UNTIL_COOKIE
+
+WRITE_METHODS = {"POST", "PUT", "PATCH", "DELETE"}
+
+
+class ReadYourWritesMiddleware:
+    """
+    После успешного изменяющего запроса выставляет cookie, по которой
+    get_read_db в течение window_seconds направляет чтения пользователя в
+    основную БД. Cookie работает и между воркерами, в отличие от памяти процесса.
+    """
+
+    def __init__(self, app, window_seconds: float) -> None:
+        self.app = app
+        self.window_seconds = window_seconds
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] not in WRITE_METHODS:
+            await self.app(scope, receive, send)
+            return
+
+        async def send_with_cookie(message):
+            if message["type"] == "http.response.start" and message["status"] < 400:
+                until = time.time() + self.window_seconds
+                cookie = (
+                    f"{PRIMARY_UNTIL_COOKIE}={until:.3f}; Max-Age={math.ceil(self.window_seconds)}; "
+                    "Path=/; HttpOnly; SameSite=lax"
+                )
+                message["headers"] = [*message.get("headers", []), (b"set-cookie", cookie.encode())]
+            await send(message)
+
+        await self.app(scope, receive, send_with_cookie)
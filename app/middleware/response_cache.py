@@ -0,0 +1,192 @@
+import hashlib
+import re
+from dataclasses import dataclass
+from urllib.parse import parse_qsl, urlencode
+
+from app.config import settings
+from app.database.replicas import CACHE_FILL_STATE, PRIMARY_UNTIL_COOKIE
+from app.services.versions import table_versions
+from app.utils.cache import TTLCache
+
+# Заголовки ответа, которые не сохраняются в кэше
+SKIPPED_HEADERS = {b"set-cookie", b"etag", b"cache-control"}
+
+
+@dataclass(frozen=True)
+class CachedRoute:
+    """Публичный GET-эндпоинт и таблицы, от данных которых зависит его ответ"""
+
+    pattern: re.Pattern
+    tables: tuple[str, ...]
+    # Таблицы связей, которые попадают в ответ при ?expand=
+    expand_tables: tuple[str, ...] = ()
+
+
+@dataclass(frozen=True)
+class CachedResponse:
+    etag: bytes
+    status: int
+    headers: list[tuple[bytes, bytes]]
+    body: bytes
+
+
+CACHED_ROUTES = [
+    CachedRoute(re.compile(r"^/api/skills/$"), ("skills",)),
+    CachedRoute(
+        re.compile(r"^/api/freelancers/$"), ("freelancers", "users"),
+        expand_tables=("roles", "freelancer_skills", "skills"),
+    ),
+    CachedRoute(re.compile(r"^/api/freelancers/\d+$"), ("freelancers",)),
+    CachedRoute(
+        re.compile(r"^/api/reviews/$"), ("reviews",),
+        expand_tables=("users", "roles", "freelancers", "freelancer_skills", "skills"),
+    ),
+    CachedRoute(re.compile(r"^/api/projects/\d+$"), ("projects",)),
+]
+
+
+def normalize_query(query_string: bytes) -> str:
+    """Порядок параметров не влияет на ключ: ?a=1&b=2 и ?b=2&a=1 - один ответ"""
+    return urlencode(sorted(parse_qsl(query_string.decode("latin-1"), keep_blank_values=True)))
+
+
+def make_etag(key: tuple[str, str], epoch: str, versions: tuple[int, ...]) -> bytes:
+    digest = hashlib.blake2b(repr((key, epoch, versions)).encode(), digest_size=12).hexdigest()
+    return f'"{digest}"'.encode()
+
+
+def header(scope, name: bytes) -> bytes | None:
+    for key, value in scope["headers"]:
+        if key == name:
+            return value
+    return None
+
+
+def etag_matches(if_none_match: bytes | None, etag: bytes) -> bool:
+    if if_none_match is None:
+        return False
+    candidates = [value.strip() for value in if_none_match.split(b",")]
+    return etag in candidates or b"*" in candidates
+
+
+class ResponseCacheMiddleware:
+    """
+    Кэш ответов публичных GET-эндпоинтов в памяти процесса.
+
+    ETag строится из маршрута, нормализованных параметров запроса и версий
+    таблиц (app/services/versions.py), поэтому проверка If-None-Match и выдача
+    из кэша не обращаются к БД. Версии увеличиваются после commit любой
+    сессии, изменившей таблицу, - старые записи кэша перестают совпадать по
+    ETag. Ответ для кэша читается с основной БД (get_read_db), а не с реплики:
+    иначе отстающая реплика отдала бы старые данные под новым ETag.
+
+    304 и выдача из кэша возможны только пока запись кэша не истекла, поэтому
+    при VERSIONS_BACKEND=memory и нескольких воркерах устаревание из-за
+    записей других воркеров ограничено RESPONSE_CACHE_TTL_SECONDS: после
+    истечения ответ строится заново и клиент получает 200 с актуальными
+    данными (ETag при этом может не измениться).
+    """
+
+    def __init__(self, app, cache: "ResponseCache", routes: list[CachedRoute] = CACHED_ROUTES) -> None:
+        self.app = app
+        self.cache = cache
+        self.routes = routes
+
+    def match(self, path: str) -> CachedRoute | None:
+        for route in self.routes:
+            if route.pattern.match(path):
+                return route
+        return None
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] != "GET":
+            await self.app(scope, receive, send)
+            return
+        route = self.match(scope["path"])
+        cookies = header(scope, b"cookie") or b""
+        # Сразу после записи пользователь читает с основной БД в обход кэша
+        if route is None or PRIMARY_UNTIL_COOKIE.encode() in cookies:
+            await self.app(scope, receive, send)
+            return
+
+        key = (scope["path"], normalize_query(scope["query_string"]))
+        # Версии берутся до обработки запроса: если данные изменятся во время
+        # обработки, ответ сохранится под уже устаревшим ETag
+        tables = route.tables
+        if route.expand_tables and b"expand=" in scope["query_string"]:
+            tables += route.expand_tables
+        etag = make_etag(key, table_versions.epoch, table_versions.snapshot(tables))
+
+        # Ответ без обращения к приложению: endpoint для метрик по шаблону маршрута
+        scope["endpoint"] = self.cache.endpoints.get(route)
+
+        # 304 - только при свежей записи кэша с тем же ETag: версии из памяти
+        # процесса не видят записей других воркеров, и без проверки TTL клиент
+        # получал бы 304 бесконечно
+        cached: CachedResponse | None = self.cache.store.get(key)
+        if cached is not None and cached.etag == etag:
+            if etag_matches(header(scope, b"if-none-match"), etag):
+                self.cache.not_modified += 1
+                await send({
+                    "type": "http.response.start",
+                    "status": 304,
+                    "headers": [(b"etag", etag), (b"cache-control", b"no-cache")],
+                })
+                await send({"type": "http.response.body", "body": b""})
+            else:
+                await self.replay(cached, send)
+            return
+
+        # Промах: ответ сохранится под etag, поэтому читается с основной БД
+        scope.setdefault("state", {})[CACHE_FILL_STATE] = True
+        await self.app(scope, receive, self.capture(key, etag, send))
+        self.cache.endpoints[route] = scope.get("endpoint")
+
+    def capture(self, key, etag: bytes, send):
+        start = {}
+        chunks: list[bytes] = []
+
+        async def send_and_store(message):
+            if message["type"] == "http.response.start":
+                start.update(message)
+                if message["status"] == 200:
+                    message["headers"] = [
+                        *message.get("headers", []), (b"etag", etag), (b"cache-control", b"no-cache"),
+                    ]
+            elif message["type"] == "http.response.body" and start.get("status") == 200:
+                chunks.append(message.get("body", b""))
+                if not message.get("more_body", False):
+                    headers = [
+                        (name, value) for name, value in start.get("headers", [])
+                        if name not in SKIPPED_HEADERS
+                    ]
+                    self.cache.store.set(key, CachedResponse(etag, 200, headers, b"".join(chunks)))
+            await send(message)
+
+        return send_and_store
+
+    async def replay(self, cached: CachedResponse, send) -> None:
+        await send({
+            "type": "http.response.start",
+            "status": cached.status,
+            "headers": [*cached.headers, (b"etag", cached.etag), (b"cache-control", b"no-cache")],
+        })
+        await send({"type": "http.response.body", "body": cached.body})
+
+
+class ResponseCache:
+    """Хранилище ответов и счетчики кэша (общие для всех экземпляров middleware)"""
+
+    def __init__(self, maxsize: int, ttl: float) -> None:
+        self.store = TTLCache(maxsize=maxsize, ttl=ttl)
+        self.not_modified = 0
+        self.endpoints: dict[CachedRoute, object] = {}
+
+    def stats(self) -> dict[str, int | float]:
+        return {**self.store.stats(), "not_modified": self.not_modified}
+
+
+response_cache = ResponseCache(
+    maxsize=settings.RESPONSE_CACHE_SIZE,
+    ttl=settings.RESPONSE_CACHE_TTL_SECONDS,
+)
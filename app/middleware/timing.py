@@ -0,0 +1,131 @@
+import logging
+import time
+from collections import Counter
+from contextvars import ContextVar
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import ORMExecuteState, Session
+
+from app.services.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+
+class RequestStats:
+    """Стоимость одного запроса к API: время, запросы к БД и прочитанные строки"""
+
+    __slots__ = ("started", "status", "db_seconds", "queries", "rows", "statements")
+
+    def __init__(self) -> None:
+        self.started = time.perf_counter()
+        self.status = 500
+        self.db_seconds = 0.0
+        self.queries = 0
+        self.rows = 0
+        self.statements: Counter[str] = Counter()
+
+    @property
+    def elapsed(self) -> float:
+        return time.perf_counter() - self.started
+
+    def server_timing(self) -> str:
+        return (
+            f"app;dur={self.elapsed * 1000:.1f}, "
+            f'db;dur={self.db_seconds * 1000:.1f};desc="{self.queries} queries, {self.rows} rows"'
+        )
+
+    def repeated(self, threshold: int) -> list[tuple[str, int]]:
+        """Запросы одной формы, выполненные больше threshold раз (признак N+1)"""
+        return [(sql, count) for sql, count in self.statements.items() if count > threshold]
+
+
+current_stats: ContextVar[RequestStats | None] = ContextVar("request_stats", default=None)
+
+
+# События всех движков (основная БД и реплики). Вне запроса к API ничего не считается.
+@event.listens_for(Engine, "before_cursor_execute")
+def start_query_timer(conn, cursor, statement, parameters, context, executemany) -> None:
+    if current_stats.get() is not None:
+        context._query_started = time.perf_counter()
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def record_query(conn, cursor, statement, parameters, context, executemany) -> None:
+    stats = current_stats.get()
+    if stats is None:
+        return
+    stats.db_seconds += time.perf_counter() - getattr(context, "_query_started", time.perf_counter())
+    stats.queries += 1
+    # SQL с параметрами-заполнителями: одинаковая форма при разных значениях
+    stats.statements[statement] += 1
+    # Измененные строки; прочитанные считает count_selected_rows по результату
+    if (context.isinsert or context.isupdate or context.isdelete) and cursor.rowcount > 0:
+        stats.rows += cursor.rowcount
+
+
+@event.listens_for(Session, "do_orm_execute")
+def count_selected_rows(orm_execute_state: ORMExecuteState):
+    """
+    Прочитанные строки SELECT через сессию. rowcount для SELECT драйверы
+    заполняют по-разному (SQLite - всегда -1), поэтому результат выбирается
+    целиком и отдается вызывающему коду заново (freeze). Результаты сессий
+    AsyncSession и так буферизуются полностью; потоковые (stream, yield_per)
+    не трогаем.
+    """
+    stats = current_stats.get()
+    if stats is None or not orm_execute_state.is_select:
+        return None
+    options = orm_execute_state.execution_options
+    if options.get("yield_per") or options.get("stream_results"):
+        return None
+    frozen = orm_execute_state.invoke_statement().freeze()
+    stats.rows += len(frozen.data)
+    return frozen()
+
+
+class TimingMiddleware:
+    """
+    Замеряет время обработки запроса, время в БД, число SQL-запросов и строк,
+    добавляет заголовок Server-Timing и пишет предупреждение, если один и тот же
+    запрос выполнен больше repeat_threshold раз (вероятный N+1). Время ответа
+    по шаблону маршрута и число запросов в обработке уходят в /metrics.
+    """
+
+    def __init__(self, app, repeat_threshold: int, excluded_paths: tuple[str, ...] = ()) -> None:
+        self.app = app
+        self.repeat_threshold = repeat_threshold
+        self.excluded_paths = excluded_paths
+
+    async def __call__(self, scope, receive, send):
+        # Долгие соединения (SSE, WebSocket) не замеряются: они искажают время
+        # ответа и число запросов в обработке
+        if scope["type"] != "http" or scope["path"] in self.excluded_paths:
+            await self.app(scope, receive, send)
+            return
+
+        stats = RequestStats()
+        token = current_stats.set(stats)
+        metrics.in_flight += 1
+
+        async def send_with_timing(message):
+            if message["type"] == "http.response.start":
+                stats.status = message["status"]
+                message["headers"] = [
+                    *message.get("headers", []),
+                    (b"server-timing", stats.server_timing().encode()),
+                ]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            current_stats.reset(token)
+            metrics.in_flight -= 1
+            # endpoint появляется в scope после маршрутизации; без него - 404
+            metrics.observe_request(scope.get("endpoint"), scope["method"], stats.status, stats.elapsed)
+            for statement, count in stats.repeated(self.repeat_threshold):
+                logger.warning(
+                    "%s %s: запрос выполнен %s раз (возможен N+1): %s",
+                    scope["method"], scope["path"], count, " ".join(statement.split())[:200],
+                )
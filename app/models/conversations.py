@@ -0,0 +1,55 @@
+from typing import TYPE_CHECKING, Optional
+from datetime import datetime
+from sqlalchemy import ForeignKey, DateTime, Index, UniqueConstraint
+from sqlalchemy.orm import Mapped, mapped_column, relationship
+from app.database.database import Base
+
+if TYPE_CHECKING:
+    from app.models.messages import MessageModel
+
+
+class ConversationModel(Base):
+    """
+    Диалог двух пользователей. Пара хранится неупорядоченной:
+    user_low_id < user_high_id, поэтому у каждой пары ровно одна строка.
+    """
+    __tablename__ = "conversations"
+    __table_args__ = (UniqueConstraint("user_low_id", "user_high_id"),)
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    user_low_id: Mapped[int] = mapped_column(ForeignKey("users.id"), nullable=False)
+    user_high_id: Mapped[int] = mapped_column(ForeignKey("users.id"), nullable=False)
+
+    last_message_id: Mapped[Optional[int]] = mapped_column(
+        ForeignKey("messages.id", use_alter=True, name="fk_conversations_last_message_id")
+    )
+    last_message_at: Mapped[datetime] = mapped_column(DateTime, nullable=False)
+
+    # Непрочитанные сообщения для каждой из сторон
+    unread_low: Mapped[int] = mapped_column(default=0, nullable=False)
+    unread_high: Mapped[int] = mapped_column(default=0, nullable=False)
+
+    last_message: Mapped[Optional["MessageModel"]] = relationship(
+        foreign_keys=[last_message_id]
+    )
+
+    def peer_of(self, user_id: int) -> int:
+        return self.user_high_id if user_id == self.user_low_id else self.user_low_id
+
+    def unread_for(self, user_id: int) -> int:
+        return self.unread_low if user_id == self.user_low_id else self.unread_high
+
+
+# Список диалогов пользователя: по одному индексу на каждую сторону пары
+Index(
+    "ix_conversations_user_high_id_last_message_at",
+    ConversationModel.user_high_id,
+    ConversationModel.last_message_at,
+    ConversationModel.id,
+)
+Index(
+    "ix_conversations_user_low_id_last_message_at",
+    ConversationModel.user_low_id,
+    ConversationModel.last_message_at,
+    ConversationModel.id,
+)
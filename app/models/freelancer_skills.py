@@ -12,7 +12,7 @@ class FreelancerSkillModel(Base):
     __tablename__ = "freelancer_skills"
 
     freelancer_id: Mapped[int] = mapped_column(ForeignKey("freelancers.id"), primary_key=True)
-    skill_id: Mapped[int] = mapped_column(ForeignKey("skills.id"), primary_key=True)
+    skill_id: Mapped[int] = mapped_column(ForeignKey("skills.id"), primary_key=True, index=True)
 
     freelancer: Mapped["FreelancerModel"] = relationship(back_populates="skills_assoc")
     skill: Mapped["SkillModel"] = relationship(back_populates="freelancers_assoc")
\ No newline at end of file
@@ -18,9 +18,29 @@ class FreelancerModel(Base):
     hourly_rate: Mapped[float] = mapped_column(nullable=True)
     portfolio_url: Mapped[str] = mapped_column(String(255), nullable=True)
 
+    # Агрегаты отзывов: обновляются вместе с отзывами (FreelancersRepository.apply_rating)
+    rating_count: Mapped[int] = mapped_column(default=0, server_default="0")
+    rating_sum: Mapped[int] = mapped_column(default=0, server_default="0")
+    rating_1: Mapped[int] = mapped_column(default=0, server_default="0")
+    rating_2: Mapped[int] = mapped_column(default=0, server_default="0")
+    rating_3: Mapped[int] = mapped_column(default=0, server_default="0")
+    rating_4: Mapped[int] = mapped_column(default=0, server_default="0")
+    rating_5: Mapped[int] = mapped_column(default=0, server_default="0")
+
     user_id: Mapped[int] = mapped_column(ForeignKey("users.id"), unique=True, nullable=False)
     user: Mapped["UserModel"] = relationship(back_populates="freelancer_profile")
 
     proposals: Mapped[List["ProposalModel"]] = relationship(back_populates="freelancer")
     reviews: Mapped[List["ReviewModel"]] = relationship(back_populates="freelancer")
-    skills_assoc: Mapped[List["FreelancerSkillModel"]] = relationship(back_populates="freelancer")
\ No newline at end of file
+    skills_assoc: Mapped[List["FreelancerSkillModel"]] = relationship(back_populates="freelancer")
+
+    @property
+    def avg_rating(self) -> float | None:
+        if not self.rating_count:
+            return None
+        return round(self.rating_sum / self.rating_count, 2)
+
+    @property
+    def rating_histogram(self) -> list[int]:
+        """Количество отзывов с оценками 1..5"""
+        return [self.rating_1, self.rating_2, self.rating_3, self.rating_4, self.rating_5]
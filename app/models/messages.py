@@ -1,6 +1,6 @@
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Optional
 from datetime import datetime
-from sqlalchemy import Text, ForeignKey, DateTime
+from sqlalchemy import Text, ForeignKey, DateTime, Index
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from app.database.database import Base
 
@@ -18,6 +18,30 @@ class MessageModel(Base):
 
     sender_id: Mapped[int] = mapped_column(ForeignKey("users.id"), nullable=False)
     recipient_id: Mapped[int] = mapped_column(ForeignKey("users.id"), nullable=False)
+    conversation_id: Mapped[Optional[int]] = mapped_column(ForeignKey("conversations.id"))
 
     sender: Mapped["UserModel"] = relationship(foreign_keys=[sender_id])
-    recipient: Mapped["UserModel"] = relationship(foreign_keys=[recipient_id])
\ No newline at end of file
+    recipient: Mapped["UserModel"] = relationship(foreign_keys=[recipient_id])
+
+
+# Индексы под выборку переписки пользователя (timestamp DESC, id DESC)
+Index(
+    "ix_messages_sender_id_timestamp",
+    MessageModel.sender_id,
+    MessageModel.timestamp,
+    MessageModel.id,
+)
+Index(
+    "ix_messages_recipient_id_timestamp",
+    MessageModel.recipient_id,
+    MessageModel.timestamp,
+    MessageModel.id,
+)
+
+# История диалога без OR по sender_id/recipient_id
+Index(
+    "ix_messages_conversation_id_timestamp",
+    MessageModel.conversation_id,
+    MessageModel.timestamp,
+    MessageModel.id,
+)
@@ -14,8 +14,8 @@ class PaymentModel(Base):
     id: Mapped[int] = mapped_column(primary_key=True)
     amount: Mapped[float] = mapped_column(Numeric(10, 2), nullable=False)
     currency: Mapped[str] = mapped_column(String(3), default="USD")
-    status: Mapped[str] = mapped_column(String(50), default="pending")  # pending, completed, failed
+    status: Mapped[str] = mapped_column(String(50), default="pending", index=True)  # pending, completed, failed
     payment_date: Mapped[datetime] = mapped_column(DateTime, nullable=True)
 
-    proposal_id: Mapped[int] = mapped_column(ForeignKey("proposals.id"), nullable=False)
+    proposal_id: Mapped[int] = mapped_column(ForeignKey("proposals.id"), nullable=False, index=True)
     proposal: Mapped["ProposalModel"] = relationship("ProposalModel", foreign_keys=[proposal_id])
\ No newline at end of file
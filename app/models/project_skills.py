@@ -0,0 +1,16 @@
+from typing import TYPE_CHECKING
+from sqlalchemy import ForeignKey
+from sqlalchemy.orm import Mapped, mapped_column, relationship
+from app.database.database import Base
+
+if TYPE_CHECKING:
+    from app.models.skills import SkillModel
+
+
+class ProjectSkillModel(Base):
+    __tablename__ = "project_skills"
+
+    project_id: Mapped[int] = mapped_column(ForeignKey("projects.id"), primary_key=True)
+    skill_id: Mapped[int] = mapped_column(ForeignKey("skills.id"), primary_key=True, index=True)
+
+    skill: Mapped["SkillModel"] = relationship()
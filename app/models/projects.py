@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Text, Float, DateTime, ForeignKey, Enum
+from sqlalchemy import Column, Integer, String, Text, Float, DateTime, ForeignKey, Enum, Index
 from sqlalchemy.orm import relationship
 from datetime import datetime
 import enum
@@ -18,11 +18,23 @@ class ProjectModel(Base):
     description = Column(Text, nullable=False)
     budget = Column(Float)
     deadline = Column(DateTime)
-    status = Column(Enum(ProjectStatus), default=ProjectStatus.OPEN)
-    client_id = Column(Integer, ForeignKey("users.id"), nullable=False)
-    created_at = Column(DateTime, default=datetime.utcnow)
+    status = Column(Enum(ProjectStatus), default=ProjectStatus.OPEN, nullable=False)
+    client_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
     
     # Связи
     client = relationship("UserModel", back_populates="projects")
     proposals = relationship("ProposalModel", back_populates="project", cascade="all, delete-orphan")
-    responses = relationship("ResponseModel", back_populates="project", cascade="all, delete-orphan")
\ No newline at end of file
+    responses = relationship("ResponseModel", back_populates="project", cascade="all, delete-orphan")
+    # Только для чтения (expand=skills): навыки проекта меняются через ProjectSkillModel
+    skills_assoc = relationship("ProjectSkillModel", viewonly=True)
+
+
+# Индекс под сортировку списка проектов (status, created_at DESC, id DESC),
+# в том числе с фильтром по статусу
+Index(
+    "ix_projects_status_created_at",
+    ProjectModel.status,
+    ProjectModel.created_at.desc(),
+    ProjectModel.id.desc(),
+)
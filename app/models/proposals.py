@@ -1,6 +1,6 @@
 from typing import TYPE_CHECKING
 from datetime import datetime
-from sqlalchemy import Text, ForeignKey, DateTime, Numeric
+from sqlalchemy import Text, ForeignKey, DateTime, Numeric, Index
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from app.database.database import Base
 
@@ -23,4 +23,34 @@ class ProposalModel(Base):
     
 
     freelancer_id: Mapped[int] = mapped_column(ForeignKey("freelancers.id"), nullable=False)
-    freelancer: Mapped["FreelancerModel"] = relationship(back_populates="proposals")
\ No newline at end of file
+    freelancer: Mapped["FreelancerModel"] = relationship(back_populates="proposals")
+
+
+# Одно предложение фрилансера на проект - проверяется при вставке
+Index(
+    "uq_proposals_project_id_freelancer_id",
+    ProposalModel.project_id,
+    ProposalModel.freelancer_id,
+    unique=True,
+)
+
+# Индексы под фильтры и сортировку списка предложений (submitted_at DESC, id DESC)
+Index("ix_proposals_submitted_at", ProposalModel.submitted_at, ProposalModel.id)
+Index(
+    "ix_proposals_project_id_submitted_at",
+    ProposalModel.project_id,
+    ProposalModel.submitted_at,
+    ProposalModel.id,
+)
+Index(
+    "ix_proposals_freelancer_id_submitted_at",
+    ProposalModel.freelancer_id,
+    ProposalModel.submitted_at,
+    ProposalModel.id,
+)
+Index(
+    "ix_proposals_status_submitted_at",
+    ProposalModel.status,
+    ProposalModel.submitted_at,
+    ProposalModel.id,
+)
@@ -1,6 +1,6 @@
 from typing import TYPE_CHECKING
 from datetime import datetime
-from sqlalchemy import Text, ForeignKey, Integer, DateTime
+from sqlalchemy import Text, ForeignKey, Integer, DateTime, Index
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from app.database.database import Base
 
@@ -18,8 +18,24 @@ class ReviewModel(Base):
     created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
 
     project_id: Mapped[int] = mapped_column(ForeignKey("projects.id"), nullable=False)
-    reviewer_id: Mapped[int] = mapped_column(ForeignKey("users.id"), nullable=False)  # обычно клиент
+    reviewer_id: Mapped[int] = mapped_column(ForeignKey("users.id"), nullable=False, index=True)  # обычно клиент
     freelancer_id: Mapped[int] = mapped_column(ForeignKey("freelancers.id"), nullable=False)
 
     reviewer: Mapped["UserModel"] = relationship(foreign_keys=[reviewer_id])
-    freelancer: Mapped["FreelancerModel"] = relationship(back_populates="reviews")
\ No newline at end of file
+    freelancer: Mapped["FreelancerModel"] = relationship(back_populates="reviews")
+
+
+# Индексы под фильтры и сортировку списка отзывов (created_at DESC, id DESC)
+Index("ix_reviews_created_at", ReviewModel.created_at, ReviewModel.id)
+Index(
+    "ix_reviews_freelancer_id_created_at",
+    ReviewModel.freelancer_id,
+    ReviewModel.created_at,
+    ReviewModel.id,
+)
+Index(
+    "ix_reviews_project_id_created_at",
+    ReviewModel.project_id,
+    ReviewModel.created_at,
+    ReviewModel.id,
+)
@@ -0,0 +1,11 @@
+from sqlalchemy import ForeignKey
+from sqlalchemy.orm import Mapped, mapped_column
+from app.database.database import Base
+
+
+class UnreadCounterModel(Base):
+    """Материализованный счетчик непрочитанных входящих сообщений пользователя"""
+    __tablename__ = "unread_counters"
+
+    user_id: Mapped[int] = mapped_column(ForeignKey("users.id"), primary_key=True)
+    count: Mapped[int] = mapped_column(default=0, nullable=False)
@@ -18,7 +18,7 @@ class UserModel(Base):
     email: Mapped[str] = mapped_column(String(100), unique=True, nullable=False)
     hashed_password: Mapped[str] = mapped_column(String(300), nullable=False)
 
-    role_id: Mapped[int] = mapped_column(ForeignKey("roles.id"), nullable=False)
+    role_id: Mapped[int] = mapped_column(ForeignKey("roles.id"), nullable=False, index=True)
     role: Mapped["RoleModel"] = relationship(back_populates="users")
 
     freelancer_profile: Mapped["FreelancerModel"] = relationship(back_populates="user")
@@ -1,12 +1,32 @@
-from pydantic import BaseModel
-from sqlalchemy import delete, insert, select, update
-from sqlalchemy.exc import IntegrityError
+from functools import cache
+
+from pydantic import BaseModel, TypeAdapter
+from sqlalchemy import delete, func, insert, select, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.exc import IntegrityError, MultipleResultsFound
 
 
 from app.database.database import Base
 from app.exceptions.base import ObjectAlreadyExistsError
 
 
+@cache
+def projection_of(model, schema) -> tuple | None:
+    """
+    Колонки модели под поля схемы. None, если схеме нужны не только
+    колонки (свойства, связи) - тогда загружается ORM-объект целиком.
+    """
+    columns = model.__mapper__.column_attrs
+    if not all(name in columns for name in schema.model_fields):
+        return None
+    return tuple(getattr(model, name) for name in schema.model_fields)
+
+
+@cache
+def list_adapter(schema) -> TypeAdapter:
+    return TypeAdapter(list[schema])
+
+
 class BaseRepository:
     model: Base = None
     schema: BaseModel = None
@@ -14,43 +34,80 @@ class BaseRepository:
     def __init__(self, session):
         self.session = session
 
+    @property
+    def _is_postgres(self) -> bool:
+        return self.session.bind.dialect.name == "postgresql"
+
+    def _upsert(self):
+        """INSERT с поддержкой ON CONFLICT для текущего диалекта"""
+        if self._is_postgres:
+            return postgresql.insert(self.model)
+        return sqlite.insert(self.model)
+
+    def _not_negative(self, value):
+        # В SQLite скалярная max(a, b) аналогична greatest в PostgreSQL
+        if self._is_postgres:
+            return func.greatest(value, 0)
+        return func.max(value, 0)
+
+    def _select(self):
+        """
+        SELECT только колонок, объявленных в схеме: строки не попадают
+        в identity map сессии и не инструментируются
+        """
+        columns = projection_of(self.model, self.schema)
+        if columns is None:
+            return select(self.model)
+        return select(*columns)
+
+    def _to_schemas(self, result, validate: bool = True) -> list[BaseModel]:
+        if projection_of(self.model, self.schema) is None:
+            return [
+                self.schema.model_validate(model, from_attributes=True)
+                for model in result.scalars().all()
+            ]
+
+        rows = result.mappings().all()
+        if not validate:
+            # Данные из своей БД: типы колонок уже соответствуют схеме,
+            # валидаторы полей (ограничения Field) не выполняются
+            return [self.schema.model_construct(**row) for row in rows]
+        return list_adapter(self.schema).validate_python(rows)
+
     async def get_filtered(
         self,
         limit: int | None = None,
         offset: int | None = None,
         *filter,
+        validate: bool = True,
         **filter_by,
     ) -> list[BaseModel]:
         filter_by = {k: v for k, v in filter_by.items() if v is not None}
         filter_ = [v for v in filter if v is not None]
 
-        query = select(self.model).filter(*filter_).filter_by(**filter_by)
+        query = self._select().filter(*filter_).filter_by(**filter_by)
 
         if limit is not None and offset is not None:
             query = query.limit(limit).offset(offset)
         # print(query.compile(bind=engine, compile_kwargs={"literal_binds": True}))
         result = await self.session.execute(query)
-        result = [
-            self.schema.model_validate(model, from_attributes=True)
-            for model in result.scalars().all()
-        ]
-
-        return result
+        return self._to_schemas(result, validate)
 
     async def get_all(self, *args, **kwargs) -> list[BaseModel]:
         """Возращает все записи в БД из связаной таблицы"""
         return await self.get_filtered(*args, **kwargs)
 
     async def get_one_or_none(self, **filter_by) -> None | BaseModel:
-        query = select(self.model).filter_by(**filter_by)
+        query = self._select().filter_by(**filter_by)
 
         result = await self.session.execute(query)
 
-        model = result.scalars().one_or_none()
-        if model is None:
+        items = self._to_schemas(result)
+        if not items:
             return None
-        result = self.schema.model_validate(model, from_attributes=True)
-        return result
+        if len(items) > 1:
+            raise MultipleResultsFound("Multiple rows were found when one or none was required")
+        return items[0]
 
     async def add(self, data: BaseModel):
         try:
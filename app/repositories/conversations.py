@@ -0,0 +1,122 @@
+from sqlalchemy import func, select, union_all, update
+
+from app.models.conversations import ConversationModel
+from app.models.messages import MessageModel
+from app.repositories.base import BaseRepository
+
+
+class ConversationsRepository(BaseRepository):
+    """
+    Диалоги пользователей. Как и счетчики непрочитанных, изменяются в
+    транзакции записи сообщения: вызывать после flush, до commit.
+    """
+    model = ConversationModel
+
+    @staticmethod
+    def pair(user_a: int, user_b: int) -> tuple[int, int]:
+        return min(user_a, user_b), max(user_a, user_b)
+
+    def _unread_column(self, low: int, user_id: int):
+        return self.model.unread_low if user_id == low else self.model.unread_high
+
+    async def get_or_create_id(self, user_a: int, user_b: int) -> int:
+        """
+        Id диалога пары, создает диалог при первом сообщении. Вызывается до
+        вставки сообщения, чтобы оно сразу записывалось с conversation_id.
+        Для существующего диалога - только чтение по уникальному индексу пары.
+        """
+        low, high = self.pair(user_a, user_b)
+        query = select(self.model.id).where(
+            self.model.user_low_id == low, self.model.user_high_id == high
+        )
+        conversation_id = (await self.session.execute(query)).scalar_one_or_none()
+        if conversation_id is None:
+            # Время последнего сообщения уточнит add_message в той же транзакции
+            stmt = self._upsert().values(
+                user_low_id=low, user_high_id=high, last_message_at=func.now()
+            )
+            await self.session.execute(stmt.on_conflict_do_nothing(
+                index_elements=[self.model.user_low_id, self.model.user_high_id]
+            ))
+            conversation_id = (await self.session.execute(query)).scalar_one()
+        return conversation_id
+
+    async def add_message(self, message: MessageModel) -> None:
+        """
+        Обновляет последнее сообщение диалога одним upsert и увеличивает
+        счетчик непрочитанных у получателя. Сообщение уже записано с
+        conversation_id (get_or_create_id).
+        """
+        low, high = self.pair(message.sender_id, message.recipient_id)
+        unread = self._unread_column(low, message.recipient_id)
+
+        stmt = self._upsert().values(
+            user_low_id=low,
+            user_high_id=high,
+            last_message_id=message.id,
+            last_message_at=message.timestamp,
+            **{unread.key: 1},
+        )
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[self.model.user_low_id, self.model.user_high_id],
+            set_={
+                "last_message_id": message.id,
+                "last_message_at": message.timestamp,
+                unread.key: unread + 1,
+            },
+        )
+        await self.session.execute(stmt)
+
+    async def add_unread(self, message: MessageModel, delta: int) -> None:
+        """Изменяет счетчик непрочитанных получателя в диалоге сообщения"""
+        if message.conversation_id is None:
+            return
+        low, _ = self.pair(message.sender_id, message.recipient_id)
+        unread = self._unread_column(low, message.recipient_id)
+        await self.session.execute(
+            update(self.model)
+            .where(self.model.id == message.conversation_id)
+            .values({unread.key: self._not_negative(unread + delta)})
+        )
+
+    async def refresh_last_message(
+        self, conversation_id: int, exclude_message_id: int | None = None
+    ) -> None:
+        """Пересчитывает последнее сообщение диалога (перед удалением сообщения)"""
+        query = (
+            select(MessageModel.id, MessageModel.timestamp)
+            .where(MessageModel.conversation_id == conversation_id)
+            .order_by(MessageModel.timestamp.desc(), MessageModel.id.desc())
+            .limit(1)
+        )
+        if exclude_message_id is not None:
+            query = query.where(MessageModel.id != exclude_message_id)
+        last = (await self.session.execute(query)).one_or_none()
+
+        # Без сообщений диалог сохраняет прежнее время, чтобы не всплывать в списке
+        values = {"last_message_id": None}
+        if last is not None:
+            values = {"last_message_id": last.id, "last_message_at": last.timestamp}
+        await self.session.execute(
+            update(self.model).where(self.model.id == conversation_id).values(**values)
+        )
+
+    async def get_by_pair(self, user_a: int, user_b: int) -> ConversationModel | None:
+        low, high = self.pair(user_a, user_b)
+        result = await self.session.execute(
+            select(self.model).where(
+                self.model.user_low_id == low, self.model.user_high_id == high
+            )
+        )
+        return result.scalar_one_or_none()
+
+    def user_conversations_query(self, user_id: int):
+        """
+        Диалоги пользователя. Вместо OR по двум колонкам - объединение двух
+        поисков по индексам (user_low_id, ...) и (user_high_id, ...).
+        """
+        ids = union_all(
+            select(self.model.id).where(self.model.user_low_id == user_id),
+            select(self.model.id).where(self.model.user_high_id == user_id),
+        )
+        return select(self.model).where(self.model.id.in_(ids))
@@ -0,0 +1,76 @@
+from sqlalchemy import case, func, or_, select, update
+
+from app.models.freelancers import FreelancerModel
+from app.models.reviews import ReviewModel
+from app.repositories.base import BaseRepository
+from app.schemas.freelancers import Freelancer
+
+RATINGS = range(1, 6)
+
+
+class FreelancersRepository(BaseRepository):
+    model = FreelancerModel
+    schema = Freelancer
+
+    async def apply_rating(
+        self,
+        freelancer_id: int,
+        added: int | None = None,
+        removed: int | None = None,
+    ) -> None:
+        """
+        Учитывает в агрегатах добавленную и/или удаленную оценку (изменение
+        отзыва - это удаление старой оценки и добавление новой). Одно UPDATE
+        с инкрементами на стороне БД, вызывать в транзакции записи отзыва.
+        """
+        if added == removed:
+            return
+        model = self.model
+        values = {}
+        delta_count = (added is not None) - (removed is not None)
+        if delta_count:
+            values["rating_count"] = model.rating_count + delta_count
+        values["rating_sum"] = model.rating_sum + (added or 0) - (removed or 0)
+        if added is not None:
+            column = getattr(model, f"rating_{added}")
+            values[column.key] = column + 1
+        if removed is not None:
+            column = getattr(model, f"rating_{removed}")
+            values[column.key] = column - 1
+
+        await self.session.execute(
+            update(model).where(model.id == freelancer_id).values(**values)
+        )
+
+    async def rebuild_ratings(self, freelancer_id: int | None = None) -> int:
+        """
+        Пересчитывает агрегаты по таблице reviews и исправляет расхождения.
+        Возвращает количество исправленных фрилансеров.
+        """
+        model = self.model
+
+        def aggregate(expression):
+            return (
+                select(func.coalesce(expression, 0))
+                .where(ReviewModel.freelancer_id == model.id)
+                .scalar_subquery()
+            )
+
+        actual = {
+            "rating_count": aggregate(func.count(ReviewModel.id)),
+            "rating_sum": aggregate(func.sum(ReviewModel.rating)),
+        }
+        for rating in RATINGS:
+            actual[f"rating_{rating}"] = aggregate(
+                func.sum(case((ReviewModel.rating == rating, 1), else_=0))
+            )
+
+        drifted = or_(*(
+            getattr(model, name) != expression for name, expression in actual.items()
+        ))
+        stmt = update(model).where(drifted).values(**actual)
+        if freelancer_id is not None:
+            stmt = stmt.where(model.id == freelancer_id)
+
+        result = await self.session.execute(stmt)
+        return result.rowcount
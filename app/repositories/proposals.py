@@ -0,0 +1,31 @@
+from sqlalchemy import Row, select
+
+from app.models.freelancers import FreelancerModel
+from app.models.projects import ProjectModel
+from app.models.proposals import ProposalModel
+from app.repositories.base import BaseRepository
+from app.schemas.proposals import Proposal
+
+
+class ProposalsRepository(BaseRepository):
+    model = ProposalModel
+    schema = Proposal
+
+    async def get_write_precheck(self, project_id: int, freelancer_id: int) -> Row:
+        """
+        Данные для проверки нового предложения одним запросом:
+        статус проекта и владелец профиля фрилансера (None - если не найдены).
+        Повторное предложение отсекает уникальный индекс при вставке.
+        """
+        query = select(
+            select(ProjectModel.status)
+            .where(ProjectModel.id == project_id)
+            .scalar_subquery()
+            .label("project_status"),
+            select(FreelancerModel.user_id)
+            .where(FreelancerModel.id == freelancer_id)
+            .scalar_subquery()
+            .label("freelancer_user_id"),
+        )
+        result = await self.session.execute(query)
+        return result.one()
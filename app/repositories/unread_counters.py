@@ -0,0 +1,68 @@
+from sqlalchemy import false, func, select, update
+
+from app.models.messages import MessageModel
+from app.models.unread_counters import UnreadCounterModel
+from app.repositories.base import BaseRepository
+from app.schemas.messages import UnreadCounter
+
+
+class UnreadCountersRepository(BaseRepository):
+    """
+    Счетчики непрочитанных сообщений. Изменяются в той же транзакции, что и
+    сами сообщения, поэтому вызывать методы нужно после flush изменений
+    сообщения и до commit.
+    """
+    model = UnreadCounterModel
+    schema = UnreadCounter
+
+    @staticmethod
+    def _actual_count(user_id: int):
+        """Подсчет по таблице messages - для пользователей без строки счетчика"""
+        return (
+            select(func.count())
+            .select_from(MessageModel)
+            .where(
+                MessageModel.recipient_id == user_id,
+                MessageModel.is_read == false(),
+            )
+            .scalar_subquery()
+        )
+
+    async def add_delta(self, user_id: int, delta: int) -> None:
+        """
+        Атомарно изменяет счетчик на delta. Если строки еще нет (сообщения
+        появились до введения счетчиков), она создается с фактическим значением,
+        которое уже учитывает текущее изменение. Подсчет по messages выполняется
+        только в этом случае, а не при каждой записи.
+        """
+        increment = (
+            update(self.model)
+            .where(self.model.user_id == user_id)
+            .values(count=self._not_negative(self.model.count + delta))
+        )
+        if (await self.session.execute(increment)).rowcount:
+            return
+        stmt = self._upsert().values(
+            user_id=user_id, count=self._actual_count(user_id)
+        )
+        result = await self.session.execute(
+            stmt.on_conflict_do_nothing(index_elements=[self.model.user_id])
+        )
+        if not result.rowcount:
+            # Строку успел вставить параллельный запрос, не видевший наше
+            # сообщение - изменение применяется к ней
+            await self.session.execute(increment)
+
+    async def get_count(self, user_id: int) -> int:
+        """
+        Только читает: строка счетчика создается при записи сообщения
+        (add_delta). Если строки нет - у пользователя не было входящих после
+        введения счетчиков, - возвращается подсчет по messages без записи.
+        """
+        result = await self.session.execute(
+            select(func.coalesce(
+                select(self.model.count).where(self.model.user_id == user_id).scalar_subquery(),
+                self._actual_count(user_id),
+            ))
+        )
+        return result.scalar_one()
@@ -0,0 +1,46 @@
+from typing import List, Optional
+
+from pydantic import BaseModel, ConfigDict
+
+from app.schemas.freelancers import Freelancer
+from app.schemas.projects import Project
+from app.schemas.proposals import Proposal
+from app.schemas.reviews import Review
+from app.schemas.roles import SRoleGet
+from app.schemas.skills import Skill
+
+# Схемы ответов списков с раскрытыми связями (?expand=...). Поля связей
+# заполняются только при раскрытии, нераскрытые в ответ не попадают.
+
+
+class UserPublic(BaseModel):
+    """Пользователь в составе другого объекта - без email"""
+    id: int
+    name: str
+    role_id: int
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class UserPublicExpanded(UserPublic):
+    role: Optional[SRoleGet] = None
+
+
+class ProjectExpanded(Project):
+    client: Optional[UserPublicExpanded] = None
+    skills: Optional[List[Skill]] = None
+
+
+class FreelancerExpanded(Freelancer):
+    user: Optional[UserPublicExpanded] = None
+    skills: Optional[List[Skill]] = None
+
+
+class ProposalExpanded(Proposal):
+    project: Optional[ProjectExpanded] = None
+    freelancer: Optional[FreelancerExpanded] = None
+
+
+class ReviewExpanded(Review):
+    reviewer: Optional[UserPublicExpanded] = None
+    freelancer: Optional[FreelancerExpanded] = None
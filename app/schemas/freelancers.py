@@ -1,5 +1,5 @@
 from pydantic import BaseModel, ConfigDict
-from typing import Optional
+from typing import List, Optional
 
 class FreelancerBase(BaseModel):
     bio: Optional[str] = None
@@ -15,5 +15,8 @@ class FreelancerUpdate(FreelancerBase):
 class Freelancer(FreelancerBase):
     id: int
     user_id: int
+    rating_count: int = 0
+    avg_rating: Optional[float] = None
+    rating_histogram: List[int] = [0, 0, 0, 0, 0]
     
     model_config = ConfigDict(from_attributes=True)
\ No newline at end of file
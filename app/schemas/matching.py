@@ -0,0 +1,14 @@
+from pydantic import BaseModel
+
+from app.schemas.freelancers import Freelancer
+from app.schemas.projects import Project
+
+class FreelancerMatch(BaseModel):
+    freelancer: Freelancer
+    score: float
+    matched_skills: int
+
+class ProjectMatch(BaseModel):
+    project: Project
+    score: float
+    matched_skills: int
@@ -18,4 +18,23 @@ class Message(MessageBase):
     timestamp: datetime
     is_read: bool
     
-    model_config = ConfigDict(from_attributes=True)
\ No newline at end of file
+    model_config = ConfigDict(from_attributes=True)
+
+class UnreadCounter(BaseModel):
+    user_id: int
+    count: int
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class UnreadCount(BaseModel):
+    unread_count: int
+
+
+class Conversation(BaseModel):
+    id: int
+    peer_id: int
+    last_message_id: Optional[int] = None
+    last_message_at: datetime
+    unread_count: int
+    last_message: Optional[Message] = None
@@ -0,0 +1,11 @@
+from pydantic import BaseModel, ConfigDict, Field
+
+class ProjectSkillBase(BaseModel):
+    project_id: int = Field(..., ge=1)
+    skill_id: int = Field(..., ge=1)
+
+class ProjectSkillCreate(ProjectSkillBase):
+    pass
+
+class ProjectSkill(ProjectSkillBase):
+    model_config = ConfigDict(from_attributes=True)
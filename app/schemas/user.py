@@ -1,5 +1,5 @@
 # app/schemas/user.py - ПРАВИЛЬНАЯ ВЕРСИЯ
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
 from typing import Optional
 
 class UserBase(BaseModel):
@@ -44,3 +44,13 @@ class SUserAdd(BaseModel):
 
 class SUserGet(SUserAdd):
     id:int
+
+
+class SUserPrincipal(BaseModel):
+    """Неизменяемое представление аутентифицированного пользователя (без хеша пароля)"""
+    id: int
+    name: str
+    email: str
+    role_id: int
+
+    model_config = ConfigDict(frozen=True, from_attributes=True)
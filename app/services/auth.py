@@ -16,43 +16,44 @@ from app.schemas.user import (
 )
 from app.schemas.relations_users_roles import SUserGetWithRels
 from app.services.base import BaseService
-from jose import jwt
-from passlib.context import CryptContext
+from app.utils.hashing import password_hasher
+from jose import ExpiredSignatureError, JWTError, jwt
 
 
 class AuthService(BaseService):
-    pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
     @classmethod
     def create_access_token(cls, data: dict) -> str:
         to_encode = data.copy()
-        expire: datetime = datetime.now(timezone.utc) + timedelta(
+        issued_at: datetime = datetime.now(timezone.utc)
+        expire: datetime = issued_at + timedelta(
             minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES
         )
-        to_encode |= {"exp": expire}
+        to_encode |= {"exp": expire, "iat": issued_at}
         encoded_jwt = jwt.encode(to_encode, settings.SECRET_KEY, settings.ALGORITHM)
         return encoded_jwt
 
     @classmethod
-    def verify_password(cls, plain_password, hashed_password) -> bool:
-        return cls.pwd_context.verify(plain_password, hashed_password)
+    async def verify_password(cls, plain_password, hashed_password) -> bool:
+        return await password_hasher.verify(plain_password, hashed_password)
 
     @classmethod
-    def hash_password(cls, plain_password) -> str:
-        return cls.pwd_context.hash(plain_password)
+    async def hash_password(cls, plain_password) -> str:
+        return await password_hasher.hash(plain_password)
 
     @classmethod
     def decode_token(cls, token: str) -> dict:
         try:
             return jwt.decode(token, settings.SECRET_KEY, [settings.ALGORITHM])
-        except jwt.exceptions.DecodeError as ex:
-            raise InvalidJWTTokenError from ex
-        except jwt.exceptions.ExpiredSignatureError as ex:
+        # ExpiredSignatureError - подкласс JWTError, поэтому проверяется первым
+        except ExpiredSignatureError as ex:
             raise JWTTokenExpiredError from ex
+        except JWTError as ex:
+            raise InvalidJWTTokenError from ex
 
     async def register_user(self, user_data: SUserAddRequest):
         try:
-            hashed_password: str = self.hash_password(user_data.password)
+            hashed_password: str = await self.hash_password(user_data.password)
             new_user_data = SUserAdd(
                 email=user_data.email,
                 hashed_password=hashed_password,
@@ -68,7 +69,7 @@ class AuthService(BaseService):
         user = await self.db.users.get_one_or_none_with_role(email=user_data.email)
         if not user:
             raise UserNotFoundError
-        if not self.verify_password(user_data.password, user.hashed_password):
+        if not await self.verify_password(user_data.password, user.hashed_password):
             raise InvalidPasswordError
         access_token: str = self.create_access_token(
             {
@@ -0,0 +1,478 @@
+import asyncio
+import functools
+import logging
+from collections import defaultdict
+from dataclasses import dataclass
+
+import numpy as np
+from sqlalchemy import select
+
+from app.config import settings
+from app.models.freelancer_skills import FreelancerSkillModel
+from app.models.freelancers import FreelancerModel
+from app.models.project_skills import ProjectSkillModel
+from app.models.projects import ProjectModel, ProjectStatus
+
+logger = logging.getLogger(__name__)
+
+
+def grow(array: np.ndarray, capacity: int, fill=0) -> np.ndarray:
+    """Копия массива увеличенной емкости (np.resize не работает с пустыми массивами)"""
+    grown = np.full(capacity, fill, dtype=array.dtype)
+    grown[:len(array)] = array
+    return grown
+
+
+class SkillGraph:
+    """
+    Связи объект-навык (фрилансер или проект). Основное хранилище - CSR по
+    навыкам: для навыка skill_rows[skill_id] объекты лежат в
+    indices[indptr[row]:indptr[row + 1]] (плотные номера объектов).
+    Изменения копятся в журнале (added/removed) и вливаются в CSR при уплотнении.
+    Внутри строки CSR номера отсортированы - проверка связи бинарным поиском.
+    """
+
+    def __init__(self, compact_threshold: int) -> None:
+        self.compact_threshold = compact_threshold
+        self.ids = np.empty(0, dtype=np.int64)  # плотный номер -> id объекта
+        self.index: dict[int, int] = {}  # id объекта -> плотный номер
+        self.active = np.empty(0, dtype=bool)
+        self.degree = np.empty(0, dtype=np.int32)  # количество навыков объекта
+        self._size = 0
+
+        self._skill_rows: dict[int, int] = {}
+        self._indptr = np.zeros(1, dtype=np.int64)
+        self._indices = np.empty(0, dtype=np.int32)
+        self._added: dict[int, set[int]] = defaultdict(set)
+        self._removed: dict[int, set[int]] = defaultdict(set)
+        self._pending = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def set_items(self, item_ids: np.ndarray) -> None:
+        """Заполняет пустой граф объектами (векторно, для загрузки)"""
+        item_ids = np.asarray(item_ids, dtype=np.int64)
+        self._size = len(item_ids)
+        self.ids = item_ids.copy()
+        self.index = dict(zip(item_ids.tolist(), range(self._size)))
+        self.active = np.ones(self._size, dtype=bool)
+        self.degree = np.zeros(self._size, dtype=np.int32)
+
+    def build(self, item_ids: np.ndarray, skill_ids: np.ndarray) -> None:
+        """Строит CSR из массивов пар (id объекта, id навыка)"""
+        item_ids = np.asarray(item_ids, dtype=np.int64)
+        skill_ids = np.asarray(skill_ids, dtype=np.int64)
+        known = self.ids[:self._size]
+        for item_id in np.unique(item_ids[~np.isin(item_ids, known)]):
+            self.item(int(item_id))
+
+        sorter = np.argsort(self.ids[:self._size], kind="stable")
+        dense = sorter[np.searchsorted(self.ids[:self._size], item_ids, sorter=sorter)]
+        self._set_csr(dense.astype(np.int32), skill_ids)
+        self.degree[:self._size] = np.bincount(dense, minlength=self._size)
+
+    def _set_csr(self, dense: np.ndarray, skill_ids: np.ndarray) -> None:
+        unique_skills, rows = np.unique(skill_ids, return_inverse=True)
+        # Одна сортировка по составному ключу (строка, номер): пары уникальны
+        stride = int(dense.max()) + 1 if len(dense) else 1
+        order = np.argsort(rows.astype(np.int64) * stride + dense)
+        self._indices = dense[order].astype(np.int32)
+        self._indptr = np.zeros(len(unique_skills) + 1, dtype=np.int64)
+        np.cumsum(np.bincount(rows, minlength=len(unique_skills)), out=self._indptr[1:])
+        self._skill_rows = {int(skill): row for row, skill in enumerate(unique_skills)}
+        self._added.clear()
+        self._removed.clear()
+        self._pending = 0
+
+    def item(self, item_id: int) -> int:
+        """Плотный номер объекта; новый объект добавляется в конец массивов"""
+        dense = self.index.get(item_id)
+        if dense is not None:
+            return dense
+        if self._size == len(self.ids):
+            capacity = max(16, len(self.ids) * 2)
+            self.ids = grow(self.ids, capacity)
+            self.active = grow(self.active, capacity)
+            self.degree = grow(self.degree, capacity)
+        dense = self._size
+        self.ids[dense] = item_id
+        self.active[dense] = True
+        self.degree[dense] = 0
+        self.index[item_id] = dense
+        self._size += 1
+        return dense
+
+    def set_active(self, item_id: int, active: bool) -> None:
+        dense = self.item(item_id)  # может увеличить массивы
+        self.active[dense] = active
+
+    def _in_csr(self, dense: int, skill_id: int) -> bool:
+        row = self._skill_rows.get(skill_id)
+        if row is None:
+            return False
+        start, end = self._indptr[row], self._indptr[row + 1]
+        position = start + np.searchsorted(self._indices[start:end], dense)
+        return position < end and self._indices[position] == dense
+
+    def add(self, item_id: int, skill_id: int) -> None:
+        """Добавляет связь; повторное добавление существующей связи ничего не меняет"""
+        dense = self.item(item_id)
+        if dense in self._removed[skill_id]:
+            self._removed[skill_id].discard(dense)
+        elif dense in self._added[skill_id] or self._in_csr(dense, skill_id):
+            return
+        else:
+            self._added[skill_id].add(dense)
+        self.degree[dense] += 1
+        self._changed()
+
+    def remove(self, item_id: int, skill_id: int) -> None:
+        """Удаляет связь; удаление отсутствующей связи ничего не меняет"""
+        dense = self.index.get(item_id)
+        if dense is None:
+            return
+        if dense in self._added[skill_id]:
+            self._added[skill_id].discard(dense)
+        elif dense in self._removed[skill_id] or not self._in_csr(dense, skill_id):
+            return
+        else:
+            self._removed[skill_id].add(dense)
+        self.degree[dense] -= 1
+        self._changed()
+
+    def _changed(self) -> None:
+        self._pending += 1
+        if self._pending >= self.compact_threshold:
+            self.compact()
+
+    def postings(self, skill_id: int) -> np.ndarray:
+        """Плотные номера объектов с навыком (с учетом журнала изменений)"""
+        row = self._skill_rows.get(skill_id)
+        if row is None:
+            base = self._indices[:0]
+        else:
+            base = self._indices[self._indptr[row]:self._indptr[row + 1]]
+        removed = self._removed.get(skill_id)
+        if removed:
+            base = base[~np.isin(base, np.fromiter(removed, dtype=np.int32))]
+        added = self._added.get(skill_id)
+        if added:
+            base = np.concatenate([base, np.fromiter(added, dtype=np.int32)])
+        return base
+
+    def frequency(self, skill_id: int) -> int:
+        """Количество объектов с навыком без сборки списка"""
+        row = self._skill_rows.get(skill_id)
+        base = 0 if row is None else int(self._indptr[row + 1] - self._indptr[row])
+        return base + len(self._added.get(skill_id, ())) - len(self._removed.get(skill_id, ()))
+
+    def compact(self) -> None:
+        """Вливает журнал изменений в CSR"""
+        skills = set(self._skill_rows) | set(self._added)
+        parts, skill_parts = [], []
+        for skill_id in skills:
+            posting = self.postings(skill_id)
+            parts.append(posting)
+            skill_parts.append(np.full(len(posting), skill_id, dtype=np.int64))
+        if parts:
+            self._set_csr(np.concatenate(parts), np.concatenate(skill_parts))
+        else:
+            self._set_csr(np.empty(0, dtype=np.int32), np.empty(0, dtype=np.int64))
+
+    def overlap(self, skill_ids: list[int], weights: np.ndarray) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Кандидаты, у которых есть хотя бы один из навыков: плотные номера,
+        сумма весов совпавших навыков и количество совпавших навыков.
+        """
+        postings = [self.postings(skill_id) for skill_id in skill_ids]
+        if not postings or not any(len(posting) for posting in postings):
+            empty = np.empty(0)
+            return empty.astype(np.int32), empty, empty
+        dense = np.concatenate(postings)
+        skill_weights = np.repeat(weights, [len(posting) for posting in postings])
+        weighted = np.bincount(dense, weights=skill_weights, minlength=self._size)
+        matched = np.bincount(dense, minlength=self._size)
+        candidates = np.flatnonzero((matched > 0) & self.active[:self._size])
+        return candidates, weighted[candidates], matched[candidates]
+
+    def nbytes(self) -> int:
+        return (self.ids.nbytes + self.active.nbytes + self.degree.nbytes
+                + self._indptr.nbytes + self._indices.nbytes)
+
+
+def replayed(method):
+    """
+    Изменение индекса, которое повторяется на индексе, построенном
+    перезагрузкой: пока load ждет ответов БД, изменения применяются к старому
+    индексу и иначе пропали бы при замене. Метод должен быть идемпотентным -
+    изменение могло уже попасть в прочитанные из БД данные.
+    """
+    @functools.wraps(method)
+    def wrapper(self, *args):
+        if self._journal is not None:
+            self._journal.append((method, args))
+        method(self, *args)
+    return wrapper
+
+
+@dataclass
+class Match:
+    id: int
+    score: float
+    matched_skills: int
+
+
+class MatchingEngine:
+    """
+    Подбор фрилансеров для проекта и открытых проектов для фрилансера.
+    Граф навыков держится в памяти процесса (NumPy, CSR) и обновляется
+    при записи связей; полная перезагрузка из БД - при старте и периодически.
+
+    Оценка фрилансера: взвешенное покрытие навыков проекта (редкие навыки
+    весят больше), сглаженный рейтинг и соответствие ставки лимиту.
+    """
+
+    # Сглаживание рейтинга: столько "средних" отзывов добавляется к каждому
+    rating_prior_count = 5
+
+    def __init__(
+        self,
+        skill_weight: float,
+        rating_weight: float,
+        rate_weight: float,
+        compact_threshold: int,
+    ) -> None:
+        self.skill_weight = skill_weight
+        self.rating_weight = rating_weight
+        self.rate_weight = rate_weight
+        self.compact_threshold = compact_threshold
+        # Изменения за время перезагрузки (None - перезагрузка не идет)
+        self._journal: list[tuple] | None = None
+        self.reset()
+
+    def reset(self) -> None:
+        self.freelancers = SkillGraph(self.compact_threshold)
+        self.projects = SkillGraph(self.compact_threshold)
+        self.rating_sum = np.empty(0, dtype=np.float64)
+        self.rating_count = np.empty(0, dtype=np.float64)
+        self.hourly_rate = np.empty(0, dtype=np.float64)
+
+    # ---------- загрузка ----------
+
+    def build(
+        self,
+        freelancer_ids: np.ndarray,
+        hourly_rate: np.ndarray,
+        rating_sum: np.ndarray,
+        rating_count: np.ndarray,
+        freelancer_skills: tuple[np.ndarray, np.ndarray],
+        project_ids: np.ndarray,
+        project_open: np.ndarray,
+        project_skills: tuple[np.ndarray, np.ndarray],
+    ) -> None:
+        """Строит индекс из массивов (используется загрузкой из БД и бенчмарком)"""
+        self.reset()
+        self.freelancers.set_items(freelancer_ids)
+        self.freelancers.build(*freelancer_skills)
+        self._ensure_attributes()
+        count = len(freelancer_ids)
+        self.hourly_rate[:count] = hourly_rate
+        self.rating_sum[:count] = rating_sum
+        self.rating_count[:count] = rating_count
+
+        self.projects.set_items(project_ids)
+        self.projects.build(*project_skills)
+        self.projects.active[:len(project_ids)] = project_open
+
+    async def load(self, session) -> None:
+        self._journal = []
+        try:
+            await self._load(session)
+        finally:
+            self._journal = None
+
+    async def _load(self, session) -> None:
+        freelancers = (await session.execute(select(
+            FreelancerModel.id, FreelancerModel.hourly_rate,
+            FreelancerModel.rating_sum, FreelancerModel.rating_count,
+        ))).all()
+        freelancer_skills = (await session.execute(select(
+            FreelancerSkillModel.freelancer_id, FreelancerSkillModel.skill_id
+        ))).all()
+        projects = (await session.execute(
+            select(ProjectModel.id, ProjectModel.status)
+        )).all()
+        project_skills = (await session.execute(select(
+            ProjectSkillModel.project_id, ProjectSkillModel.skill_id
+        ))).all()
+
+        def columns(rows, count):
+            if not rows:
+                return [np.empty(0) for _ in range(count)]
+            return [np.array(column) for column in zip(*rows)]
+
+        ids, rates, sums, counts = columns(freelancers, 4)
+        project_ids, statuses = columns(projects, 2)
+        self.build(
+            freelancer_ids=ids.astype(np.int64),
+            hourly_rate=np.array([np.nan if rate is None else rate for rate in rates], dtype=np.float64),
+            rating_sum=sums.astype(np.float64),
+            rating_count=counts.astype(np.float64),
+            freelancer_skills=tuple(columns(freelancer_skills, 2)),
+            project_ids=project_ids.astype(np.int64),
+            project_open=np.array([status == ProjectStatus.OPEN for status in statuses], dtype=bool),
+            project_skills=tuple(columns(project_skills, 2)),
+        )
+        # Между build и повтором нет await: запросы не увидят индекс без изменений
+        for method, args in self._journal:
+            method(self, *args)
+        logger.info(
+            "Индекс подбора загружен: %s фрилансеров, %s проектов, %.1f МБ",
+            len(self.freelancers), len(self.projects), self.nbytes() / 2**20,
+        )
+
+    async def refresh_loop(self, session_maker, interval: int) -> None:
+        """Периодическая полная перезагрузка: подхватывает записи других воркеров"""
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                async with session_maker() as session:
+                    await self.load(session)
+            except Exception:
+                logger.exception("Не удалось перезагрузить индекс подбора")
+
+    def _ensure_attributes(self) -> None:
+        capacity = len(self.freelancers.ids)
+        if len(self.hourly_rate) < capacity:
+            self.hourly_rate = grow(self.hourly_rate, capacity, fill=np.nan)
+            self.rating_sum = grow(self.rating_sum, capacity)
+            self.rating_count = grow(self.rating_count, capacity)
+
+    # ---------- инкрементальные обновления ----------
+
+    @replayed
+    def add_freelancer_skill(self, freelancer_id: int, skill_id: int) -> None:
+        self.freelancers.add(freelancer_id, skill_id)
+        self._ensure_attributes()
+
+    @replayed
+    def remove_freelancer_skill(self, freelancer_id: int, skill_id: int) -> None:
+        self.freelancers.remove(freelancer_id, skill_id)
+
+    @replayed
+    def add_project_skill(self, project_id: int, skill_id: int) -> None:
+        self.projects.add(project_id, skill_id)
+
+    @replayed
+    def remove_project_skill(self, project_id: int, skill_id: int) -> None:
+        self.projects.remove(project_id, skill_id)
+
+    @replayed
+    def set_project_open(self, project_id: int, is_open: bool) -> None:
+        self.projects.set_active(project_id, is_open)
+
+    @replayed
+    def upsert_freelancer(self, freelancer_id: int, hourly_rate: float | None) -> None:
+        dense = self.freelancers.item(freelancer_id)
+        self.freelancers.active[dense] = True
+        self._ensure_attributes()
+        self.hourly_rate[dense] = np.nan if hourly_rate is None else hourly_rate
+
+    @replayed
+    def remove_freelancer(self, freelancer_id: int) -> None:
+        if freelancer_id in self.freelancers.index:
+            self.freelancers.set_active(freelancer_id, False)
+
+    def apply_rating(
+        self, freelancer_id: int, added: int | None = None, removed: int | None = None
+    ) -> None:
+        """
+        Повторяет изменение агрегатов рейтинга (FreelancersRepository.apply_rating).
+        Приращение не идемпотентно, поэтому при перезагрузке не повторяется:
+        изменение, пропущенное ею, подхватит следующая перезагрузка.
+        """
+        dense = self.freelancers.index.get(freelancer_id)
+        if dense is None:
+            return
+        self.rating_count[dense] += (added is not None) - (removed is not None)
+        self.rating_sum[dense] += (added or 0) - (removed or 0)
+
+    # ---------- запросы ----------
+
+    def skill_weights(self, skill_ids: list[int]) -> np.ndarray:
+        """IDF по фрилансерам: чем реже навык, тем ценнее совпадение"""
+        total = max(len(self.freelancers), 1)
+        frequency = np.array([self.freelancers.frequency(s) for s in skill_ids], dtype=np.float64)
+        return np.log1p(total / (1.0 + frequency))
+
+    def rank_freelancers(
+        self,
+        skill_ids: list[int],
+        limit: int,
+        max_hourly_rate: float | None = None,
+    ) -> list[Match]:
+        skill_ids = list(dict.fromkeys(skill_ids))
+        if not skill_ids:
+            return []
+        weights = self.skill_weights(skill_ids)
+        candidates, weighted, matched = self.freelancers.overlap(skill_ids, weights)
+        if not len(candidates):
+            return []
+
+        score = self.skill_weight * weighted / weights.sum()
+
+        counts = self.rating_count[candidates]
+        sums = self.rating_sum[candidates]
+        total_count = self.rating_count[:len(self.freelancers)].sum()
+        prior = self.rating_sum[:len(self.freelancers)].sum() / total_count if total_count else 3.0
+        smoothed = (sums + prior * self.rating_prior_count) / (counts + self.rating_prior_count)
+        score += self.rating_weight * smoothed / 5.0
+
+        if max_hourly_rate is not None:
+            rates = self.hourly_rate[candidates]
+            # 1 - ставка в пределах лимита, 0 - вдвое выше лимита; ставка не указана - 0.5
+            fit = np.clip(2.0 - rates / max_hourly_rate, 0.0, 1.0)
+            score += self.rate_weight * np.where(np.isnan(rates), 0.5, fit)
+
+        return self._top(self.freelancers, candidates, score, matched, limit)
+
+    def rank_projects(self, skill_ids: list[int], limit: int) -> list[Match]:
+        """Открытые проекты по доле требуемых навыков, которые есть у фрилансера"""
+        skill_ids = list(dict.fromkeys(skill_ids))
+        if not skill_ids:
+            return []
+        weights = self.skill_weights(skill_ids)
+        candidates, weighted, matched = self.projects.overlap(skill_ids, weights)
+        if not len(candidates):
+            return []
+        coverage = matched / np.maximum(self.projects.degree[candidates], 1)
+        score = 0.7 * coverage + 0.3 * weighted / weights.sum()
+        return self._top(self.projects, candidates, score, matched, limit)
+
+    @staticmethod
+    def _top(graph: SkillGraph, candidates, score, matched, limit: int) -> list[Match]:
+        if len(candidates) > limit:
+            top = np.argpartition(-score, limit - 1)[:limit]
+        else:
+            top = np.arange(len(candidates))
+        ids = graph.ids[candidates[top]]
+        # При равной оценке - более новые объекты (больший id) выше
+        order = np.lexsort((-ids, -score[top]))
+        return [
+            Match(id=int(ids[i]), score=round(float(score[top][i]), 4),
+                  matched_skills=int(matched[top][i]))
+            for i in order
+        ]
+
+    def nbytes(self) -> int:
+        return (self.freelancers.nbytes() + self.projects.nbytes()
+                + self.hourly_rate.nbytes + self.rating_sum.nbytes + self.rating_count.nbytes)
+
+
+matching_engine = MatchingEngine(
+    skill_weight=settings.MATCHING_SKILL_WEIGHT,
+    rating_weight=settings.MATCHING_RATING_WEIGHT,
+    rate_weight=settings.MATCHING_RATE_WEIGHT,
+    compact_threshold=settings.MATCHING_COMPACT_THRESHOLD,
+)
@@ -0,0 +1,147 @@
+import asyncio
+import time
+from bisect import bisect_left
+from typing import Callable, Iterable
+
+# Границы корзин гистограмм в секундах
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+WAIT_BUCKETS = (0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0)
+
+
+class Histogram:
+    """
+    Гистограмма с фиксированными корзинами. Наблюдение - бинарный поиск и
+    инкремент элемента заранее созданного списка: без блокировок (все вызовы
+    идут из потока event loop) и без создания объектов на каждый запрос.
+    """
+
+    __slots__ = ("bounds", "counts", "sum", "count")
+
+    def __init__(self, bounds: tuple[float, ...]) -> None:
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.bounds, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def render(self, name: str, labels: str = "") -> Iterable[str]:
+        prefix = labels + "," if labels else ""
+        cumulative = 0
+        for bound, count in zip(self.bounds, self.counts):
+            cumulative += count
+            yield f'{name}_bucket{{{prefix}le="{bound}"}} {cumulative}'
+        yield f'{name}_bucket{{{prefix}le="+Inf"}} {self.count}'
+        suffix = f"{{{labels}}}" if labels else ""
+        yield f"{name}_sum{suffix} {self.sum}"
+        yield f"{name}_count{suffix} {self.count}"
+
+
+def escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def family(name: str, kind: str, help_text: str, samples: Iterable[tuple[str, float]]) -> Iterable[str]:
+    """Строки одной метрики: HELP, TYPE и значения (метки, значение)"""
+    yield f"# HELP {name} {help_text}"
+    yield f"# TYPE {name} {kind}"
+    for labels, value in samples:
+        yield f"{name}{{{labels}}} {value}" if labels else f"{name} {value}"
+
+
+class Metrics:
+    """
+    Метрики процесса в формате Prometheus. Горячий путь (запросы, ожидание
+    соединения) только увеличивает счетчики; состояние пулов, очередей и
+    кэшей читается из их собственных счетчиков в момент выдачи /metrics.
+    """
+
+    def __init__(self) -> None:
+        # endpoint -> метод -> гистограмма; шаблон маршрута определяется один раз
+        self.request_latency: dict[object, dict[str, Histogram]] = {}
+        self.route_templates: dict[object, str] = {}
+        self.responses: dict[int, int] = {}
+        self.in_flight = 0
+
+        self.pool_wait = Histogram(WAIT_BUCKETS)
+        self.pool_checkouts = 0
+
+        self.loop_lag = Histogram(WAIT_BUCKETS)
+        self.loop_lag_max = 0.0
+
+        # Функции, которые при выдаче возвращают строки метрик других компонентов
+        self.collectors: list[Callable[[], Iterable[str]]] = []
+
+    # ----- горячий путь -----
+
+    def observe_request(self, endpoint: object, method: str, status: int, seconds: float) -> None:
+        by_method = self.request_latency.get(endpoint)
+        if by_method is None:
+            by_method = self.request_latency[endpoint] = {}
+        histogram = by_method.get(method)
+        if histogram is None:
+            histogram = by_method[method] = Histogram(LATENCY_BUCKETS)
+        histogram.observe(seconds)
+        self.responses[status] = self.responses.get(status, 0) + 1
+
+    # ----- фоновые замеры -----
+
+    async def watch_event_loop(self, interval: float = 0.5) -> None:
+        """Задержка event loop: насколько позже запланированного просыпается sleep"""
+        while True:
+            started = time.perf_counter()
+            await asyncio.sleep(interval)
+            lag = max(time.perf_counter() - started - interval, 0.0)
+            self.loop_lag.observe(lag)
+            self.loop_lag_max = max(self.loop_lag_max, lag)
+
+    # ----- выдача -----
+
+    def set_route_templates(self, routes) -> None:
+        for route in routes:
+            endpoint = getattr(route, "endpoint", None) or getattr(route, "app", None)
+            if endpoint is not None and hasattr(route, "path"):
+                self.route_templates.setdefault(endpoint, route.path or "/")
+
+    def render(self) -> str:
+        lines = [
+            "# HELP http_request_duration_seconds Время обработки запроса по шаблону маршрута",
+            "# TYPE http_request_duration_seconds histogram",
+        ]
+        for endpoint, by_method in self.request_latency.items():
+            route = escape(self.route_templates.get(endpoint, "<unmatched>"))
+            for method, histogram in by_method.items():
+                lines.extend(histogram.render(
+                    "http_request_duration_seconds", f'route="{route}",method="{method}"'
+                ))
+
+        lines += [
+            "# HELP http_responses_total Ответы по коду статуса",
+            "# TYPE http_responses_total counter",
+            *(f'http_responses_total{{status="{status}"}} {count}'
+              for status, count in sorted(self.responses.items())),
+            "# HELP http_requests_in_flight Запросы в обработке",
+            "# TYPE http_requests_in_flight gauge",
+            f"http_requests_in_flight {self.in_flight}",
+            "# HELP db_pool_wait_seconds Ожидание соединения из пула",
+            "# TYPE db_pool_wait_seconds histogram",
+            *self.pool_wait.render("db_pool_wait_seconds"),
+            "# HELP db_pool_checkouts_total Выдачи соединений из пула",
+            "# TYPE db_pool_checkouts_total counter",
+            f"db_pool_checkouts_total {self.pool_checkouts}",
+            "# HELP event_loop_lag_seconds Задержка event loop",
+            "# TYPE event_loop_lag_seconds histogram",
+            *self.loop_lag.render("event_loop_lag_seconds"),
+            "# HELP event_loop_lag_max_seconds Максимальная задержка event loop",
+            "# TYPE event_loop_lag_max_seconds gauge",
+            f"event_loop_lag_max_seconds {self.loop_lag_max}",
+        ]
+        for collect in self.collectors:
+            lines.extend(collect())
+        return "\n".join(lines) + "\n"
+
+
+metrics = Metrics()
@@ -0,0 +1,205 @@
+import asyncio
+import json
+import logging
+from collections import defaultdict, deque
+from typing import Any
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class Subscription:
+    """
+    Подписка одного соединения (WebSocket/SSE) на события пользователя.
+    Очередь ограничена: если клиент не успевает читать, самые старые события
+    вытесняются, а клиент получает событие overflow и перечитывает данные через REST.
+    """
+
+    def __init__(self, user_id: int, maxsize: int) -> None:
+        self.user_id = user_id
+        self.dropped = 0
+        self._events: deque[dict[str, Any]] = deque(maxlen=maxsize)
+        self._ready = asyncio.Event()
+
+    def push(self, event: dict[str, Any]) -> None:
+        if len(self._events) == self._events.maxlen:
+            self.dropped += 1
+        self._events.append(event)
+        self._ready.set()
+
+    async def get(self) -> dict[str, Any]:
+        while not self._events:
+            self._ready.clear()
+            await self._ready.wait()
+        if self.dropped:
+            dropped, self.dropped = self.dropped, 0
+            return {"type": "overflow", "dropped": dropped}
+        return self._events.popleft()
+
+
+class MemoryBackend:
+    """События доставляются только подписчикам текущего процесса"""
+
+    def __init__(self) -> None:
+        self.hub: "NotificationHub | None" = None
+
+    async def start(self, hub: "NotificationHub") -> None:
+        self.hub = hub
+
+    async def stop(self) -> None:
+        self.hub = None
+
+    async def publish(self, user_id: int, event: dict[str, Any]) -> None:
+        self.hub.deliver(user_id, event)
+
+
+class BrokerBackend:
+    """
+    Общая шина для нескольких воркеров uvicorn через локальный брокер
+    (scripts/notification_broker.py): каждое событие отправляется брокеру,
+    брокер рассылает его всем подключенным воркерам, включая отправителя.
+    Пока брокер недоступен, события доставляются только локально.
+
+    publish не ждет сети: событие кладется в ограниченную очередь, которую
+    отправляет отдельная задача. Если брокер не успевает читать и очередь
+    заполнена, событие доставляется только локально.
+    """
+
+    reconnect_delay = 1.0
+
+    def __init__(self, host: str, port: int, queue_size: int) -> None:
+        self.host = host
+        self.port = port
+        self.hub: "NotificationHub | None" = None
+        self.connected = False
+        self.dropped = 0
+        self._outgoing: asyncio.Queue[bytes] = asyncio.Queue(maxsize=queue_size)
+        self._task: asyncio.Task | None = None
+
+    async def start(self, hub: "NotificationHub") -> None:
+        self.hub = hub
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                reader, writer = await asyncio.open_connection(self.host, self.port)
+            except OSError as ex:
+                logger.warning("Брокер уведомлений недоступен: %s", ex)
+                await asyncio.sleep(self.reconnect_delay)
+                continue
+
+            logger.info("Подключено к брокеру уведомлений %s:%s", self.host, self.port)
+            self.connected = True
+            sender = asyncio.create_task(self._send(writer))
+            receiver = asyncio.create_task(self._receive(reader))
+            try:
+                done, _ = await asyncio.wait({sender, receiver}, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is not None:
+                        logger.warning("Соединение с брокером уведомлений прервано: %s", task.exception())
+            finally:
+                self.connected = False
+                sender.cancel()
+                receiver.cancel()
+                writer.close()
+            await asyncio.sleep(self.reconnect_delay)
+
+    async def _send(self, writer: asyncio.StreamWriter) -> None:
+        while True:
+            writer.write(await self._outgoing.get())
+            await writer.drain()
+
+    async def _receive(self, reader: asyncio.StreamReader) -> None:
+        while line := await reader.readline():
+            # Одна некорректная строка не должна останавливать прием остальных
+            try:
+                message = json.loads(line)
+                self.hub.deliver(message["user_id"], message["event"])
+            except (ValueError, KeyError, TypeError) as ex:
+                logger.warning("Пропущено некорректное сообщение брокера: %r (%s)", line[:200], ex)
+
+    async def publish(self, user_id: int, event: dict[str, Any]) -> None:
+        if not self.connected:
+            self.hub.deliver(user_id, event)
+            return
+        line = json.dumps({"user_id": user_id, "event": event}, default=str)
+        try:
+            self._outgoing.put_nowait(line.encode() + b"\n")
+        except asyncio.QueueFull:
+            self.dropped += 1
+            self.hub.deliver(user_id, event)
+
+
+class NotificationHub:
+    """Pub/sub событий пользователей для push-каналов (WebSocket, SSE)"""
+
+    def __init__(self, backend, queue_size: int) -> None:
+        self.backend = backend
+        self.queue_size = queue_size
+        self._subscriptions: dict[int, set[Subscription]] = defaultdict(set)
+
+        # Метрики
+        self.published = 0
+        self.delivered = 0
+
+    async def start(self) -> None:
+        await self.backend.start(self)
+
+    async def stop(self) -> None:
+        await self.backend.stop()
+
+    def subscribe(self, user_id: int) -> Subscription:
+        subscription = Subscription(user_id, self.queue_size)
+        self._subscriptions[user_id].add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        subscriptions = self._subscriptions.get(subscription.user_id)
+        if subscriptions is None:
+            return
+        subscriptions.discard(subscription)
+        if not subscriptions:
+            del self._subscriptions[subscription.user_id]
+
+    async def publish(self, user_id: int, event: dict[str, Any]) -> None:
+        self.published += 1
+        try:
+            await self.backend.publish(user_id, event)
+        except OSError as ex:
+            # Ошибка доставки не должна ломать запрос, который создал событие
+            logger.warning("Не удалось опубликовать событие: %s", ex)
+
+    def deliver(self, user_id: int, event: dict[str, Any]) -> None:
+        for subscription in self._subscriptions.get(user_id, ()):
+            subscription.push(event)
+            self.delivered += 1
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "users": len(self._subscriptions),
+            "connections": sum(len(subs) for subs in self._subscriptions.values()),
+            "published": self.published,
+            "delivered": self.delivered,
+            "dropped": getattr(self.backend, "dropped", 0),
+        }
+
+
+def create_backend():
+    if settings.NOTIFY_BACKEND == "broker":
+        return BrokerBackend(
+            settings.NOTIFY_BROKER_HOST, settings.NOTIFY_BROKER_PORT, settings.NOTIFY_BROKER_QUEUE_SIZE
+        )
+    return MemoryBackend()
+
+
+notification_hub = NotificationHub(
+    backend=create_backend(),
+    queue_size=settings.NOTIFY_QUEUE_SIZE,
+)
@@ -1,10 +1,34 @@
+from app.database.db_manager import DBManager
 from app.exceptions.base import ObjectAlreadyExistsError
 from app.exceptions.roles import RoleNotFoundError, RoleAlreadyExistsError
-from app.schemas.roles import SRoleAdd
+from app.schemas.roles import SRoleAdd, SRoleGet
 from app.schemas.relations_users_roles import SRoleGetWithRels
 from app.services.base import BaseService
 
 
+class RoleRegistry:
+    """
+    Таблица "id роли -> название" в памяти процесса.
+    Загружается при старте приложения и обновляется после изменения ролей,
+    чтобы проверка прав не требовала запросов к БД.
+    """
+
+    def __init__(self) -> None:
+        self._names: dict[int, str] = {}
+
+    def get_name(self, role_id: int) -> str | None:
+        return self._names.get(role_id)
+
+    def replace(self, roles: list[SRoleGet]) -> None:
+        self._names = {role.id: role.name for role in roles}
+
+    async def load(self, db: DBManager) -> None:
+        self.replace(await db.roles.get_all())
+
+
+role_registry = RoleRegistry()
+
+
 class RoleService(BaseService):
 
     async def create_role(self, role_data: SRoleAdd):
@@ -13,6 +37,7 @@ class RoleService(BaseService):
         except ObjectAlreadyExistsError:
             raise RoleAlreadyExistsError
         await self.db.commit()
+        await role_registry.load(self.db)
 
     async def get_role(self, role_id: int):
         role: SRoleGetWithRels | None = await self.db.roles.get_one_or_none_with_users(
@@ -26,8 +51,9 @@ class RoleService(BaseService):
         role: SRoleGetWithRels | None = await self.db.roles.get_one_or_none(id=role_id)
         if not role:
             raise RoleNotFoundError
-        await self.db.roles.edit(role_data)
+        await self.db.roles.edit(role_data, id=role_id)
         await self.db.commit()
+        await role_registry.load(self.db)
         return
 
     async def delete_role(self, role_id: int):
@@ -36,6 +62,7 @@ class RoleService(BaseService):
             raise RoleNotFoundError
         await self.db.roles.delete(id=role_id)
         await self.db.commit()
+        await role_registry.load(self.db)
         return
 
     async def get_roles(self):
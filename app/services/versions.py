@@ -0,0 +1,154 @@
+import asyncio
+import logging
+import secrets
+import sqlite3
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class MemoryVersionStore:
+    """Версии в памяти процесса (один воркер)"""
+
+    def __init__(self) -> None:
+        self.epoch = secrets.token_hex(4)
+        self._versions: dict[str, int] = {}
+
+    def read(self) -> dict[str, int]:
+        return self._versions
+
+    def bump(self, tables: set[str]) -> None:
+        for table in tables:
+            self._versions[table] = self._versions.get(table, 0) + 1
+
+    async def refresh_loop(self) -> None:
+        """Все изменения уже в памяти процесса - перечитывать нечего"""
+
+
+class SQLiteVersionStore:
+    """
+    Версии в общем файле SQLite: воркеры на одной машине видят изменения друг
+    друга. Эпоха создается вместе с файлом - если файл удален и счетчики
+    начались заново, старые ETag клиентов не совпадут с новыми.
+
+    read() не обращается к файлу: отдает снимок в памяти, который refresh_loop
+    перечитывает в отдельном потоке. Свои изменения попадают в снимок сразу
+    при bump, изменения других воркеров - с задержкой до VERSIONS_REFRESH_MS.
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self._reader = self._connect(settings.SQLITE_BUSY_TIMEOUT_MS)
+        self._reader.execute(
+            "CREATE TABLE IF NOT EXISTS table_versions (name TEXT PRIMARY KEY, version INTEGER NOT NULL)"
+        )
+        self._reader.execute(
+            "INSERT OR IGNORE INTO table_versions VALUES ('__epoch__', ?)",
+            (secrets.randbits(31),),
+        )
+        versions = self._read_all()
+        self.epoch = format(versions.pop("__epoch__"), "x")
+        self._versions = versions
+        # Запись идет из потока event loop после commit: ожидание блокировки
+        # файла ограничено, чтобы не останавливать обработку других запросов
+        self._writer = self._connect(settings.VERSIONS_BUMP_TIMEOUT_MS)
+
+    def _connect(self, busy_timeout_ms: int) -> sqlite3.Connection:
+        # Durability счетчикам не нужна
+        conn = sqlite3.connect(self.path, isolation_level=None, check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=OFF")
+        conn.execute(f"PRAGMA busy_timeout={busy_timeout_ms}")
+        return conn
+
+    def _read_all(self) -> dict[str, int]:
+        return dict(self._reader.execute("SELECT name, version FROM table_versions"))
+
+    def _merge(self, versions: dict[str, int]) -> None:
+        # Версии только растут: снимок, прочитанный до нашего bump, не должен
+        # откатить уже учтенное значение
+        merged = dict(self._versions)
+        for table, version in versions.items():
+            if version > merged.get(table, 0):
+                merged[table] = version
+        self._versions = merged
+
+    def read(self) -> dict[str, int]:
+        return self._versions
+
+    def bump(self, tables: set[str]) -> None:
+        versions = {}
+        try:
+            self._writer.execute("BEGIN IMMEDIATE")
+            try:
+                for table in sorted(tables):
+                    versions[table] = self._writer.execute(
+                        "INSERT INTO table_versions VALUES (?, 1) "
+                        "ON CONFLICT (name) DO UPDATE SET version = version + 1 "
+                        "RETURNING version",
+                        (table,),
+                    ).fetchone()[0]
+                self._writer.execute("COMMIT")
+            except BaseException:
+                self._writer.execute("ROLLBACK")
+                raise
+        except sqlite3.OperationalError as e:
+            # Файл занят дольше VERSIONS_BUMP_TIMEOUT_MS: другие воркеры не
+            # увидят изменение, их кэш устареет не дольше чем на TTL записи
+            logger.warning(f"Не удалось увеличить версии {sorted(tables)}: {e}")
+            versions = {table: self._versions.get(table, 0) + 1 for table in tables}
+        self._merge(versions)
+
+    async def refresh_loop(self) -> None:
+        """Перечитывает версии из файла вне event loop"""
+        while True:
+            await asyncio.sleep(settings.VERSIONS_REFRESH_MS / 1000)
+            try:
+                versions = await asyncio.to_thread(self._read_all)
+            except sqlite3.Error:
+                logger.exception("Не удалось прочитать версии таблиц")
+                continue
+            versions.pop("__epoch__", None)
+            self._merge(versions)
+
+
+class TableVersions:
+    """
+    Версии данных по таблицам: номер таблицы увеличивается после каждой
+    зафиксированной транзакции, которая ее изменила (события сессии в
+    app/database/database.py). Кэши сравнивают версии вместо запросов к БД.
+    """
+
+    def __init__(self, store) -> None:
+        self.store = store
+
+    @property
+    def epoch(self) -> str:
+        return self.store.epoch
+
+    def get(self, table: str) -> int:
+        return self.store.read().get(table, 0)
+
+    def snapshot(self, tables: tuple[str, ...]) -> tuple[int, ...]:
+        versions = self.store.read()
+        return tuple(versions.get(table, 0) for table in tables)
+
+    def bump(self, *tables: str) -> None:
+        if tables:
+            self.store.bump(set(tables))
+
+    def all(self) -> dict[str, int]:
+        return dict(self.store.read())
+
+    async def refresh_loop(self) -> None:
+        await self.store.refresh_loop()
+
+
+def create_store():
+    if settings.VERSIONS_BACKEND == "sqlite":
+        return SQLiteVersionStore(settings.VERSIONS_DB_PATH)
+    return MemoryVersionStore()
+
+
+table_versions = TableVersions(create_store())
@@ -0,0 +1,111 @@
+from dataclasses import dataclass, field
+from typing import Any, Sequence
+
+from pydantic import BaseModel
+from sqlalchemy import Select
+from sqlalchemy.orm import QueryableAttribute, joinedload, selectinload
+
+from app.exceptions.expand import ExpandTooDeepError, InvalidExpandError
+
+
+@dataclass
+class Relation:
+    """Связь, которую можно раскрыть параметром expand"""
+
+    attribute: QueryableAttribute
+    # Плоская схема связанного объекта (без полей связей)
+    schema: type[BaseModel]
+    children: dict[str, "Relation"] = field(default_factory=dict)
+    # Связь через ассоциативную модель: attribute ведет к ассоциациям,
+    # through - от ассоциации к объекту (skills_assoc -> skill)
+    through: QueryableAttribute | None = None
+
+    @property
+    def many(self) -> bool:
+        return self.attribute.property.uselist
+
+    def loader(self, children: "Tree"):
+        """
+        Коллекция - selectinload: один дополнительный запрос с IN по id
+        страницы. Связь "многие к одному" - joinedload: LEFT JOIN в основной
+        запрос, строки не размножаются и LIMIT страницы не ломается.
+        """
+        option = (selectinload if self.many else joinedload)(self.attribute)
+        if self.through is not None:
+            option = option.joinedload(self.through)
+        if children:
+            option = option.options(*(relation.loader(sub) for relation, sub in children.values()))
+        return option
+
+    def dump(self, obj: Any, children: "Tree") -> dict:
+        data = self.schema.model_validate(obj).model_dump()
+        return dump_relations(obj, data, children)
+
+
+# Выбранные связи: имя -> (связь, выбранные вложенные связи)
+Tree = dict[str, tuple[Relation, "Tree"]]
+
+
+def dump_relations(obj: Any, data: dict, tree: Tree) -> dict:
+    # Связи уже загружены опциями запроса, ленивой загрузки здесь не бывает
+    for name, (relation, children) in tree.items():
+        value = getattr(obj, relation.attribute.key)
+        if relation.many:
+            if relation.through is not None:
+                value = [getattr(item, relation.through.key) for item in value]
+            data[name] = [relation.dump(item, children) for item in value]
+        else:
+            data[name] = None if value is None else relation.dump(value, children)
+    return data
+
+
+class Expansion:
+    """Раскрытие связей для одного запроса: опции загрузки и сборка ответа"""
+
+    def __init__(self, schema: type[BaseModel], tree: Tree) -> None:
+        self.schema = schema
+        self.tree = tree
+
+    def apply(self, query: Select) -> Select:
+        if not self.tree:
+            return query
+        return query.options(*(relation.loader(children) for relation, children in self.tree.values()))
+
+    def render(self, items: Sequence) -> list[dict | None]:
+        """
+        Объекты в словари ответа. Схема ответа содержит поля связей, поэтому
+        ORM-объекты не отдаются ей напрямую: pydantic прочитал бы нераскрытые
+        связи и вызвал ленивую загрузку.
+        """
+        return [
+            None if item is None
+            else dump_relations(item, self.schema.model_validate(item).model_dump(), self.tree)
+            for item in items
+        ]
+
+
+class Expansions:
+    """Связи ресурса, доступные для раскрытия"""
+
+    def __init__(self, schema: type[BaseModel], relations: dict[str, Relation]) -> None:
+        self.schema = schema
+        self.relations = relations
+
+    def parse(self, value: str | None, max_depth: int) -> Expansion:
+        """expand=client,freelancer.user -> дерево выбранных связей"""
+        tree: Tree = {}
+        for path in (value or "").split(","):
+            path = path.strip()
+            if not path:
+                continue
+            names = path.split(".")
+            if len(names) > max_depth:
+                raise ExpandTooDeepError
+            relations, level = self.relations, tree
+            for name in names:
+                relation = relations.get(name)
+                if relation is None:
+                    raise InvalidExpandError
+                level = level.setdefault(name, (relation, {}))[1]
+                relations = relation.children
+        return Expansion(self.schema, tree)
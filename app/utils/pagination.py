@@ -0,0 +1,107 @@
+import base64
+import binascii
+import enum
+import json
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Any
+
+from sqlalchemy import and_, or_
+from sqlalchemy.sql import operators
+from sqlalchemy.sql.elements import ColumnElement, UnaryExpression
+
+from app.exceptions.pagination import InvalidCursorError
+
+
+class SortKey:
+    """Колонка сортировки и ее направление"""
+
+    def __init__(self, clause: ColumnElement) -> None:
+        self.descending = False
+        if isinstance(clause, UnaryExpression):
+            self.descending = clause.modifier is operators.desc_op
+            clause = clause.element
+        self.column = clause
+        self.name: str = clause.key
+
+    def value_of(self, item: Any) -> Any:
+        return getattr(item, self.name)
+
+    def encode(self, value: Any) -> Any:
+        if isinstance(value, enum.Enum):
+            return value.value
+        if isinstance(value, (datetime, date)):
+            return value.isoformat()
+        if isinstance(value, Decimal):
+            return str(value)
+        return value
+
+    def decode(self, value: Any) -> Any:
+        if value is None:
+            return None
+        python_type = self.column.type.python_type
+        if issubclass(python_type, enum.Enum):
+            return python_type(value)
+        if python_type is datetime:
+            return datetime.fromisoformat(value)
+        if python_type is date:
+            return date.fromisoformat(value)
+        if python_type is Decimal:
+            return Decimal(value)
+        return value
+
+
+def sort_keys(order_by: tuple[ColumnElement, ...]) -> list[SortKey]:
+    return [SortKey(clause) for clause in order_by]
+
+
+def encode_cursor(keys: list[SortKey], item: Any) -> str:
+    """Кодирует ключ сортировки последнего элемента страницы в непрозрачный токен"""
+    payload = {
+        "k": [key.name for key in keys],
+        "v": [key.encode(key.value_of(item)) for key in keys],
+    }
+    raw = json.dumps(payload, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(keys: list[SortKey], cursor: str) -> list[Any]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        payload = json.loads(raw)
+        names, values = payload["k"], payload["v"]
+    except (binascii.Error, ValueError, TypeError, KeyError) as ex:
+        raise InvalidCursorError from ex
+
+    # Курсор должен быть выдан для той же сортировки
+    if names != [key.name for key in keys] or len(values) != len(keys):
+        raise InvalidCursorError
+    try:
+        return [key.decode(value) for key, value in zip(keys, values)]
+    except (ValueError, TypeError) as ex:
+        raise InvalidCursorError from ex
+
+
+def keyset_condition(keys: list[SortKey], values: list[Any]) -> ColumnElement:
+    """
+    Условие "строго после" для лексикографического ключа со смешанными направлениями:
+    (a > x) OR (a = x AND b < y) OR (a = x AND b = y AND c < z) ...
+    Дополнительная граница по первому ключу (a >= x) позволяет БД начать
+    обход индекса с нужной позиции, а не с начала. Колонки ключа должны быть
+    NOT NULL: сравнение с NULL ложно, и такие строки пропускались бы.
+    """
+    clauses = []
+    for i, key in enumerate(keys):
+        equal_prefix = [keys[j].column == values[j] for j in range(i)]
+        if key.descending:
+            after = key.column < values[i]
+        else:
+            after = key.column > values[i]
+        clauses.append(and_(*equal_prefix, after))
+
+    first = keys[0]
+    if first.descending:
+        bound = first.column <= values[0]
+    else:
+        bound = first.column >= values[0]
+    return and_(bound, or_(*clauses))
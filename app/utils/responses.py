@@ -0,0 +1,75 @@
+import enum
+import json
+from datetime import date, datetime, time
+from decimal import Decimal
+from typing import Any, Callable
+from uuid import UUID
+
+from fastapi.responses import JSONResponse
+
+from app.config import settings
+
+try:
+    import orjson
+except ImportError:  # orjson - необязательная зависимость
+    orjson = None
+
+
+def encode_default(value: Any) -> Any:
+    """Типы, которые кодировщики JSON не сериализуют сами"""
+    if isinstance(value, Decimal):
+        # Как fastapi.encoders.decimal_encoder: целые значения - int, остальные - float
+        return int(value) if value.as_tuple().exponent >= 0 else float(value)
+    if isinstance(value, enum.Enum):
+        return value.value
+    if isinstance(value, (datetime, date, time)):
+        return value.isoformat()
+    if isinstance(value, UUID):
+        return str(value)
+    if isinstance(value, (set, frozenset)):
+        return list(value)
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def stdlib_dumps(content: Any) -> bytes:
+    return json.dumps(
+        content,
+        ensure_ascii=False,
+        allow_nan=False,
+        separators=(",", ":"),
+        default=encode_default,
+    ).encode("utf-8")
+
+
+def orjson_dumps(content: Any) -> bytes:
+    # datetime, Enum и UUID orjson кодирует сам, Decimal - через encode_default;
+    # нестроковые ключи словарей приводятся к строкам, как в json.dumps
+    return orjson.dumps(content, default=encode_default, option=orjson.OPT_NON_STR_KEYS)
+
+
+def get_dumps(name: str) -> Callable[[Any], bytes]:
+    """
+    Кодировщик ответов по имени: "orjson", "stdlib" или "auto"
+    (orjson, если установлен, иначе стандартный json)
+    """
+    if name == "auto":
+        name = "orjson" if orjson is not None else "stdlib"
+    if name == "orjson":
+        if orjson is None:
+            raise RuntimeError("JSON_ENCODER=orjson, но пакет orjson не установлен")
+        return orjson_dumps
+    if name == "stdlib":
+        return stdlib_dumps
+    raise ValueError(f"Неизвестный кодировщик JSON: {name}")
+
+
+class FastJSONResponse(JSONResponse):
+    """
+    JSON-ответ с кодировщиком из настроек (JSON_ENCODER).
+    Используется как default_response_class приложения.
+    """
+
+    dumps: Callable[[Any], bytes] = staticmethod(get_dumps(settings.JSON_ENCODER))
+
+    def render(self, content: Any) -> bytes:
+        return self.dumps(content)
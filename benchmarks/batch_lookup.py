@@ -0,0 +1,114 @@
+"""
+Пакетная выборка по id (GET /api/<ресурс>/?ids=1,2,3) против запроса на
+каждый объект (GET /api/<ресурс>/{id}) - так клиент собирает связанные
+объекты для списка.
+
+Для фрилансеров, проектов и навыков сравниваются: N запросов подряд,
+N запросов параллельно и один пакетный запрос. Считаются время и число
+SQL-запросов (по заголовку Server-Timing). Десятая часть id не существует.
+Кэш ответов отключен, чтобы сравнивать обращения к БД.
+
+Запуск из корня репозитория:
+    python -m benchmarks.batch_lookup
+    python -m benchmarks.batch_lookup --sizes 10 100 --repeat 11
+"""
+import argparse
+import asyncio
+import os
+import random
+import re
+import statistics
+import tempfile
+import time
+
+import httpx
+
+from benchmarks.load_test import login, seed_database
+
+RESOURCES = ("freelancers", "projects", "skills")
+
+
+def queries_of(response: httpx.Response) -> int:
+    match = re.search(r"(\d+) queries", response.headers.get("server-timing", ""))
+    return int(match.group(1)) if match else 0
+
+
+async def one_by_one(client: httpx.AsyncClient, resource: str, ids: list[int], headers: dict):
+    return [await client.get(f"/api/{resource}/{id_}", headers=headers) for id_ in ids]
+
+
+async def concurrent(client: httpx.AsyncClient, resource: str, ids: list[int], headers: dict):
+    return await asyncio.gather(*(client.get(f"/api/{resource}/{id_}", headers=headers) for id_ in ids))
+
+
+async def batched(client: httpx.AsyncClient, resource: str, ids: list[int], headers: dict):
+    return [await client.get(f"/api/{resource}/", params={"ids": ",".join(map(str, ids))}, headers=headers)]
+
+
+async def max_ids() -> dict[str, int]:
+    from sqlalchemy import func, select
+
+    from app.database.database import async_session_maker
+    from app.models.freelancers import FreelancerModel
+    from app.models.projects import ProjectModel
+    from app.models.skills import SkillModel
+
+    models = {"freelancers": FreelancerModel, "projects": ProjectModel, "skills": SkillModel}
+    async with async_session_maker() as session:
+        return {
+            resource: (await session.execute(select(func.max(model.id)))).scalar()
+            for resource, model in models.items()
+        }
+
+
+async def run(args: argparse.Namespace) -> None:
+    from main import app
+
+    rng = random.Random(args.seed)
+    transport = httpx.ASGITransport(app=app)
+    async with app.router.lifespan_context(app):
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            response = await login(client, 1)
+            headers = {"Cookie": f"access_token={response.json()['access_token']}"}
+            sizes = await max_ids()
+            print(f"\n{'ресурс':<12}{'id':>5}  {'вариант':<22}{'мс':>9}{'SQL':>6}{'найдено':>9}")
+            for resource in RESOURCES:
+                for size in args.sizes:
+                    for name, variant in (("подряд", one_by_one), ("параллельно", concurrent),
+                                          ("?ids=", batched)):
+                        samples, queries, found = [], 0, 0
+                        for _ in range(args.repeat):
+                            # Существующие id и около 10% несуществующих
+                            ids = [rng.randint(1, sizes[resource]) if rng.random() > 0.1
+                                   else sizes[resource] * 10 + rng.randint(1, 1000) for _ in range(size)]
+                            started = time.perf_counter()
+                            responses = await variant(client, resource, ids, headers)
+                            samples.append((time.perf_counter() - started) * 1000)
+                            queries = sum(queries_of(r) for r in responses)
+                            if variant is batched:
+                                found = sum(item is not None for item in responses[0].json())
+                            else:
+                                found = sum(r.status_code == 200 for r in responses)
+                        print(f"{resource:<12}{size:>5}  {name:<22}{statistics.median(samples):>9.1f}"
+                              f"{queries:>6}{found:>9}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 50, 100])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--seed-users", type=int, default=20_000)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        database_url = f"sqlite+aiosqlite:///{tmp}/batch_lookup.db"
+        # Настройки читаются при импорте app, поэтому до импорта main
+        os.environ["DATABASE_URL"] = database_url
+        os.environ["RESPONSE_CACHE_TTL_SECONDS"] = "0"
+        asyncio.run(seed_database(database_url, args.seed_users))
+        asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,40 @@
+import random
+import statistics
+import time
+
+# Импортируем все модели, чтобы связи ORM были сконфигурированы
+from app.models import (  # noqa: F401
+    users, roles, freelancers, projects, proposals,
+    payments, reviews, messages, skills, freelancer_skills, responces,
+    unread_counters, conversations, project_skills
+)
+
+
+def make_vocabulary(rng: random.Random, size: int) -> list[str]:
+    """Детерминированный словарь псевдослов"""
+    syllables = ["ba", "ko", "ri", "de", "web", "app", "tor", "lin", "sa", "mu",
+                 "ne", "zo", "ter", "pro", "dev", "gra", "fi", "lo", "qu", "ex"]
+    words = set()
+    while len(words) < size:
+        words.add("".join(rng.choice(syllables) for _ in range(rng.randint(2, 4))))
+    return sorted(words)
+
+
+def zipf_choice(rng: random.Random, items: list, s: float = 1.1):
+    """Выбор элемента с распределением, близким к закону Ципфа"""
+    index = int(rng.paretovariate(s)) - 1
+    return items[index % len(items)]
+
+
+def timeit(func, repeat: int = 7) -> dict[str, float]:
+    """Возвращает статистику времени выполнения в миллисекундах"""
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        samples.append((time.perf_counter() - started) * 1000)
+    return {
+        "min_ms": min(samples),
+        "median_ms": statistics.median(samples),
+        "max_ms": max(samples),
+    }
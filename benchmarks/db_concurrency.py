@@ -0,0 +1,125 @@
+"""
+Конкурентный доступ к SQLite: N писателей и M читателей параллельно.
+
+Сравнивает движок с параметрами по умолчанию (NullPool, журнал DELETE,
+synchronous=FULL) и движок из app.database.database.build_engine (пул
+соединений, WAL, synchronous=NORMAL, mmap, busy_timeout). Каждый вариант
+работает с собственной копией test.db, сам test.db не изменяется.
+
+Писатель вставляет сообщение и фиксирует транзакцию, читатель запрашивает
+последние 20 входящих сообщений пользователя.
+
+Запуск из корня репозитория:
+    python -m benchmarks.db_concurrency --writers 8 --readers 32 --seconds 5
+"""
+import argparse
+import asyncio
+import os
+import random
+import shutil
+import statistics
+import tempfile
+import time
+from datetime import datetime
+
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+
+from app.database.database import build_engine, describe_engine
+
+INSERT_MESSAGE = text(
+    "INSERT INTO messages (content, timestamp, is_read, sender_id, recipient_id, created_at, updated_at) "
+    "VALUES (:content, :timestamp, 0, :sender_id, :recipient_id, :timestamp, :timestamp)"
+)
+SELECT_INBOX = text(
+    "SELECT id, content, timestamp, sender_id FROM messages "
+    "WHERE recipient_id = :recipient_id ORDER BY timestamp DESC LIMIT 20"
+)
+
+
+class Counters:
+    def __init__(self) -> None:
+        self.latencies: dict[str, list[float]] = {"write": [], "read": []}
+        self.errors: dict[str, int] = {"write": 0, "read": 0}
+
+
+async def worker(engine: AsyncEngine, kind: str, user_ids: list[int], deadline: float,
+                 counters: Counters, rng: random.Random) -> None:
+    while time.perf_counter() < deadline:
+        started = time.perf_counter()
+        try:
+            if kind == "write":
+                async with engine.begin() as conn:
+                    now = datetime.now()
+                    await conn.execute(INSERT_MESSAGE, {
+                        "content": "benchmark", "timestamp": now,
+                        "sender_id": rng.choice(user_ids), "recipient_id": rng.choice(user_ids),
+                    })
+            else:
+                async with engine.connect() as conn:
+                    (await conn.execute(SELECT_INBOX, {"recipient_id": rng.choice(user_ids)})).all()
+        except OperationalError:
+            # "database is locked": запрос не дождался блокировки
+            counters.errors[kind] += 1
+            continue
+        counters.latencies[kind].append((time.perf_counter() - started) * 1000)
+
+
+async def run(name: str, engine: AsyncEngine, args) -> None:
+    async with engine.connect() as conn:
+        user_ids = list((await conn.execute(text("SELECT id FROM users"))).scalars())
+    config = await describe_engine(engine)
+
+    counters = Counters()
+    rng = random.Random(42)
+    deadline = time.perf_counter() + args.seconds
+    await asyncio.gather(
+        *(worker(engine, "write", user_ids, deadline, counters, random.Random(rng.random()))
+          for _ in range(args.writers)),
+        *(worker(engine, "read", user_ids, deadline, counters, random.Random(rng.random()))
+          for _ in range(args.readers)),
+    )
+    await engine.dispose()
+
+    print(f"\n--- {name}: pool={config['pool']}, journal_mode={config['journal_mode']}, "
+          f"synchronous={config['synchronous']}, busy_timeout={config['busy_timeout']} ---")
+    for kind, title in (("write", "запись"), ("read", "чтение")):
+        samples = counters.latencies[kind]
+        if not samples:
+            print(f"{title:<8} нет успешных операций, ошибок: {counters.errors[kind]}")
+            continue
+        p99 = statistics.quantiles(samples, n=100)[98] if len(samples) > 1 else samples[0]
+        print(
+            f"{title:<8}{len(samples) / args.seconds:>9.0f} оп/с   "
+            f"p50={statistics.median(samples):.1f} мс  p99={p99:.1f} мс   "
+            f"ошибок: {counters.errors[kind]}"
+        )
+
+
+def copy_database(source: str) -> str:
+    path = os.path.join(tempfile.mkdtemp(prefix="db-concurrency-"), os.path.basename(source))
+    shutil.copyfile(source, path)
+    return path
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--database", default="test.db")
+    parser.add_argument("--writers", type=int, default=8)
+    parser.add_argument("--readers", type=int, default=32)
+    parser.add_argument("--seconds", type=float, default=5.0)
+    args = parser.parse_args()
+
+    print(f"=== {args.writers} писателей, {args.readers} читателей, {args.seconds:.0f} с, "
+          f"копия {args.database} ===")
+
+    path = copy_database(args.database)
+    await run("по умолчанию", create_async_engine(f"sqlite+aiosqlite:///{path}"), args)
+
+    path = copy_database(args.database)
+    await run("build_engine", build_engine(f"sqlite+aiosqlite:///{path}"), args)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,367 @@
+"""
+Нагрузочный прогон HTTP API со сравнением с сохраненными базовыми значениями.
+
+Сценарии:
+    browse    - список проектов: страницы, фильтр по статусу, поиск, карточка проекта
+    login     - всплеск входов (bcrypt в пуле PasswordHasher)
+    proposals - отправка предложений фрилансерами на новые проекты
+    messages  - отправка сообщений и опрос счетчика непрочитанных и диалогов
+
+Для каждого сценария считаются p50/p95/p99 задержки и пропускная способность.
+Результаты сравниваются с benchmarks/baselines/load_test.json: если задержка
+(p50, p95) выросла или пропускная способность упала больше чем на --max-regression,
+либо были ошибки, прогон завершается с кодом 1. Базовые значения зависят от
+машины - после изменения окружения их нужно записать заново (--update-baseline).
+
+Цели:
+    по умолчанию  - ASGI-приложение из main.py в этом процессе
+    --uvicorn     - локальный uvicorn в отдельном процессе
+    --url         - уже запущенный сервер; его база заполняется scripts.seed_data
+
+Для первых двух целей создается временная база SQLite с данными scripts.seed_data.
+
+Запуск из корня репозитория:
+    python -m benchmarks.load_test
+    python -m benchmarks.load_test --uvicorn --scenarios browse messages
+    python -m benchmarks.load_test --url http://127.0.0.1:8001 --target staging
+    python -m benchmarks.load_test --update-baseline
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Awaitable, Callable
+
+import httpx
+
+BASELINE_PATH = Path(__file__).parent / "baselines" / "load_test.json"
+
+# Пароль всех пользователей scripts.seed_data
+SEED_PASSWORD = "password"
+
+# Сценарий: число запросов и параллельность по умолчанию
+SCENARIOS = {
+    "browse": (2000, 16),
+    "login": (64, 32),
+    "proposals": (400, 8),
+    "messages": (1000, 16),
+}
+
+# Задержки, которые сравниваются с базовыми значениями. p99 выводится, но не
+# проверяется: при сотнях запросов это несколько самых медленных и он слишком шумный
+LATENCY_KEYS = ("p50_ms", "p95_ms")
+
+
+@dataclass
+class Account:
+    user_id: int
+    cookie: str
+    freelancer_id: int | None = None
+
+
+@dataclass
+class Context:
+    """Данные, подготовленные до замеров: вошедшие пользователи, проекты, слова для поиска"""
+
+    clients: list[Account] = field(default_factory=list)
+    freelancers: list[Account] = field(default_factory=list)
+    project_ids: list[int] = field(default_factory=list)
+    new_project_ids: list[int] = field(default_factory=list)
+    search_words: list[str] = field(default_factory=list)
+
+
+def percentile(samples: list[float], q: int) -> float:
+    if len(samples) < 2:
+        return samples[0] if samples else 0.0
+    return statistics.quantiles(samples, n=100)[q - 1]
+
+
+async def run_scenario(
+    operation: Callable[[int], Awaitable[httpx.Response]], total: int, concurrency: int
+) -> dict[str, float]:
+    """Выполняет total запросов в concurrency параллельных потоков"""
+    latencies: list[float] = []
+    errors: dict[int, int] = {}
+    counter = iter(range(total))
+
+    async def worker() -> None:
+        for index in counter:
+            started = time.perf_counter()
+            response = await operation(index)
+            latencies.append((time.perf_counter() - started) * 1000)
+            if response.status_code >= 400:
+                errors[response.status_code] = errors.get(response.status_code, 0) + 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+    return {
+        "requests": total,
+        "concurrency": concurrency,
+        "errors": sum(errors.values()),
+        "error_statuses": {str(code): count for code, count in sorted(errors.items())},
+        "rps": round(total / elapsed, 2),
+        "p50_ms": round(statistics.median(latencies), 2),
+        "p95_ms": round(percentile(latencies, 95), 2),
+        "p99_ms": round(percentile(latencies, 99), 2),
+    }
+
+
+async def login(client: httpx.AsyncClient, user_id: int) -> httpx.Response:
+    return await client.post(
+        "/api/auth/login", json={"email": f"user{user_id}@seed.example", "password": SEED_PASSWORD}
+    )
+
+
+async def prepare(client: httpx.AsyncClient, accounts: int) -> Context:
+    """Входит под частью пользователей набора данных и создает проекты для предложений"""
+    ctx = Context()
+
+    async def account(user_id: int, freelancer_id: int | None = None) -> Account:
+        response = await login(client, user_id)
+        response.raise_for_status()
+        return Account(user_id, f"access_token={response.json()['access_token']}", freelancer_id)
+
+    first = await account(1)
+    headers = {"Cookie": first.cookie}
+    projects = (await client.get("/api/projects/", params={"limit": 100}, headers=headers)).json()
+    freelancers = (await client.get("/api/freelancers/", params={"limit": 100}, headers=headers)).json()
+    ctx.project_ids = [project["id"] for project in projects]
+    ctx.search_words = sorted({word for project in projects for word in project["title"].split()})[:50]
+
+    client_ids = list(dict.fromkeys(project["client_id"] for project in projects))[:accounts]
+    ctx.clients = list(await asyncio.gather(*(account(user_id) for user_id in client_ids)))
+    ctx.freelancers = list(await asyncio.gather(*(
+        account(freelancer["user_id"], freelancer["id"]) for freelancer in freelancers[:accounts]
+    )))
+
+    # Новые проекты: на них у фрилансеров гарантированно нет предложений
+    for index in range(50):
+        owner = ctx.clients[index % len(ctx.clients)]
+        response = await client.post(
+            "/api/projects/",
+            json={"title": f"load test {index}", "description": "load test project", "budget": 500},
+            headers={"Cookie": owner.cookie},
+        )
+        response.raise_for_status()
+        ctx.new_project_ids.append(response.json()["id"])
+    return ctx
+
+
+def scenario_operations(client: httpx.AsyncClient, ctx: Context, login_users: list[int]):
+    async def browse(index: int) -> httpx.Response:
+        headers = {"Cookie": ctx.clients[index % len(ctx.clients)].cookie}
+        kind = index % 10
+        if kind < 3:
+            params = {"search": ctx.search_words[index % len(ctx.search_words)], "limit": 20}
+        elif kind < 5:
+            params = {"status": "open", "limit": 20}
+        elif kind < 8:
+            params = {"skip": (index * 20) % 2000, "limit": 20}
+        else:
+            project_id = ctx.project_ids[index % len(ctx.project_ids)]
+            return await client.get(f"/api/projects/{project_id}", headers=headers)
+        return await client.get("/api/projects/", params=params, headers=headers)
+
+    async def login_burst(index: int) -> httpx.Response:
+        return await login(client, login_users[index % len(login_users)])
+
+    async def proposals(index: int) -> httpx.Response:
+        # Каждая пара (проект, фрилансер) используется один раз
+        freelancer = ctx.freelancers[index % len(ctx.freelancers)]
+        project_id = ctx.new_project_ids[index // len(ctx.freelancers) % len(ctx.new_project_ids)]
+        return await client.post(
+            "/api/proposals/",
+            json={
+                "cover_message": "load test proposal",
+                "proposed_price": 100,
+                "project_id": project_id,
+                "freelancer_id": freelancer.freelancer_id,
+            },
+            headers={"Cookie": freelancer.cookie},
+        )
+
+    async def messages(index: int) -> httpx.Response:
+        freelancer = ctx.freelancers[index % len(ctx.freelancers)]
+        peer = ctx.clients[index % len(ctx.clients)]
+        if index % 2 == 0:
+            return await client.post(
+                "/api/messages/",
+                json={"content": f"load test message {index}", "recipient_id": peer.user_id},
+                headers={"Cookie": freelancer.cookie},
+            )
+        if index % 4 == 1:
+            return await client.get("/api/messages/unread-count", headers={"Cookie": peer.cookie})
+        return await client.get("/api/messages/conversations", params={"limit": 20},
+                                headers={"Cookie": peer.cookie})
+
+    return {"browse": browse, "login": login_burst, "proposals": proposals, "messages": messages}
+
+
+async def run_all(client: httpx.AsyncClient, args: argparse.Namespace) -> dict[str, dict]:
+    ctx = await prepare(client, args.accounts)
+    proposals_total = SCENARIOS["proposals"][0] * args.factor
+    if len(ctx.freelancers) * len(ctx.new_project_ids) < proposals_total:
+        raise SystemExit("Мало фрилансеров для сценария proposals: увеличьте --accounts")
+    login_users = [account.user_id for account in ctx.clients + ctx.freelancers]
+    operations = scenario_operations(client, ctx, login_users)
+
+    print(f"\n{'сценарий':<10}{'запросы':>8}{'ошибки':>8}{'rps':>10}{'p50, мс':>10}{'p95, мс':>10}{'p99, мс':>10}")
+    results = {}
+    for name in args.scenarios:
+        total, concurrency = SCENARIOS[name]
+        results[name] = await run_scenario(operations[name], int(total * args.factor), concurrency)
+        print_result(name, results[name])
+    return results
+
+
+def print_result(name: str, result: dict) -> None:
+    print(f"{name:<10}{result['requests']:>8}{result['errors']:>8}{result['rps']:>10.0f}"
+          f"{result['p50_ms']:>10.1f}{result['p95_ms']:>10.1f}{result['p99_ms']:>10.1f}")
+
+
+async def seed_database(database_url: str, users: int) -> None:
+    from scripts import seed_data
+
+    await seed_data.seed(seed_data.build_parser().parse_args(
+        ["--database-url", database_url, "--users", str(users)]
+    ))
+
+
+async def run_in_process(args: argparse.Namespace) -> dict[str, dict]:
+    # Настройки читаются при импорте app, поэтому main импортируется после выбора базы
+    from main import app
+
+    transport = httpx.ASGITransport(app=app)
+    async with app.router.lifespan_context(app):
+        async with httpx.AsyncClient(transport=transport, base_url="http://loadtest") as client:
+            return await run_all(client, args)
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+async def run_against(url: str, args: argparse.Namespace) -> dict[str, dict]:
+    limits = httpx.Limits(max_connections=64, max_keepalive_connections=64)
+    async with httpx.AsyncClient(base_url=url, limits=limits, timeout=60) as client:
+        return await run_all(client, args)
+
+
+async def run_uvicorn(args: argparse.Namespace, database_url: str) -> dict[str, dict]:
+    port = free_port()
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main:app", "--port", str(port), "--log-level", "warning"],
+        env={**os.environ, "DATABASE_URL": database_url},
+        stdout=subprocess.DEVNULL,
+    )
+    url = f"http://127.0.0.1:{port}"
+    try:
+        async with httpx.AsyncClient(base_url=url) as probe:
+            for _ in range(100):
+                try:
+                    if (await probe.get("/health")).status_code == 200:
+                        break
+                except httpx.TransportError:
+                    pass
+                await asyncio.sleep(0.2)
+            else:
+                raise SystemExit("uvicorn не запустился")
+        return await run_against(url, args)
+    finally:
+        server.terminate()
+        server.wait(timeout=10)
+
+
+def compare(results: dict[str, dict], baseline: dict[str, dict], max_regression: float,
+            min_delta_ms: float) -> list[str]:
+    """Список регрессий относительно базовых значений"""
+    problems = []
+    for name, result in results.items():
+        if result["errors"]:
+            problems.append(f"{name}: ошибки {result['error_statuses']}")
+        base = baseline.get(name)
+        if base is None:
+            continue
+        for key in LATENCY_KEYS:
+            limit = max(base[key] * (1 + max_regression), base[key] + min_delta_ms)
+            if result[key] > limit:
+                problems.append(f"{name}: {key} {result[key]:.1f} > {base[key]:.1f} (+{max_regression:.0%})")
+        if result["rps"] < base["rps"] / (1 + max_regression):
+            problems.append(f"{name}: rps {result['rps']:.0f} < {base['rps']:.0f} (-{max_regression:.0%})")
+    return problems
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    target = parser.add_mutually_exclusive_group()
+    target.add_argument("--uvicorn", action="store_true")
+    target.add_argument("--url")
+    parser.add_argument("--target", help="Имя набора базовых значений (по умолчанию - по цели)")
+    parser.add_argument("--scenarios", nargs="+", choices=list(SCENARIOS), default=list(SCENARIOS))
+    parser.add_argument("--factor", type=float, default=1.0, help="Множитель числа запросов")
+    parser.add_argument("--seed-users", type=int, default=20_000)
+    parser.add_argument("--accounts", type=int, default=20, help="Пользователей каждой роли")
+    # Хвосты задержек записи в SQLite заметно гуляют между прогонами
+    parser.add_argument("--max-regression", type=float, default=0.5)
+    parser.add_argument("--min-delta-ms", type=float, default=2.0,
+                        help="Рост задержки меньше этого значения не считается регрессией")
+    parser.add_argument("--baseline", type=Path, default=BASELINE_PATH)
+    parser.add_argument("--update-baseline", action="store_true")
+    args = parser.parse_args()
+    target_name = args.target or ("url" if args.url else "uvicorn" if args.uvicorn else "asgi")
+
+    if args.url:
+        results = asyncio.run(run_against(args.url, args))
+    else:
+        with tempfile.TemporaryDirectory() as tmp:
+            database_url = f"sqlite+aiosqlite:///{tmp}/load_test.db"
+            os.environ["DATABASE_URL"] = database_url
+            asyncio.run(seed_database(database_url, args.seed_users))
+            if args.uvicorn:
+                results = asyncio.run(run_uvicorn(args, database_url))
+            else:
+                results = asyncio.run(run_in_process(args))
+
+    baselines = json.loads(args.baseline.read_text()) if args.baseline.exists() else {}
+    if args.update_baseline:
+        baselines[target_name] = {
+            "recorded_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "machine": f"{platform.platform()}, {os.cpu_count()} CPU, Python {platform.python_version()}",
+            "factor": args.factor,
+            "scenarios": {**baselines.get(target_name, {}).get("scenarios", {}), **results},
+        }
+        args.baseline.parent.mkdir(parents=True, exist_ok=True)
+        args.baseline.write_text(json.dumps(baselines, ensure_ascii=False, indent=2) + "\n")
+        print(f"\nБазовые значения '{target_name}' записаны в {args.baseline}")
+        return
+
+    recorded = baselines.get(target_name, {})
+    baseline = recorded.get("scenarios", {})
+    if not baseline:
+        print(f"\nБазовых значений для '{target_name}' нет - сравнение пропущено")
+    elif recorded.get("factor") != args.factor:
+        print(f"\nБазовые значения записаны с --factor {recorded.get('factor')} - сравнение пропущено")
+        baseline = {}
+    problems = compare(results, baseline, args.max_regression, args.min_delta_ms)
+    for problem in problems:
+        print(f"РЕГРЕССИЯ {problem}")
+    if problems:
+        sys.exit(1)
+    print("\nРегрессий нет")
+
+
+if __name__ == "__main__":
+    main()
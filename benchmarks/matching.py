@@ -0,0 +1,120 @@
+"""
+Производительность подбора по навыкам (app/services/matching.py).
+
+Строит индекс для синтетических данных: популярность навыков по закону Ципфа,
+у фрилансера 3-10 навыков, у проекта 2-6. Замеряет построение, память,
+top-k запросы в обе стороны и инкрементальные обновления.
+
+Запуск из корня репозитория:
+    python -m benchmarks.matching --freelancers 1000000 --projects 100000
+"""
+import argparse
+import statistics
+import time
+
+import numpy as np
+
+from app.services.matching import MatchingEngine
+
+
+def random_pairs(rng: np.random.Generator, items: int, skills: int, low: int, high: int):
+    """Пары (объект, навык) без повторов внутри объекта"""
+    degree = rng.integers(low, high + 1, size=items)
+    item_ids = np.repeat(np.arange(1, items + 1), degree)
+    skill_ids = np.minimum(rng.zipf(1.3, size=len(item_ids)), skills)
+    pairs = np.unique(np.stack([item_ids, skill_ids], axis=1), axis=0)
+    return pairs[:, 0], pairs[:, 1]
+
+
+def percentiles(samples: list[float]) -> str:
+    p99 = statistics.quantiles(samples, n=100)[98]
+    return f"p50={statistics.median(samples):.2f} p99={p99:.2f} max={max(samples):.2f}"
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--freelancers", type=int, default=1_000_000)
+    parser.add_argument("--projects", type=int, default=100_000)
+    parser.add_argument("--skills", type=int, default=2000)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--top", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(args.seed)
+    freelancer_skills = random_pairs(rng, args.freelancers, args.skills, 3, 10)
+    project_skills = random_pairs(rng, args.projects, args.skills, 2, 6)
+    freelancer_ids = np.arange(1, args.freelancers + 1)
+    project_ids = np.arange(1, args.projects + 1)
+
+    engine = MatchingEngine(
+        skill_weight=0.6, rating_weight=0.25, rate_weight=0.15, compact_threshold=10_000
+    )
+    started = time.perf_counter()
+    engine.build(
+        freelancer_ids=freelancer_ids,
+        hourly_rate=rng.uniform(5, 150, size=args.freelancers),
+        rating_sum=rng.integers(0, 200, size=args.freelancers).astype(float),
+        rating_count=rng.integers(0, 50, size=args.freelancers).astype(float),
+        freelancer_skills=freelancer_skills,
+        project_ids=project_ids,
+        project_open=rng.random(args.projects) < 0.7,
+        project_skills=project_skills,
+    )
+    build_seconds = time.perf_counter() - started
+
+    print(f"\n=== {args.freelancers} фрилансеров, {args.projects} проектов, "
+          f"{args.skills} навыков ===")
+    print(f"связей фрилансер-навык: {len(freelancer_skills[0])}, "
+          f"проект-навык: {len(project_skills[0])}")
+    print(f"построение индекса:     {build_seconds:.2f} с")
+    print(f"память индекса:         {engine.nbytes() / 2**20:.1f} МБ")
+
+    # Запросы берут навыки реальных проектов/фрилансеров
+    p_items, p_skills = project_skills
+    f_items, f_skills = freelancer_skills
+    freelancer_latency, project_latency = [], []
+    for _ in range(args.queries):
+        project = rng.integers(1, args.projects + 1)
+        skills = p_skills[p_items == project].tolist()
+        started = time.perf_counter()
+        engine.rank_freelancers(skills, args.top, max_hourly_rate=60.0)
+        freelancer_latency.append((time.perf_counter() - started) * 1000)
+
+        freelancer = rng.integers(1, args.freelancers + 1)
+        skills = f_skills[f_items == freelancer].tolist()
+        started = time.perf_counter()
+        engine.rank_projects(skills, args.top)
+        project_latency.append((time.perf_counter() - started) * 1000)
+
+    print(f"top-{args.top} фрилансеров, мс:  {percentiles(freelancer_latency)}")
+    print(f"top-{args.top} проектов, мс:     {percentiles(project_latency)}")
+
+    # Инкрементальные обновления: до порога уплотнения изменения копятся в журнале
+    updates = engine.compact_threshold - 1
+    targets = rng.integers(1, args.freelancers + 1, size=updates)
+    new_skills = rng.integers(1, args.skills + 1, size=updates)
+    started = time.perf_counter()
+    for freelancer, skill in zip(targets.tolist(), new_skills.tolist()):
+        engine.add_freelancer_skill(freelancer, skill)
+    update_us = (time.perf_counter() - started) / updates * 1e6
+
+    journal_latency = []
+    for _ in range(args.queries):
+        project = rng.integers(1, args.projects + 1)
+        skills = p_skills[p_items == project].tolist()
+        started = time.perf_counter()
+        engine.rank_freelancers(skills, args.top)
+        journal_latency.append((time.perf_counter() - started) * 1000)
+
+    started = time.perf_counter()
+    engine.freelancers.compact()
+    compact_seconds = time.perf_counter() - started
+
+    print(f"добавление навыка:      {update_us:.1f} мкс")
+    print(f"top-{args.top} с журналом {updates}, мс: {percentiles(journal_latency)}")
+    print(f"уплотнение журнала:     {compact_seconds:.2f} с")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+"""
+Сравнение полнотекстового поиска проектов (FTS5 + BM25) с ILIKE '%term%'.
+
+Запуск из корня репозитория:
+    python -m benchmarks.project_search --sizes 100000 1000000
+"""
+import argparse
+import os
+import random
+import sqlite3
+import tempfile
+from datetime import datetime, timedelta
+
+from sqlalchemy import create_engine, select
+
+from app.database.database import Base
+from app.database.search import ProjectSearch
+from app.models.projects import ProjectModel, ProjectStatus
+from benchmarks.common import make_vocabulary, timeit, zipf_choice
+
+STATUSES = [status.name for status in ProjectStatus]
+
+
+def populate(path: str, size: int, vocabulary: list[str], seed: int) -> None:
+    rng = random.Random(seed)
+    now = datetime(2025, 1, 1)
+    conn = sqlite3.connect(path)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=OFF")
+    conn.execute("INSERT INTO roles (id, name) VALUES (1, 'client')")
+    conn.execute(
+        "INSERT INTO users (id, name, email, hashed_password, role_id) "
+        "VALUES (1, 'client', 'client@example.com', '-', 1)"
+    )
+
+    def rows():
+        for i in range(size):
+            title = " ".join(zipf_choice(rng, vocabulary) for _ in range(rng.randint(3, 8)))
+            description = " ".join(
+                zipf_choice(rng, vocabulary) for _ in range(rng.randint(20, 60))
+            )
+            yield (
+                title,
+                description,
+                round(rng.uniform(50, 10000), 2),
+                rng.choice(STATUSES),
+                1,
+                now - timedelta(minutes=i),
+            )
+
+    conn.executemany(
+        "INSERT INTO projects (title, description, budget, status, client_id, created_at) "
+        "VALUES (?, ?, ?, ?, ?, ?)",
+        rows(),
+    )
+    conn.commit()
+    conn.close()
+
+
+def build_query(search: ProjectSearch, term: str):
+    # Повторяет запрос get_projects с типичными фильтрами
+    query = select(ProjectModel).where(ProjectModel.status == ProjectStatus.OPEN)
+    query = query.where(ProjectModel.budget >= 100)
+    query, rank = search.apply(query, term)
+    if rank is not None:
+        query = query.order_by(rank)
+    query = query.order_by(ProjectModel.status, ProjectModel.created_at.desc())
+    return query.limit(20)
+
+
+def run(size: int, seed: int, repeat: int) -> None:
+    rng = random.Random(seed)
+    vocabulary = make_vocabulary(rng, 20000)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "projects.db")
+        engine = create_engine(f"sqlite:///{path}")
+        Base.metadata.create_all(engine)
+        populate(path, size, vocabulary, seed)
+
+        fts = ProjectSearch()
+        with engine.begin() as conn:
+            fts.setup(conn)
+        ilike = ProjectSearch()
+
+        terms = {
+            "частое слово": vocabulary[0],
+            "среднее слово": vocabulary[200],
+            "редкое слово": vocabulary[-1],
+            "префикс": vocabulary[50][:4],
+            "два слова": f"{vocabulary[1]} {vocabulary[300]}",
+        }
+
+        print(f"\n=== {size} проектов ===")
+        print(f"{'запрос':<16}{'ILIKE, мс':>14}{'FTS5, мс':>14}{'ускорение':>12}")
+        with engine.connect() as conn:
+            for label, term in terms.items():
+                ilike_query = build_query(ilike, term)
+                fts_query = build_query(fts, term)
+                ilike_stats = timeit(lambda: conn.execute(ilike_query).all(), repeat)
+                fts_stats = timeit(lambda: conn.execute(fts_query).all(), repeat)
+                speedup = ilike_stats["median_ms"] / max(fts_stats["median_ms"], 1e-6)
+                print(
+                    f"{label:<16}{ilike_stats['median_ms']:>14.2f}"
+                    f"{fts_stats['median_ms']:>14.2f}{speedup:>11.1f}x"
+                )
+        engine.dispose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100_000, 1_000_000])
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    for size in args.sizes:
+        run(size, args.seed, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
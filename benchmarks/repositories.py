@@ -0,0 +1,212 @@
+"""
+Накладные расходы методов репозиториев на вызов.
+
+Методы BaseRepository (get_filtered, get_one_or_none, add, add_bulk, edit,
+delete) и загрузка со связями (UsersRepository.get_one_or_none_with_role,
+RolesRepository.get_one_or_none_with_users) замеряются на 1, 100 и 10 000
+строк в SQLite в памяти и в файле с WAL (настройки движка - как у приложения,
+app/database/database.py).
+
+Время вызова делится на две части:
+    запрос - выполнение SQL драйвером вместе с выборкой строк (события
+             before/after_cursor_execute, как в заголовке Server-Timing)
+    Python - все остальное: компиляция запроса, ORM, валидация pydantic
+
+Число строк - сколько строк читает или изменяет вызов: get_filtered читает
+всю таблицу, add_bulk/edit/delete меняют все строки, get_one_or_none* ищут
+одну строку в таблице такого размера, а with_users загружает роль с таким
+числом пользователей. Изменения откатываются после каждого замера.
+
+Запуск из корня репозитория:
+    python -m benchmarks.repositories
+    python -m benchmarks.repositories --rows 1 100 --backends memory --json /tmp/repositories.json
+"""
+import argparse
+import asyncio
+import gc
+import json
+import os
+import statistics
+import tempfile
+import time
+from pathlib import Path
+from typing import Awaitable, Callable
+
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker
+
+from app.database.database import Base, build_engine
+from app.middleware.timing import RequestStats, current_stats
+from app.models.roles import RoleModel
+from app.models.users import UserModel
+from app.repositories.roles import RolesRepository
+from app.repositories.users import UsersRepository
+from app.schemas.user import SUserAdd, UserUpdate
+import benchmarks.common  # noqa: F401
+
+# Роль 2 - пользователи таблицы размера rows; роль 3 - строки, которые удаляет delete
+TABLE_ROLE = 2
+SCRATCH_ROLE = 3
+
+Operation = Callable[[AsyncSession], Awaitable[object]]
+
+
+def user_rows(count: int, role_id: int, prefix: str) -> list[dict]:
+    return [
+        {"name": f"User {i}", "email": f"{prefix}{i}@bench.local", "hashed_password": "x" * 60,
+         "role_id": role_id}
+        for i in range(count)
+    ]
+
+
+def new_users(count: int, prefix: str) -> list[SUserAdd]:
+    return [SUserAdd(**row) for row in user_rows(count, TABLE_ROLE, prefix)]
+
+
+async def seed(engine: AsyncEngine, rows: int) -> None:
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+        await conn.run_sync(Base.metadata.create_all)
+        await conn.execute(insert(RoleModel), [
+            {"id": 1, "name": "admin"}, {"id": TABLE_ROLE, "name": "client"},
+            {"id": SCRATCH_ROLE, "name": "freelancer"},
+        ])
+        await conn.execute(insert(UserModel), user_rows(rows, TABLE_ROLE, "user"))
+
+
+def operations(rows: int) -> dict[str, tuple[Operation, Operation | None]]:
+    """Название -> (замеряемый вызов, подготовка перед ним вне замера)"""
+    counter = iter(range(10**9))
+    middle = rows // 2 + 1
+
+    async def insert_scratch(session: AsyncSession) -> None:
+        await session.execute(insert(UserModel), user_rows(rows, SCRATCH_ROLE, f"scratch{next(counter)}-"))
+        await session.commit()
+
+    return {
+        "get_filtered": (
+            lambda session: UsersRepository(session).get_filtered(),
+            None,
+        ),
+        "get_filtered(validate=False)": (
+            lambda session: UsersRepository(session).get_filtered(validate=False),
+            None,
+        ),
+        "get_one_or_none": (
+            lambda session: UsersRepository(session).get_one_or_none(id=middle),
+            None,
+        ),
+        "get_one_or_none_with_role": (
+            lambda session: UsersRepository(session).get_one_or_none_with_role(id=middle),
+            None,
+        ),
+        "get_one_or_none_with_users": (
+            lambda session: RolesRepository(session).get_one_or_none_with_users(id=TABLE_ROLE),
+            None,
+        ),
+        "add": (
+            lambda session: UsersRepository(session).add(new_users(1, f"add{next(counter)}-")[0]),
+            None,
+        ),
+        "add_bulk": (
+            lambda session: UsersRepository(session).add_bulk(new_users(rows, f"bulk{next(counter)}-")),
+            None,
+        ),
+        "edit": (
+            lambda session: UsersRepository(session).edit(
+                UserUpdate(name="Renamed"), exclude_unset=True, role_id=TABLE_ROLE
+            ),
+            None,
+        ),
+        # delete сам фиксирует транзакцию, поэтому удаляет заранее вставленные строки
+        "delete": (
+            lambda session: UsersRepository(session).delete(role_id=SCRATCH_ROLE),
+            insert_scratch,
+        ),
+    }
+
+
+async def measure(
+    session_maker: async_sessionmaker, operation: Operation, prepare: Operation | None, repeat: int
+) -> dict[str, float]:
+    totals, queries, pythons = [], [], []
+    # Первый вызов - прогрев (кэш компиляции SQLAlchemy, схемы pydantic)
+    for round_ in range(repeat + 1):
+        async with session_maker() as session:
+            if prepare is not None:
+                await prepare(session)
+            stats = RequestStats()
+            token = current_stats.set(stats)
+            gc.collect()
+            started = time.perf_counter()
+            try:
+                await operation(session)
+            finally:
+                elapsed = time.perf_counter() - started
+                current_stats.reset(token)
+                await session.rollback()
+        if round_:
+            totals.append(elapsed * 1000)
+            queries.append(stats.db_seconds * 1000)
+            pythons.append((elapsed - stats.db_seconds) * 1000)
+    return {
+        "total_ms": statistics.median(totals),
+        "query_ms": statistics.median(queries),
+        "python_ms": statistics.median(pythons),
+        "statements": stats.queries,
+    }
+
+
+async def run_backend(backend: str, url: str, sizes: list[int], repeat: int, names: list[str]) -> list[dict]:
+    engine = build_engine(url)
+    session_maker = async_sessionmaker(bind=engine, expire_on_commit=False)
+    results = []
+    for rows in sizes:
+        await seed(engine, rows)
+        for name, (operation, prepare) in operations(rows).items():
+            if names and name not in names:
+                continue
+            try:
+                stats = await measure(session_maker, operation, prepare, repeat)
+            except Exception as ex:
+                print(f"{backend:<8}{rows:>7}  {name:<30}ошибка: {type(ex).__name__}: {str(ex)[:80]}")
+                results.append({"backend": backend, "rows": rows, "method": name, "error": str(ex)})
+                continue
+            print(
+                f"{backend:<8}{rows:>7}  {name:<30}{stats['total_ms']:>9.3f}{stats['query_ms']:>9.3f}"
+                f"{stats['python_ms']:>9.3f}{stats['python_ms'] / stats['total_ms']:>8.0%}"
+                f"{stats['total_ms'] * 1000 / rows:>10.1f}{stats['statements']:>6}"
+            )
+            results.append({"backend": backend, "rows": rows, "method": name, **stats})
+    await engine.dispose()
+    return results
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, nargs="+", default=[1, 100, 10_000])
+    parser.add_argument("--backends", nargs="+", choices=["memory", "wal"], default=["memory", "wal"])
+    parser.add_argument("--methods", nargs="+", default=[], help="Только указанные методы")
+    parser.add_argument("--repeat", type=int, default=7)
+    parser.add_argument("--json", type=Path, help="Сохранить результаты в файл")
+    args = parser.parse_args()
+
+    tmp = tempfile.mkdtemp(prefix="repositories-")
+    urls = {
+        "memory": "sqlite+aiosqlite:///:memory:",
+        "wal": f"sqlite+aiosqlite:///{os.path.join(tmp, 'bench.db')}",
+    }
+    print(f"\nМедиана из {args.repeat} вызовов, мс (мкс/строку - от общего времени)")
+    print(f"{'база':<8}{'строк':>7}  {'метод':<30}{'всего':>9}{'запрос':>9}{'Python':>9}"
+          f"{'доля Py':>8}{'мкс/стр':>10}{'SQL':>6}")
+    results = []
+    for backend in args.backends:
+        results += await run_backend(backend, urls[backend], args.rows, args.repeat, args.methods)
+
+    if args.json:
+        args.json.write_text(json.dumps(results, ensure_ascii=False, indent=2) + "\n")
+        print(f"\nРезультаты сохранены в {args.json}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
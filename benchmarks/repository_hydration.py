@@ -0,0 +1,146 @@
+"""
+Чтение списка через BaseRepository: прежний путь (ORM-объекты целиком
+и model_validate(from_attributes=True) на каждую строку) против выборки
+только колонок схемы с валидацией списка за один проход и без валидации.
+
+Для каждого варианта замеряется время и пик выделенной памяти (tracemalloc).
+
+Запуск из корня репозитория:
+    python -m benchmarks.repository_hydration --rows 10000
+"""
+import argparse
+import asyncio
+import gc
+import os
+import random
+import statistics
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+
+from sqlalchemy import insert, select
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from app.database.database import Base
+from app.models.projects import ProjectModel, ProjectStatus
+from app.models.roles import RoleModel
+from app.models.users import UserModel
+from app.repositories.base import BaseRepository
+from app.schemas.projects import Project
+from benchmarks.common import make_vocabulary
+
+
+class ProjectsRepository(BaseRepository):
+    model = ProjectModel
+    schema = Project
+
+
+async def read_before(session) -> list[Project]:
+    """Прежняя реализация BaseRepository.get_filtered"""
+    result = await session.execute(select(ProjectModel))
+    return [
+        Project.model_validate(model, from_attributes=True)
+        for model in result.scalars().all()
+    ]
+
+
+async def read_projected(session) -> list[Project]:
+    return await ProjectsRepository(session).get_filtered()
+
+
+async def read_trusted(session) -> list[Project]:
+    return await ProjectsRepository(session).get_filtered(validate=False)
+
+
+async def seed(session_maker, rows: int) -> None:
+    rng = random.Random(42)
+    words = make_vocabulary(rng, 2000)
+    now = datetime(2026, 10, 18)
+    async with session_maker() as session:
+        session.add(RoleModel(name="client"))
+        session.add(UserModel(name="Client", email="client@bench.local", hashed_password="x", role_id=1))
+        await session.flush()
+        await session.execute(insert(ProjectModel), [
+            {
+                "title": " ".join(rng.choice(words) for _ in range(4)),
+                "description": " ".join(rng.choice(words) for _ in range(40)),
+                "budget": rng.uniform(100, 10000),
+                "deadline": now + timedelta(days=i % 90),
+                "status": rng.choice(list(ProjectStatus)),
+                "client_id": 1,
+                "created_at": now - timedelta(minutes=i),
+            }
+            for i in range(rows)
+        ])
+        await session.commit()
+
+
+async def measure(session_maker, read, repeat: int) -> dict[str, float]:
+    samples = []
+    for _ in range(repeat):
+        async with session_maker() as session:
+            gc.collect()
+            started = time.perf_counter()
+            items = await read(session)
+            samples.append((time.perf_counter() - started) * 1000)
+
+    # Память замеряется отдельным прогоном: tracemalloc сильно замедляет выполнение
+    async with session_maker() as session:
+        gc.collect()
+        tracemalloc.start()
+        items = await read(session)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+    return {
+        "rows": len(items),
+        "median_ms": statistics.median(samples),
+        "min_ms": min(samples),
+        "peak_mb": peak / 2**20,
+    }
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=10_000)
+    parser.add_argument("--repeat", type=int, default=7)
+    args = parser.parse_args()
+
+    path = os.path.join(tempfile.mkdtemp(prefix="hydration-"), "bench.db")
+    engine = create_async_engine(f"sqlite+aiosqlite:///{path}")
+    session_maker = async_sessionmaker(engine, expire_on_commit=False)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    await seed(session_maker, args.rows)
+
+    variants = {
+        "ORM + model_validate": read_before,
+        "колонки + валидация": read_projected,
+        "колонки без валидации": read_trusted,
+    }
+    print(f"\n=== {args.rows} проектов, медиана из {args.repeat} повторов ===")
+    print(f"{'вариант':<24}{'мс':>9}{'мин мс':>9}{'пик МБ':>9}")
+    baseline = None
+    for name, read in variants.items():
+        stats = await measure(session_maker, read, args.repeat)
+        assert stats["rows"] == args.rows
+        baseline = baseline or stats
+        print(
+            f"{name:<24}{stats['median_ms']:>9.1f}{stats['min_ms']:>9.1f}"
+            f"{stats['peak_mb']:>9.1f}"
+            f"   x{baseline['median_ms'] / stats['median_ms']:.2f} по времени,"
+            f" x{baseline['peak_mb'] / stats['peak_mb']:.2f} по памяти"
+        )
+
+    # Результаты вариантов совпадают
+    async with session_maker() as session:
+        assert await read_before(session) == await read_projected(session)
+    async with session_maker() as session:
+        assert await read_projected(session) == await read_trusted(session)
+
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
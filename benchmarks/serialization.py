@@ -0,0 +1,170 @@
+"""
+Время сериализации ответов списковых эндпоинтов.
+
+Для страницы из N ORM-объектов повторяет шаги FastAPI при response_model:
+валидация ORM -> схема (from_attributes), преобразование схемы в JSON-совместимые
+значения и кодирование в байты. Кодирование замеряется стандартным json и orjson
+(app/utils/responses.py), результаты обоих кодировщиков сверяются.
+
+Запуск из корня репозитория:
+    python -m benchmarks.serialization --items 100
+"""
+import argparse
+import json
+import random
+from datetime import datetime, timedelta
+from decimal import Decimal
+from typing import List
+
+from pydantic import TypeAdapter
+
+from benchmarks.common import make_vocabulary, timeit
+from app.models.freelancers import FreelancerModel
+from app.models.messages import MessageModel
+from app.models.payments import PaymentModel
+from app.models.projects import ProjectModel, ProjectStatus
+from app.models.proposals import ProposalModel
+from app.models.reviews import ReviewModel
+from app.models.users import UserModel
+from app.schemas.freelancers import Freelancer
+from app.schemas.messages import Message
+from app.schemas.payments import Payment
+from app.schemas.projects import Project
+from app.schemas.proposals import Proposal
+from app.schemas.reviews import Review
+from app.schemas.user import User
+from app.utils.responses import get_dumps, orjson, stdlib_dumps
+
+
+def make_rows(rng: random.Random, words: list[str], count: int) -> dict[str, tuple[type, list]]:
+    """Страница ORM-объектов для каждого спискового эндпоинта"""
+    now = datetime(2026, 10, 18, 12, 0, 0)
+
+    def text(size: int) -> str:
+        return " ".join(rng.choice(words) for _ in range(size))
+
+    def moment(i: int) -> datetime:
+        return now - timedelta(minutes=i, microseconds=rng.randint(0, 999999))
+
+    return {
+        "/api/projects/": (Project, [
+            ProjectModel(
+                id=i, title=text(4), description=text(60), budget=rng.uniform(100, 10000),
+                deadline=now + timedelta(days=i), status=rng.choice(list(ProjectStatus)),
+                client_id=rng.randint(1, 1000), created_at=moment(i),
+            )
+            for i in range(1, count + 1)
+        ]),
+        "/api/messages/": (Message, [
+            MessageModel(
+                id=i, content=text(20), sender_id=rng.randint(1, 1000),
+                recipient_id=rng.randint(1, 1000), timestamp=moment(i), is_read=rng.random() < 0.5,
+            )
+            for i in range(1, count + 1)
+        ]),
+        "/api/proposals/": (Proposal, [
+            ProposalModel(
+                id=i, cover_message=text(30), status="pending", submitted_at=moment(i),
+                proposed_price=Decimal(rng.randint(1000, 999999)) / 100,
+                project_id=rng.randint(1, 1000), freelancer_id=rng.randint(1, 1000),
+            )
+            for i in range(1, count + 1)
+        ]),
+        "/api/payments/": (Payment, [
+            PaymentModel(
+                id=i, amount=Decimal(rng.randint(1000, 999999)) / 100, currency="USD",
+                status="completed", payment_date=moment(i), proposal_id=i,
+            )
+            for i in range(1, count + 1)
+        ]),
+        "/api/reviews/": (Review, [
+            ReviewModel(
+                id=i, rating=rng.randint(1, 5), comment=text(15), created_at=moment(i),
+                project_id=i, reviewer_id=rng.randint(1, 1000), freelancer_id=rng.randint(1, 1000),
+            )
+            for i in range(1, count + 1)
+        ]),
+        "/api/freelancers/": (Freelancer, [
+            FreelancerModel(
+                id=i, user_id=i, bio=text(25), hourly_rate=rng.uniform(5, 150),
+                portfolio_url=f"https://example.com/{i}", rating_count=5, rating_sum=20,
+                rating_1=0, rating_2=0, rating_3=1, rating_4=2, rating_5=2,
+            )
+            for i in range(1, count + 1)
+        ]),
+        "/api/users/": (User, [
+            UserModel(id=i, name=text(2), email=f"user{i}@example.com", role_id=rng.randint(1, 3))
+            for i in range(1, count + 1)
+        ]),
+    }
+
+
+def check_encoders() -> None:
+    """Кодировщики дают одинаковый JSON, в том числе для Decimal/datetime/ProjectStatus"""
+    sample = {
+        "amount": Decimal("12.50"),
+        "total": Decimal("100"),
+        "at": datetime(2026, 10, 18, 12, 30, 0, 123456),
+        "status": ProjectStatus.IN_PROGRESS,
+        "histogram": {1: 0, 5: 3},
+        "text": "Привет",
+    }
+    expected = {
+        "amount": 12.5, "total": 100, "at": "2026-10-18T12:30:00.123456",
+        "status": ProjectStatus.IN_PROGRESS.value, "histogram": {"1": 0, "5": 3}, "text": "Привет",
+    }
+    assert json.loads(stdlib_dumps(sample)) == expected
+    if orjson is not None:
+        assert json.loads(get_dumps("orjson")(sample)) == expected
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--items", type=int, default=100)
+    parser.add_argument("--repeat", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    check_encoders()
+    encoders = {"stdlib": stdlib_dumps}
+    if orjson is not None:
+        encoders["orjson"] = get_dumps("orjson")
+    else:
+        print("orjson не установлен, замеряется только стандартный json")
+
+    rng = random.Random(args.seed)
+    pages = make_rows(rng, make_vocabulary(rng, 2000), args.items)
+
+    print(f"\n=== страница из {args.items} объектов, медиана из {args.repeat} повторов, мс ===")
+    header = f"{'эндпоинт':<20}{'валидация':>11}{'в dict':>9}"
+    header += "".join(f"{name:>9}" for name in encoders)
+    header += f"{'КБ':>7}{'итог stdlib':>13}"
+    if "orjson" in encoders:
+        header += f"{'итог orjson':>13}"
+    print(header)
+
+    for url, (schema, rows) in pages.items():
+        adapter = TypeAdapter(List[schema])
+        validated = adapter.validate_python(rows, from_attributes=True)
+        content = adapter.dump_python(validated, mode="json")
+
+        validate = timeit(lambda: adapter.validate_python(rows, from_attributes=True), args.repeat)
+        serialize = timeit(lambda: adapter.dump_python(validated, mode="json"), args.repeat)
+        encode = {}
+        for name, dumps in encoders.items():
+            encode[name] = timeit(lambda: dumps(content), args.repeat)["median_ms"]
+
+        bodies = {name: json.loads(dumps(content)) for name, dumps in encoders.items()}
+        assert all(body == bodies["stdlib"] for body in bodies.values()), url
+
+        prepared = validate["median_ms"] + serialize["median_ms"]
+        line = f"{url:<20}{validate['median_ms']:>11.3f}{serialize['median_ms']:>9.3f}"
+        line += "".join(f"{encode[name]:>9.3f}" for name in encoders)
+        line += f"{len(stdlib_dumps(content)) / 1024:>7.1f}{prepared + encode['stdlib']:>13.3f}"
+        if "orjson" in encode:
+            line += f"{prepared + encode['orjson']:>13.3f}"
+        print(line)
+
+
+if __name__ == "__main__":
+    main()
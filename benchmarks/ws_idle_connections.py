@@ -0,0 +1,186 @@
+"""
+Нагрузочный тест push-канала: N простаивающих WebSocket-соединений.
+
+Поднимает uvicorn на временной БД, открывает N соединений к /api/messages/ws
+от имени одного получателя, замеряет время установки соединений и память
+сервера, затем отправляет сообщение через REST и измеряет, за сколько оно
+дошло до всех соединений.
+
+Запуск из корня репозитория:
+    python -m benchmarks.ws_idle_connections --connections 10000
+"""
+import argparse
+import asyncio
+import json
+import os
+import resource
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.request
+
+import websockets
+
+
+def raise_fd_limit(required: int) -> None:
+    soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+    if soft < required:
+        resource.setrlimit(resource.RLIMIT_NOFILE, (min(required, hard), hard))
+    soft, _ = resource.getrlimit(resource.RLIMIT_NOFILE)
+    if soft < required:
+        print(f"Внимание: лимит дескрипторов {soft} меньше требуемого {required}")
+
+
+def rss_mb(pid: int) -> float:
+    with open(f"/proc/{pid}/status") as status:
+        for line in status:
+            if line.startswith("VmRSS:"):
+                return int(line.split()[1]) / 1024
+    return 0.0
+
+
+def request(base: str, method: str, path: str, body: dict, token: str | None = None) -> dict:
+    req = urllib.request.Request(
+        base + path,
+        data=json.dumps(body).encode(),
+        method=method,
+        headers={"Content-Type": "application/json"},
+    )
+    if token:
+        req.add_header("Cookie", f"access_token={token}")
+    with urllib.request.urlopen(req) as response:
+        return json.loads(response.read())
+
+
+def wait_ready(base: str, timeout: float = 30) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            urllib.request.urlopen(base + "/health")
+            return
+        except OSError:
+            time.sleep(0.2)
+    raise RuntimeError("Сервер не запустился")
+
+
+def create_users(base: str) -> tuple[str, str]:
+    for name in ("admin", "client", "freelancer"):
+        try:
+            request(base, "POST", "/api/auth/roles", {"name": name})
+        except OSError:
+            pass
+    tokens = []
+    for email in ("sender@bench.local", "recipient@bench.local"):
+        request(base, "POST", "/api/auth/register", {
+            "name": "Bench", "email": email, "password": "secret", "role_id": 2,
+        })
+        tokens.append(request(base, "POST", "/api/auth/login", {
+            "email": email, "password": "secret",
+        })["access_token"])
+    return tokens[0], tokens[1]
+
+
+async def open_connections(url: str, token: str, count: int, concurrency: int):
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies: list[float] = []
+
+    async def connect():
+        async with semaphore:
+            started = time.perf_counter()
+            ws = await websockets.connect(
+                url,
+                additional_headers={"Cookie": f"access_token={token}"},
+                ping_interval=None,
+                open_timeout=60,
+            )
+            latencies.append((time.perf_counter() - started) * 1000)
+            return ws
+
+    connections = await asyncio.gather(*(connect() for _ in range(count)))
+    return connections, latencies
+
+
+async def run(args) -> None:
+    raise_fd_limit(args.connections + 1024)
+    port = args.port
+    base = f"http://127.0.0.1:{port}"
+
+    with tempfile.TemporaryDirectory() as tmp:
+        env = dict(os.environ, DATABASE_URL=f"sqlite+aiosqlite:///{tmp}/ws.db")
+        server = subprocess.Popen(
+            [
+                sys.executable, "-m", "uvicorn", "main:app",
+                "--port", str(port), "--log-level", "warning",
+                "--backlog", str(args.connections), "--ws", "websockets",
+            ],
+            env=env,
+            stdout=subprocess.DEVNULL,
+        )
+        try:
+            wait_ready(base)
+            sender_token, recipient_token = create_users(base)
+            recipient_id = 2
+            rss_before = rss_mb(server.pid)
+
+            started = time.perf_counter()
+            connections, latencies = await open_connections(
+                f"ws://127.0.0.1:{port}/api/messages/ws",
+                recipient_token, args.connections, args.concurrency,
+            )
+            total_connect = time.perf_counter() - started
+
+            await asyncio.sleep(args.idle)
+            rss_after = rss_mb(server.pid)
+
+            # Одно сообщение - рассылка во все соединения получателя
+            sent_at = time.perf_counter()
+            await asyncio.to_thread(
+                request, base, "POST", "/api/messages/",
+                {"content": "ping", "recipient_id": recipient_id}, sender_token,
+            )
+            delivery = await asyncio.gather(*(
+                _receive(ws, sent_at) for ws in connections
+            ))
+            received = [value for value in delivery if value is not None]
+
+            print(f"\n=== {args.connections} простаивающих соединений ===")
+            print(f"установка всех соединений: {total_connect:.2f} с")
+            print(f"установка одного, мс:      p50={statistics.median(latencies):.1f} "
+                  f"p99={statistics.quantiles(latencies, n=100)[98]:.1f}")
+            print(f"память сервера:            {rss_before:.0f} -> {rss_after:.0f} МБ "
+                  f"({(rss_after - rss_before) * 1024 / args.connections:.1f} КБ на соединение)")
+            print(f"доставлено:                {len(received)} из {args.connections}")
+            if received:
+                print(f"время доставки, мс:        p50={statistics.median(received):.1f} "
+                      f"max={max(received):.1f}")
+
+            await asyncio.gather(*(ws.close() for ws in connections), return_exceptions=True)
+        finally:
+            server.terminate()
+            server.wait()
+
+
+async def _receive(ws, sent_at: float) -> float | None:
+    try:
+        await asyncio.wait_for(ws.recv(), timeout=30)
+    except (asyncio.TimeoutError, websockets.ConnectionClosed):
+        return None
+    return (time.perf_counter() - sent_at) * 1000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--connections", type=int, default=10_000)
+    parser.add_argument("--concurrency", type=int, default=500,
+                        help="Сколько соединений устанавливается одновременно")
+    parser.add_argument("--idle", type=float, default=5.0,
+                        help="Пауза перед замером памяти, с")
+    parser.add_argument("--port", type=int, default=8011)
+    args = parser.parse_args()
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,22 +1,36 @@
 from fastapi import FastAPI, Request, Depends
 from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
-from fastapi.responses import HTMLResponse
+from fastapi.responses import HTMLResponse, PlainTextResponse
 from fastapi.middleware.cors import CORSMiddleware
 from contextlib import asynccontextmanager
+import asyncio
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 import uvicorn
 
 # ========== НАШИ МОДУЛИ ==========
-from app.database.database import engine, Base, get_db
+from app.database.database import engine, Base, get_db, describe_engine
 from app.config import settings
-from app.utils.security import get_password_hash
+from app.database.db_manager import DBManager
+from app.database.replicas import replica_set
+from app.middleware.read_your_writes import ReadYourWritesMiddleware
+from app.middleware.response_cache import ResponseCacheMiddleware, response_cache
+from app.middleware.timing import TimingMiddleware
+from app.database.search import project_search
+from app.services.matching import matching_engine
+from app.services.metrics import family, metrics
+from app.services.notifications import notification_hub
+from app.services.roles import role_registry
+from app.services.versions import table_versions
+from app.utils.hashing import password_hasher
+from app.utils.responses import FastJSONResponse
 
 # Импортируем все модели для создания таблиц
 from app.models import (
     users, roles, freelancers, projects, proposals,
-    payments, reviews, messages, skills, freelancer_skills
+    payments, reviews, messages, skills, freelancer_skills, unread_counters,
+    conversations, project_skills
 )
 
 # Импортируем модели напрямую для начальных данных и создания таблиц
@@ -37,9 +51,11 @@ from app.api.endpoints import (
     reviews as reviews_router,
     messages as messages_router,
     skills as skills_router,
-    freelancer_skills as freelancer_skills_router
+    freelancer_skills as freelancer_skills_router,
+    project_skills as project_skills_router
 )
 from app.api import auth
+from app.api.dependencies import get_current_admin, principal_cache
 from app.api.roles import router as roles_router
 # =================================
 
@@ -51,11 +67,15 @@ async def lifespan(app: FastAPI):
     print("=" * 50)
     print("ЗАПУСК ФРИЛАНС-ПЛАТФОРМЫ")
     print("=" * 50)
+
+    # Проверяем подключение и выводим фактические настройки БД
+    await check_database()
     
     # Создаем таблицы в базе данных
     try:
         async with engine.begin() as conn:
             await conn.run_sync(Base.metadata.create_all)
+            await conn.run_sync(project_search.setup)
         print("Таблицы базы данных созданы")
     except Exception as e:
         print(f"Ошибка при создании таблиц: {e}")
@@ -63,6 +83,25 @@ async def lifespan(app: FastAPI):
     
     # Создаем начальные данные
     await create_initial_data()
+
+    # Загружаем таблицу ролей для проверки прав без запросов к БД
+    await load_role_registry()
+
+    # Запускаем шину push-уведомлений (WebSocket/SSE)
+    await notification_hub.start()
+
+    # Загружаем граф навыков для подбора и запускаем его периодическое обновление
+    from app.database.database import async_session_maker
+    async with async_session_maker() as session:
+        await matching_engine.load(session)
+    matching_refresh = asyncio.create_task(
+        matching_engine.refresh_loop(async_session_maker, settings.MATCHING_RELOAD_SECONDS)
+    )
+
+    # Метрики: шаблоны маршрутов для меток и замер задержки event loop
+    metrics.set_route_templates(app.routes)
+    loop_watch = asyncio.create_task(metrics.watch_event_loop())
+    versions_refresh = asyncio.create_task(table_versions.refresh_loop())
     
     print("\n" + "=" * 50)
     print("🌐 СЕРВЕР ЗАПУЩЕН")
@@ -79,9 +118,34 @@ async def lifespan(app: FastAPI):
     print("🛑 ЗАВЕРШЕНИЕ РАБОТЫ")
     print("=" * 50)
     
+    matching_refresh.cancel()  # Останавливаем обновление индекса подбора
+    loop_watch.cancel()
+    versions_refresh.cancel()  # Останавливаем перечитывание версий таблиц
+    await notification_hub.stop()  # Отключаемся от брокера уведомлений
     await engine.dispose()  # Закрываем соединения с БД
+    await replica_set.dispose()
+    password_hasher.shutdown()  # Останавливаем пул хеширования паролей
     print("🔌 Соединения с базой данных закрыты")
 
+async def check_database():
+    """
+    Самопроверка подключения к БД: выводит примененные настройки пула и PRAGMA
+    """
+    config = await describe_engine(engine)
+    print("🗄️  База данных: " + ", ".join(f"{key}={value}" for key, value in config.items()))
+
+    expected_journal = settings.SQLITE_JOURNAL_MODE.lower()
+    if "journal_mode" in config and config["journal_mode"] != expected_journal:
+        print(f"   ⚠️  journal_mode={config['journal_mode']}, ожидался {expected_journal}")
+
+    for replica in replica_set.engines:
+        try:
+            replica_config = await describe_engine(replica)
+            print("   📖 Реплика: " + ", ".join(f"{key}={value}" for key, value in replica_config.items()))
+        except Exception as e:
+            replica_set.eject(replica, e)
+            print(f"   ⚠️  Реплика недоступна: {e}")
+
 async def create_initial_data():
     """
     Создает начальные данные в базе (роли, администратора)
@@ -130,7 +194,7 @@ async def create_initial_data():
                     new_admin = UserModel(
                         name="Администратор Системы",
                         email="admin@example.com",
-                        hashed_password=get_password_hash("admin123"),
+                        hashed_password=await password_hasher.hash("admin123"),
                         role_id=admin_role.id
                     )
                     
@@ -148,17 +212,33 @@ async def create_initial_data():
             print(f"⚠️  Ошибка при создании начальных данных: {e}")
             await session.rollback()
 
+async def load_role_registry():
+    """
+    Загружает таблицу ролей (id -> название) в память процесса
+    """
+    from app.database.database import async_session_maker
+
+    async with DBManager(session_factory=async_session_maker) as db:
+        await role_registry.load(db)
+    print("🔑 Таблица ролей загружена")
+
 # ========== СОЗДАНИЕ ПРИЛОЖЕНИЯ ==========
 app = FastAPI(
     title="Freelance Platform",
     description="Платформа для фрилансеров и клиентов с полным API",
     version="2.0.0",
     lifespan=lifespan,
+    default_response_class=FastJSONResponse,
     docs_url="/docs",
     redoc_url="/redoc",
     openapi_url="/api/openapi.json"
 )
 
+# ========== КЭШ ОТВЕТОВ ==========
+# Публичные GET-эндпоинты с проверкой If-None-Match. Добавляется до CORS, чтобы
+# заголовки CORS выставлялись для каждого запроса, а не брались из кэша
+app.add_middleware(ResponseCacheMiddleware, cache=response_cache)
+
 # ========== НАСТРОЙКА CORS ==========
 app.add_middleware(
     CORSMiddleware,
@@ -166,6 +246,22 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["GET", "POST", "PUT", "DELETE", "PATCH", "OPTIONS"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor", "ETag", "Server-Timing"],
+)
+
+# Чтения с реплик: после записи пользователь какое-то время читает с основной БД
+if replica_set.engines:
+    app.add_middleware(
+        ReadYourWritesMiddleware,
+        window_seconds=settings.DB_READ_YOUR_WRITES_SECONDS,
+    )
+
+# Время обработки и стоимость запросов к БД (Server-Timing, предупреждения о N+1).
+# Добавляется последним, чтобы замер охватывал остальные middleware
+app.add_middleware(
+    TimingMiddleware,
+    repeat_threshold=settings.QUERY_REPEAT_THRESHOLD,
+    excluded_paths=("/api/messages/stream",),
 )
 
 # ========== СТАТИЧЕСКИЕ ФАЙЛЫ И ШАБЛОНЫ ==========
@@ -287,6 +383,13 @@ app.include_router(
     tags=["🔗 Навыки фрилансеров"]
 )
 
+# Связи проект-навыки (ProjectSkills)
+app.include_router(
+    project_skills_router.router,
+    prefix="/api/project-skills",
+    tags=["🔗 Навыки проектов"]
+)
+
 # Аутентификация (Auth)
 app.include_router(
     auth.router,
@@ -355,6 +458,59 @@ async def test_db(db: AsyncSession = Depends(get_db)):
             "result": False
         }
 
+@app.get("/internal/versions", tags=["⚙️ Система"], dependencies=[Depends(get_current_admin)])
+async def internal_versions():
+    """Версии таблиц, по которым кэши определяют, что данные изменились (только для администраторов)"""
+    return {
+        "backend": settings.VERSIONS_BACKEND,
+        "epoch": table_versions.epoch,
+        "versions": table_versions.all(),
+    }
+
+def collect_component_metrics():
+    """Состояние пулов, очередей и кэшей на момент запроса /metrics"""
+    pools = [("primary", engine), *((f"replica{i}", replica) for i, replica in enumerate(replica_set.engines))]
+    pools = [(name, db.pool) for name, db in pools if hasattr(db.pool, "checkedout")]
+    yield from family("db_pool_checked_out", "gauge", "Соединения, выданные из пула",
+                      [(f'db="{name}"', pool.checkedout()) for name, pool in pools])
+    yield from family("db_pool_size", "gauge", "Размер пула соединений",
+                      [(f'db="{name}"', pool.size()) for name, pool in pools])
+    yield from family("db_replica_available", "gauge", "Реплика в ротации (1) или исключена (0)",
+                      [(f'db="replica{i}"', int(replica["available"]))
+                       for i, replica in enumerate(replica_set.stats())])
+
+    hasher = password_hasher.stats()
+    yield from family("password_hash_queue_depth", "gauge", "Задачи bcrypt в очереди и в работе",
+                      [("", hasher["pending"])])
+    yield from family("password_hash_rejected_total", "counter", "Отклонено из-за переполнения очереди",
+                      [("", hasher["rejected"])])
+
+    caches = {"principal": principal_cache.stats(), "response": response_cache.stats()}
+    yield from family("cache_hits_total", "counter", "Попадания в кэш",
+                      [(f'cache="{name}"', stats["hits"]) for name, stats in caches.items()])
+    yield from family("cache_misses_total", "counter", "Промахи кэша",
+                      [(f'cache="{name}"', stats["misses"]) for name, stats in caches.items()])
+    yield from family("cache_hit_ratio", "gauge", "Доля попаданий в кэш",
+                      [(f'cache="{name}"', stats["hit_ratio"]) for name, stats in caches.items()])
+    yield from family("http_not_modified_total", "counter", "Ответы 304 по If-None-Match",
+                      [("", caches["response"]["not_modified"])])
+
+    hub = notification_hub.stats()
+    yield from family("push_connections", "gauge", "Открытые WebSocket/SSE соединения",
+                      [("", hub["connections"])])
+    yield from family("push_broker_dropped_total", "counter",
+                      "События, не отправленные брокеру из-за переполнения очереди",
+                      [("", hub["dropped"])])
+
+
+metrics.collectors.append(collect_component_metrics)
+
+
+@app.get("/metrics", tags=["⚙️ Система"], response_class=PlainTextResponse)
+async def metrics_endpoint():
+    """Метрики процесса в текстовом формате Prometheus"""
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4")
+
 # ========== ЗАПУСК СЕРВЕРА ==========
 
 if __name__ == "__main__":
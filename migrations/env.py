@@ -9,15 +9,17 @@ from alembic import context
 from app.database.database import Base
 from app.config import settings
 
-# TODO Добавить сюда импорт созданных моделей
-# Пример:
-from app.models.users import UserModel
-from app.models.roles import RoleModel
+# Импортируем все модели, чтобы их таблицы попали в Base.metadata
+from app.models import (  # noqa: F401
+    users, roles, freelancers, projects, proposals,
+    payments, reviews, messages, skills, freelancer_skills, responces,
+    unread_counters, conversations, project_skills
+)
 
 # this is the Alembic Config object, which provides
 # access to the values within the .ini file in use.
 
-sqlalchemy_url = settings.get_db_url
+sqlalchemy_url = settings.get_db_url()
 config = context.config
 config.set_main_option("sqlalchemy.url", sqlalchemy_url)
 
@@ -32,6 +34,22 @@ if config.config_file_name is not None:
 # target_metadata = mymodel.Base.metadata
 target_metadata = Base.metadata
 
+# Объекты полнотекстового поиска создаются вне моделей (app/database/search.py):
+# FTS5-таблица projects_fts с теневыми таблицами в SQLite, колонка search_vector
+# и ее GIN-индекс в PostgreSQL. Без фильтра autogenerate и alembic check
+# предлагают их удалить.
+FTS_OBJECT_PREFIX = "projects_fts"
+FTS_POSTGRES_OBJECTS = {("column", "search_vector"), ("index", "ix_projects_search_vector")}
+
+
+def include_object(object, name, type_, reflected, compare_to):
+    if type_ == "table" and name.startswith(FTS_OBJECT_PREFIX):
+        return False
+    if reflected and compare_to is None and (type_, name) in FTS_POSTGRES_OBJECTS:
+        return False
+    return True
+
+
 # other values from the config, defined by the needs of env.py,
 # can be acquired:
 # my_important_option = config.get_main_option("my_important_option")
@@ -54,6 +72,7 @@ def run_migrations_offline() -> None:
     context.configure(
         url=url,
         target_metadata=target_metadata,
+        include_object=include_object,
         literal_binds=True,
         dialect_opts={"paramstyle": "named"},
     )
@@ -63,7 +82,11 @@ def run_migrations_offline() -> None:
 
 
 def do_run_migrations(connection: Connection) -> None:
-    context.configure(connection=connection, target_metadata=target_metadata)
+    context.configure(
+        connection=connection,
+        target_metadata=target_metadata,
+        include_object=include_object,
+    )
 
     with context.begin_transaction():
         context.run_migrations()
@@ -0,0 +1,262 @@
+"""full schema and composite indexes
+
+Revision ID: 5d2a7c41e9b3
+Revises: 8019d75e3d9f
+Create Date: 2026-10-18 10:00:00.000000
+
+"""
+import logging
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5d2a7c41e9b3'
+down_revision: Union[str, Sequence[str], None] = '8019d75e3d9f'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+logger = logging.getLogger(__name__)
+
+
+# Полнотекстовый индекс проектов в том виде, в каком он создан этой ревизией.
+# DDL скопирован сюда, а не импортирован из app/database/search.py: изменения
+# поиска в приложении не должны менять уже примененную миграцию.
+SQLITE_FTS_DDL = [
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS projects_fts USING fts5(
+        title, description,
+        content='projects', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2'
+    )
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS projects_fts_ai AFTER INSERT ON projects BEGIN
+        INSERT INTO projects_fts(rowid, title, description)
+        VALUES (new.id, new.title, new.description);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS projects_fts_ad AFTER DELETE ON projects BEGIN
+        INSERT INTO projects_fts(projects_fts, rowid, title, description)
+        VALUES ('delete', old.id, old.title, old.description);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS projects_fts_au AFTER UPDATE OF title, description ON projects BEGIN
+        INSERT INTO projects_fts(projects_fts, rowid, title, description)
+        VALUES ('delete', old.id, old.title, old.description);
+        INSERT INTO projects_fts(rowid, title, description)
+        VALUES (new.id, new.title, new.description);
+    END
+    """,
+]
+SQLITE_FTS_REBUILD = "INSERT INTO projects_fts(projects_fts) VALUES ('rebuild')"
+
+POSTGRES_FTS_DDL = [
+    """
+    ALTER TABLE projects ADD COLUMN IF NOT EXISTS search_vector tsvector
+    GENERATED ALWAYS AS (
+        setweight(to_tsvector('simple', coalesce(title, '')), 'A') ||
+        setweight(to_tsvector('simple', coalesce(description, '')), 'B')
+    ) STORED
+    """,
+    "CREATE INDEX IF NOT EXISTS ix_projects_search_vector ON projects USING gin (search_vector)",
+]
+
+
+def _create_search_index(bind) -> None:
+    if bind.dialect.name == 'sqlite':
+        exists = bind.execute(
+            sa.text("SELECT 1 FROM sqlite_master WHERE name = 'projects_fts'")
+        ).scalar()
+        try:
+            for ddl in SQLITE_FTS_DDL:
+                op.execute(ddl)
+        except sa.exc.DBAPIError as e:
+            # SQLite собран без FTS5 - поиск работает через ILIKE
+            logger.warning(f"Полнотекстовый индекс не создан: {e}")
+            return
+        if not exists:
+            # Индексируем проекты, созданные до появления FTS-таблицы
+            op.execute(SQLITE_FTS_REBUILD)
+    elif bind.dialect.name == 'postgresql':
+        for ddl in POSTGRES_FTS_DDL:
+            op.execute(ddl)
+
+
+def _timestamps() -> list[sa.Column]:
+    return [
+        sa.Column('created_at', sa.DateTime(), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=False),
+    ]
+
+
+# Таблицы могли быть созданы ранее через Base.metadata.create_all при старте
+# приложения, поэтому создаем только отсутствующие
+TABLES = {
+    'freelancers': lambda: [
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('bio', sa.Text(), nullable=True),
+        sa.Column('hourly_rate', sa.Float(), nullable=True),
+        sa.Column('portfolio_url', sa.String(length=255), nullable=True),
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        *_timestamps(),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('user_id'),
+    ],
+    'skills': lambda: [
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('name', sa.String(length=100), nullable=False),
+        *_timestamps(),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('name'),
+    ],
+    'projects': lambda: [
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('title', sa.String(length=200), nullable=False),
+        sa.Column('description', sa.Text(), nullable=False),
+        sa.Column('budget', sa.Float(), nullable=True),
+        sa.Column('deadline', sa.DateTime(), nullable=True),
+        sa.Column('status', sa.Enum('OPEN', 'IN_PROGRESS', 'COMPLETED', 'CANCELLED', name='projectstatus'), nullable=True),
+        sa.Column('client_id', sa.Integer(), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=False),
+        sa.ForeignKeyConstraint(['client_id'], ['users.id'], ),
+        sa.PrimaryKeyConstraint('id'),
+    ],
+    'messages': lambda: [
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('content', sa.Text(), nullable=False),
+        sa.Column('timestamp', sa.DateTime(), nullable=False),
+        sa.Column('is_read', sa.Boolean(), nullable=False),
+        sa.Column('sender_id', sa.Integer(), nullable=False),
+        sa.Column('recipient_id', sa.Integer(), nullable=False),
+        *_timestamps(),
+        sa.ForeignKeyConstraint(['recipient_id'], ['users.id'], ),
+        sa.ForeignKeyConstraint(['sender_id'], ['users.id'], ),
+        sa.PrimaryKeyConstraint('id'),
+    ],
+    'proposals': lambda: [
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('cover_message', sa.Text(), nullable=False),
+        sa.Column('proposed_price', sa.Numeric(precision=10, scale=2), nullable=False),
+        sa.Column('status', sa.String(), nullable=False),
+        sa.Column('submitted_at', sa.DateTime(), nullable=False),
+        sa.Column('project_id', sa.Integer(), nullable=False),
+        sa.Column('freelancer_id', sa.Integer(), nullable=False),
+        *_timestamps(),
+        sa.ForeignKeyConstraint(['freelancer_id'], ['freelancers.id'], ),
+        sa.ForeignKeyConstraint(['project_id'], ['projects.id'], ),
+        sa.PrimaryKeyConstraint('id'),
+    ],
+    'reviews': lambda: [
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('rating', sa.Integer(), nullable=False),
+        sa.Column('comment', sa.Text(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.Column('project_id', sa.Integer(), nullable=False),
+        sa.Column('reviewer_id', sa.Integer(), nullable=False),
+        sa.Column('freelancer_id', sa.Integer(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=False),
+        sa.ForeignKeyConstraint(['freelancer_id'], ['freelancers.id'], ),
+        sa.ForeignKeyConstraint(['project_id'], ['projects.id'], ),
+        sa.ForeignKeyConstraint(['reviewer_id'], ['users.id'], ),
+        sa.PrimaryKeyConstraint('id'),
+    ],
+    'freelancer_skills': lambda: [
+        sa.Column('freelancer_id', sa.Integer(), nullable=False),
+        sa.Column('skill_id', sa.Integer(), nullable=False),
+        *_timestamps(),
+        sa.ForeignKeyConstraint(['freelancer_id'], ['freelancers.id'], ),
+        sa.ForeignKeyConstraint(['skill_id'], ['skills.id'], ),
+        sa.PrimaryKeyConstraint('freelancer_id', 'skill_id'),
+    ],
+    'responses': lambda: [
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('message', sa.Text(), nullable=False),
+        sa.Column('proposed_price', sa.Float(), nullable=True),
+        sa.Column('freelancer_id', sa.Integer(), nullable=False),
+        sa.Column('project_id', sa.Integer(), nullable=False),
+        sa.Column('is_selected', sa.Boolean(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=False),
+        sa.ForeignKeyConstraint(['freelancer_id'], ['users.id'], ),
+        sa.ForeignKeyConstraint(['project_id'], ['projects.id'], ),
+        sa.PrimaryKeyConstraint('id'),
+    ],
+    'payments': lambda: [
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('amount', sa.Numeric(precision=10, scale=2), nullable=False),
+        sa.Column('currency', sa.String(length=3), nullable=False),
+        sa.Column('status', sa.String(length=50), nullable=False),
+        sa.Column('payment_date', sa.DateTime(), nullable=True),
+        sa.Column('proposal_id', sa.Integer(), nullable=False),
+        *_timestamps(),
+        sa.ForeignKeyConstraint(['proposal_id'], ['proposals.id'], ),
+        sa.PrimaryKeyConstraint('id'),
+    ],
+}
+
+# Индексы под WHERE/ORDER BY списковых эндпоинтов
+INDEXES = [
+    ('ix_users_role_id', 'users', ['role_id']),
+    ('ix_projects_id', 'projects', ['id']),
+    ('ix_projects_client_id', 'projects', ['client_id']),
+    ('ix_projects_status_created_at', 'projects', ['status', sa.text('created_at DESC'), sa.text('id DESC')]),
+    ('ix_proposals_submitted_at', 'proposals', ['submitted_at', 'id']),
+    ('ix_proposals_project_id_submitted_at', 'proposals', ['project_id', 'submitted_at', 'id']),
+    ('ix_proposals_freelancer_id_submitted_at', 'proposals', ['freelancer_id', 'submitted_at', 'id']),
+    ('ix_proposals_status_submitted_at', 'proposals', ['status', 'submitted_at', 'id']),
+    ('ix_messages_sender_id_timestamp', 'messages', ['sender_id', 'timestamp', 'id']),
+    ('ix_messages_recipient_id_timestamp', 'messages', ['recipient_id', 'timestamp', 'id']),
+    ('ix_reviews_created_at', 'reviews', ['created_at', 'id']),
+    ('ix_reviews_freelancer_id_created_at', 'reviews', ['freelancer_id', 'created_at', 'id']),
+    ('ix_reviews_project_id_created_at', 'reviews', ['project_id', 'created_at', 'id']),
+    ('ix_reviews_reviewer_id', 'reviews', ['reviewer_id']),
+    ('ix_payments_status', 'payments', ['status']),
+    ('ix_payments_proposal_id', 'payments', ['proposal_id']),
+    ('ix_freelancer_skills_skill_id', 'freelancer_skills', ['skill_id']),
+    ('ix_responses_id', 'responses', ['id']),
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    bind = op.get_bind()
+    inspector = sa.inspect(bind)
+    existing_tables = set(inspector.get_table_names())
+
+    for name, columns in TABLES.items():
+        if name not in existing_tables:
+            op.create_table(name, *columns())
+
+    for index_name, table_name, columns in INDEXES:
+        existing = {index['name'] for index in inspector.get_indexes(table_name)} \
+            if table_name in existing_tables else set()
+        if index_name not in existing:
+            op.create_index(index_name, table_name, columns)
+
+    # Полнотекстовый индекс проектов (FTS5 / tsvector)
+    _create_search_index(bind)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    bind = op.get_bind()
+    if bind.dialect.name == 'sqlite':
+        for trigger in ('projects_fts_ai', 'projects_fts_ad', 'projects_fts_au'):
+            op.execute(f'DROP TRIGGER IF EXISTS {trigger}')
+        op.execute('DROP TABLE IF EXISTS projects_fts')
+    elif bind.dialect.name == 'postgresql':
+        op.execute('DROP INDEX IF EXISTS ix_projects_search_vector')
+        op.execute('ALTER TABLE projects DROP COLUMN IF EXISTS search_vector')
+
+    # Индексы остальных таблиц удаляются вместе с таблицами
+    op.drop_index('ix_users_role_id', table_name='users')
+
+    for name in reversed(list(TABLES)):
+        op.drop_table(name)
@@ -0,0 +1,59 @@
+"""unread message counters
+
+Revision ID: 9c4e1f7a2b6d
+Revises: 5d2a7c41e9b3
+Create Date: 2026-10-18 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9c4e1f7a2b6d'
+down_revision: Union[str, Sequence[str], None] = '5d2a7c41e9b3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    bind = op.get_bind()
+    if 'unread_counters' not in sa.inspect(bind).get_table_names():
+        op.create_table(
+            'unread_counters',
+            sa.Column('user_id', sa.Integer(), nullable=False),
+            sa.Column('count', sa.Integer(), nullable=False),
+            sa.Column('created_at', sa.DateTime(), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=False),
+            sa.Column('updated_at', sa.DateTime(), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=False),
+            sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+            sa.PrimaryKeyConstraint('user_id'),
+        )
+
+    # Заполняем счетчики по уже существующим сообщениям
+    messages = sa.table(
+        'messages',
+        sa.column('recipient_id', sa.Integer()),
+        sa.column('is_read', sa.Boolean()),
+    )
+    counters = sa.table(
+        'unread_counters',
+        sa.column('user_id', sa.Integer()),
+        sa.column('count', sa.Integer()),
+    )
+    op.execute(sa.delete(counters))
+    op.execute(
+        sa.insert(counters).from_select(
+            ['user_id', 'count'],
+            sa.select(messages.c.recipient_id, sa.func.count())
+            .where(messages.c.is_read == sa.false())
+            .group_by(messages.c.recipient_id),
+        )
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('unread_counters')
@@ -0,0 +1,56 @@
+"""projects sort columns not null
+
+Revision ID: a7d3c9e5b218
+Revises: f19b3d5a8c62
+Create Date: 2026-10-18 22:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a7d3c9e5b218'
+down_revision: Union[str, Sequence[str], None] = 'f19b3d5a8c62'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Ключи курсорной пагинации списка проектов: сравнение с NULL ложно, и
+# проекты с NULL в этих колонках пропускались бы при переходе по курсору
+BACKFILL = {
+    'status': "'OPEN'",
+    'created_at': 'CURRENT_TIMESTAMP',
+}
+
+
+def _set_nullable(nullable: bool) -> None:
+    bind = op.get_bind()
+    # В SQLite batch-режим пересоздает таблицу, а вместе с ней удаляются
+    # триггеры полнотекстового индекса - восстанавливаем их после
+    triggers = []
+    if bind.dialect.name == 'sqlite':
+        triggers = bind.execute(sa.text(
+            "SELECT sql FROM sqlite_master WHERE type = 'trigger' AND tbl_name = 'projects'"
+        )).scalars().all()
+    with op.batch_alter_table('projects') as batch_op:
+        for name in BACKFILL:
+            batch_op.alter_column(name, nullable=nullable)
+    for trigger in triggers:
+        op.execute(trigger)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    columns = {column['name']: column for column in sa.inspect(op.get_bind()).get_columns('projects')}
+    if not any(columns[name]['nullable'] for name in BACKFILL):
+        return
+    for name, value in BACKFILL.items():
+        op.execute(f"UPDATE projects SET {name} = {value} WHERE {name} IS NULL")
+    _set_nullable(False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    _set_nullable(True)
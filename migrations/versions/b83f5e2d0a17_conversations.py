@@ -0,0 +1,106 @@
+"""conversations
+
+Revision ID: b83f5e2d0a17
+Revises: 9c4e1f7a2b6d
+Create Date: 2026-10-18 14:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b83f5e2d0a17'
+down_revision: Union[str, Sequence[str], None] = '9c4e1f7a2b6d'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    bind = op.get_bind()
+    inspector = sa.inspect(bind)
+
+    if 'conversations' not in inspector.get_table_names():
+        op.create_table(
+            'conversations',
+            sa.Column('id', sa.Integer(), nullable=False),
+            sa.Column('user_low_id', sa.Integer(), nullable=False),
+            sa.Column('user_high_id', sa.Integer(), nullable=False),
+            sa.Column('last_message_id', sa.Integer(), nullable=True),
+            sa.Column('last_message_at', sa.DateTime(), nullable=False),
+            sa.Column('unread_low', sa.Integer(), nullable=False),
+            sa.Column('unread_high', sa.Integer(), nullable=False),
+            sa.Column('created_at', sa.DateTime(), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=False),
+            sa.Column('updated_at', sa.DateTime(), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=False),
+            sa.ForeignKeyConstraint(['user_high_id'], ['users.id'], ),
+            sa.ForeignKeyConstraint(['user_low_id'], ['users.id'], ),
+            sa.ForeignKeyConstraint(['last_message_id'], ['messages.id'], name='fk_conversations_last_message_id'),
+            sa.PrimaryKeyConstraint('id'),
+            sa.UniqueConstraint('user_low_id', 'user_high_id'),
+        )
+        op.create_index('ix_conversations_user_low_id_last_message_at', 'conversations',
+                        ['user_low_id', 'last_message_at', 'id'])
+        op.create_index('ix_conversations_user_high_id_last_message_at', 'conversations',
+                        ['user_high_id', 'last_message_at', 'id'])
+
+    message_columns = {column['name'] for column in inspector.get_columns('messages')}
+    if 'conversation_id' not in message_columns:
+        with op.batch_alter_table('messages') as batch_op:
+            batch_op.add_column(sa.Column('conversation_id', sa.Integer(), nullable=True))
+            batch_op.create_foreign_key(
+                'fk_messages_conversation_id', 'conversations', ['conversation_id'], ['id']
+            )
+    message_indexes = {index['name'] for index in sa.inspect(bind).get_indexes('messages')}
+    if 'ix_messages_conversation_id_timestamp' not in message_indexes:
+        op.create_index('ix_messages_conversation_id_timestamp', 'messages',
+                        ['conversation_id', 'timestamp', 'id'])
+
+    # Заполняем диалоги по существующим сообщениям
+    if bind.dialect.name == 'postgresql':
+        least, greatest, false = 'least', 'greatest', 'false'
+    else:
+        least, greatest, false = 'min', 'max', '0'
+    low = f'{least}(m.sender_id, m.recipient_id)'
+    high = f'{greatest}(m.sender_id, m.recipient_id)'
+
+    op.execute(f"""
+        INSERT INTO conversations (user_low_id, user_high_id, last_message_at, unread_low, unread_high)
+        SELECT {low}, {high}, max(m.timestamp),
+               sum(CASE WHEN m.is_read = {false} AND m.recipient_id = {low} THEN 1 ELSE 0 END),
+               sum(CASE WHEN m.is_read = {false} AND m.recipient_id = {high} THEN 1 ELSE 0 END)
+        FROM messages m
+        WHERE NOT EXISTS (
+            SELECT 1 FROM conversations c
+            WHERE c.user_low_id = {low} AND c.user_high_id = {high}
+        )
+        GROUP BY {low}, {high}
+    """)
+    op.execute(f"""
+        UPDATE messages SET conversation_id = (
+            SELECT c.id FROM conversations c
+            WHERE c.user_low_id = {low.replace('m.', 'messages.')}
+              AND c.user_high_id = {high.replace('m.', 'messages.')}
+        )
+        WHERE conversation_id IS NULL
+    """)
+    op.execute("""
+        UPDATE conversations SET last_message_id = (
+            SELECT m.id FROM messages m
+            WHERE m.conversation_id = conversations.id
+            ORDER BY m.timestamp DESC, m.id DESC
+            LIMIT 1
+        )
+        WHERE last_message_id IS NULL
+    """)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_messages_conversation_id_timestamp', table_name='messages')
+    with op.batch_alter_table('messages') as batch_op:
+        batch_op.drop_constraint('fk_messages_conversation_id', type_='foreignkey')
+        batch_op.drop_column('conversation_id')
+    op.drop_table('conversations')
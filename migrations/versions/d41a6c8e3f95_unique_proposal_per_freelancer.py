@@ -0,0 +1,47 @@
+"""unique proposal per freelancer and project
+
+Revision ID: d41a6c8e3f95
+Revises: b83f5e2d0a17
+Create Date: 2026-10-18 16:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd41a6c8e3f95'
+down_revision: Union[str, Sequence[str], None] = 'b83f5e2d0a17'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    bind = op.get_bind()
+    indexes = {index['name'] for index in sa.inspect(bind).get_indexes('proposals')}
+    if 'uq_proposals_project_id_freelancer_id' in indexes:
+        return
+
+    # Дубликаты не удаляем автоматически: на предложения ссылаются платежи
+    duplicates = bind.execute(sa.text(
+        "SELECT count(*) FROM ("
+        "  SELECT project_id, freelancer_id FROM proposals"
+        "  GROUP BY project_id, freelancer_id HAVING count(*) > 1"
+        ") d"
+    )).scalar()
+    if duplicates:
+        raise RuntimeError(
+            f"В таблице proposals {duplicates} пар (project_id, freelancer_id) "
+            "с несколькими предложениями - устраните дубликаты перед миграцией"
+        )
+
+    op.create_index('uq_proposals_project_id_freelancer_id', 'proposals',
+                    ['project_id', 'freelancer_id'], unique=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('uq_proposals_project_id_freelancer_id', table_name='proposals')
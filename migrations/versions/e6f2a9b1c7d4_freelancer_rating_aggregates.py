@@ -0,0 +1,47 @@
+"""freelancer rating aggregates
+
+Revision ID: e6f2a9b1c7d4
+Revises: d41a6c8e3f95
+Create Date: 2026-10-18 18:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e6f2a9b1c7d4'
+down_revision: Union[str, Sequence[str], None] = 'd41a6c8e3f95'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+COLUMNS = ['rating_count', 'rating_sum'] + [f'rating_{rating}' for rating in range(1, 6)]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    existing = {column['name'] for column in sa.inspect(op.get_bind()).get_columns('freelancers')}
+    for name in COLUMNS:
+        if name not in existing:
+            op.add_column('freelancers', sa.Column(name, sa.Integer(), server_default='0', nullable=False))
+
+    # Заполняем агрегаты по существующим отзывам
+    assignments = [
+        "rating_count = (SELECT count(*) FROM reviews r WHERE r.freelancer_id = freelancers.id)",
+        "rating_sum = (SELECT coalesce(sum(r.rating), 0) FROM reviews r WHERE r.freelancer_id = freelancers.id)",
+    ]
+    for rating in range(1, 6):
+        assignments.append(
+            f"rating_{rating} = (SELECT count(*) FROM reviews r "
+            f"WHERE r.freelancer_id = freelancers.id AND r.rating = {rating})"
+        )
+    op.execute("UPDATE freelancers SET " + ", ".join(assignments))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table('freelancers') as batch_op:
+        for name in reversed(COLUMNS):
+            batch_op.drop_column(name)
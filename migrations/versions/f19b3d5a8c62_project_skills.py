@@ -0,0 +1,41 @@
+"""project skills
+
+Revision ID: f19b3d5a8c62
+Revises: e6f2a9b1c7d4
+Create Date: 2026-10-18 20:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f19b3d5a8c62'
+down_revision: Union[str, Sequence[str], None] = 'e6f2a9b1c7d4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    if 'project_skills' in sa.inspect(op.get_bind()).get_table_names():
+        return
+    op.create_table(
+        'project_skills',
+        sa.Column('project_id', sa.Integer(), nullable=False),
+        sa.Column('skill_id', sa.Integer(), nullable=False),
+        sa.Column('created_at', sa.DateTime(), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=False),
+        sa.ForeignKeyConstraint(['project_id'], ['projects.id'], ),
+        sa.ForeignKeyConstraint(['skill_id'], ['skills.id'], ),
+        sa.PrimaryKeyConstraint('project_id', 'skill_id'),
+    )
+    op.create_index('ix_project_skills_skill_id', 'project_skills', ['skill_id'])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_project_skills_skill_id', table_name='project_skills')
+    op.drop_table('project_skills')
@@ -0,0 +1,126 @@
+"""
+Проверка числа SQL-запросов при раскрытии связей (?expand=...).
+
+Поднимает приложение на временной БД с синтетическими данными и для каждого
+сценария сравнивает число запросов со страницей из 1 и из 100 объектов с тем
+же списком без expand. Раскрытие коллекции (selectinload) должно добавлять
+ровно один запрос, связи "многие к одному" (joinedload) - ни одного, и это
+число не должно зависеть от размера страницы. Рост числа запросов с размером
+страницы означает ленивую загрузку (N+1).
+
+Запуск из корня репозитория:
+    python -m scripts.check_expand_queries
+"""
+import asyncio
+import os
+import sys
+import tempfile
+
+DB_DIR = tempfile.mkdtemp(prefix="expand-queries-")
+DB_URL = f"sqlite+aiosqlite:///{os.path.join(DB_DIR, 'expand.db')}"
+os.environ["DATABASE_URL"] = DB_URL
+# Кэш ответов вернул бы повторный ответ без обращения к БД
+os.environ["RESPONSE_CACHE_TTL_SECONDS"] = "0"
+
+from fastapi.testclient import TestClient  # noqa: E402
+from sqlalchemy import event  # noqa: E402
+
+from app.api.expansions import (  # noqa: E402
+    FREELANCER_EXPANSIONS,
+    PROJECT_EXPANSIONS,
+    PROPOSAL_EXPANSIONS,
+    REVIEW_EXPANSIONS,
+)
+from app.config import settings  # noqa: E402
+from app.database.database import engine  # noqa: E402
+from app.utils.expand import Tree  # noqa: E402
+from main import app  # noqa: E402
+from scripts import seed_data  # noqa: E402
+
+PAGE_SIZES = (1, 100)
+
+# (список, раскрытие)
+SCENARIOS = [
+    ("/api/projects/", PROJECT_EXPANSIONS, "client"),
+    ("/api/projects/", PROJECT_EXPANSIONS, "client.role"),
+    ("/api/projects/", PROJECT_EXPANSIONS, "skills"),
+    ("/api/projects/", PROJECT_EXPANSIONS, "client,skills"),
+    ("/api/freelancers/", FREELANCER_EXPANSIONS, "user"),
+    ("/api/freelancers/", FREELANCER_EXPANSIONS, "skills"),
+    ("/api/freelancers/", FREELANCER_EXPANSIONS, "user.role,skills"),
+    ("/api/proposals/", PROPOSAL_EXPANSIONS, "project"),
+    ("/api/proposals/", PROPOSAL_EXPANSIONS, "project.client"),
+    ("/api/proposals/", PROPOSAL_EXPANSIONS, "freelancer.user"),
+    ("/api/proposals/", PROPOSAL_EXPANSIONS, "freelancer.skills"),
+    ("/api/proposals/", PROPOSAL_EXPANSIONS, "project.skills,freelancer.skills"),
+    ("/api/proposals/", PROPOSAL_EXPANSIONS, "project.client,freelancer.user,freelancer.skills"),
+    ("/api/reviews/", REVIEW_EXPANSIONS, "reviewer"),
+    ("/api/reviews/", REVIEW_EXPANSIONS, "reviewer.role,freelancer.user"),
+    ("/api/reviews/", REVIEW_EXPANSIONS, "freelancer.skills"),
+]
+
+
+def collections_in(tree: Tree) -> int:
+    """Ожидаемое число дополнительных запросов: по одному на раскрытую коллекцию"""
+    return sum(relation.many + collections_in(children) for relation, children in tree.values())
+
+
+def main() -> int:
+    asyncio.run(seed_data.seed(seed_data.build_parser().parse_args(
+        ["--database-url", DB_URL, "--users", "3000", "--skills", "200"]
+    )))
+
+    queries = 0
+
+    def count(conn, cursor, statement, parameters, context, executemany):
+        nonlocal queries
+        queries += 1
+
+    def measure(url: str, params: dict) -> tuple[int, list]:
+        nonlocal queries
+        queries = 0
+        response = client.get(url, params=params)
+        if response.status_code != 200:
+            raise RuntimeError(f"HTTP {response.status_code}: {response.text[:200]}")
+        return queries, response.json()
+
+    failures = 0
+    with TestClient(app) as client:
+        response = client.post("/api/auth/login", json={
+            "email": "user1@seed.example", "password": "password",
+        })
+        client.cookies.set("access_token", response.json()["access_token"])
+        event.listen(engine.sync_engine, "before_cursor_execute", count)
+
+        print(f"{'':<5}{'список':<19}{'expand':<52}" + "".join(f"{f'limit={size}':>10}" for size in PAGE_SIZES))
+        for url, expansions, expand in SCENARIOS:
+            expected = collections_in(expansions.parse(expand, settings.EXPAND_MAX_DEPTH).tree)
+            extras, problems = [], []
+            for size in PAGE_SIZES:
+                # Первый вызов прогревает кэш пользователя из токена
+                measure(url, {"limit": size})
+                base, _ = measure(url, {"limit": size})
+                expanded, items = measure(url, {"limit": size, "expand": expand})
+                extras.append(expanded - base)
+                if len(items) != size:
+                    problems.append(f"limit={size}: в ответе {len(items)} объектов")
+                top = {path.split(".")[0] for path in expand.split(",")}
+                if any(not top <= item.keys() for item in items):
+                    problems.append(f"limit={size}: не все связи раскрыты")
+            if any(extra != expected for extra in extras):
+                problems.append(f"ожидалось +{expected} запрос(а) на любой странице")
+
+            status = "FAIL" if problems else "ok  "
+            print(f"{status} {url:<19}{expand:<52}" + "".join(f"{f'+{extra}':>10}" for extra in extras))
+            for problem in problems:
+                print(f"       {problem}")
+            failures += bool(problems)
+
+        event.remove(engine.sync_engine, "before_cursor_execute", count)
+
+    print(f"\nПроблемных раскрытий: {failures}")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
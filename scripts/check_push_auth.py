@@ -0,0 +1,81 @@
+"""
+Проверка аутентификации push-каналов (/api/messages/ws и /api/messages/stream).
+
+Поднимает приложение на временной БД и подключается с отсутствующим, битым,
+подписанным чужим ключом и истекшим токеном в cookie access_token. WebSocket
+должен закрываться с кодом 1008, SSE - отвечать 401. С действующим токеном
+WebSocket принимается.
+
+Запуск из корня репозитория:
+    python -m scripts.check_push_auth
+"""
+import os
+import sys
+import tempfile
+from datetime import datetime, timedelta, timezone
+
+DB_DIR = tempfile.mkdtemp(prefix="push-auth-")
+os.environ["DATABASE_URL"] = f"sqlite+aiosqlite:///{os.path.join(DB_DIR, 'push.db')}"
+
+from fastapi.testclient import TestClient  # noqa: E402
+from jose import jwt  # noqa: E402
+from starlette.websockets import WebSocketDisconnect  # noqa: E402
+
+from app.config import settings  # noqa: E402
+from app.services.auth import AuthService  # noqa: E402
+from main import app  # noqa: E402
+
+WS_URL = "/api/messages/ws"
+STREAM_URL = "/api/messages/stream"
+
+
+def bad_tokens() -> dict[str, str | None]:
+    expired = datetime.now(timezone.utc) - timedelta(minutes=5)
+    return {
+        "без токена": None,
+        "битый токен": "not-a-jwt",
+        "чужой ключ": jwt.encode({"user_id": 1}, "wrong-" + settings.SECRET_KEY, settings.ALGORITHM),
+        "истекший": jwt.encode({"user_id": 1, "exp": expired}, settings.SECRET_KEY, settings.ALGORITHM),
+        "без user_id": jwt.encode({"role": "admin"}, settings.SECRET_KEY, settings.ALGORITHM),
+    }
+
+
+def websocket_close_code(client: TestClient, token: str | None) -> int | None:
+    """Код закрытия до accept или None, если соединение принято"""
+    client.cookies.clear()
+    if token is not None:
+        client.cookies.set("access_token", token)
+    try:
+        with client.websocket_connect(WS_URL):
+            return None
+    except WebSocketDisconnect as ex:
+        return ex.code
+
+
+def main() -> int:
+    failures = 0
+
+    def report(ok: bool, text: str) -> None:
+        nonlocal failures
+        print(f"{'ok  ' if ok else 'FAIL'} {text}")
+        failures += not ok
+
+    with TestClient(app) as client:
+        for name, token in bad_tokens().items():
+            code = websocket_close_code(client, token)
+            report(code == 1008, f"{WS_URL} {name}: код закрытия {code}")
+            if token is not None:
+                client.cookies.set("access_token", token)
+            status = client.get(STREAM_URL).status_code
+            report(status == 401, f"{STREAM_URL} {name}: HTTP {status}")
+
+        token = AuthService.create_access_token({"user_id": 1, "role": "admin"})
+        code = websocket_close_code(client, token)
+        report(code is None, f"{WS_URL} действующий токен: {'принят' if code is None else f'код {code}'}")
+
+    print(f"\nОшибок: {failures}")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,176 @@
+"""
+Проверка планов запросов списковых эндпоинтов (SQLite, EXPLAIN QUERY PLAN).
+
+Поднимает приложение на временной БД, вызывает списковые эндпоинты с типичными
+фильтрами, перехватывает выполненные SELECT и проверяет их планы. Проверка
+падает, если запрос с условием WHERE читает таблицу полным сканированием или
+сортирует результат во временном B-дереве вместо обхода индекса.
+
+Запуск из корня репозитория:
+    python -m scripts.check_query_plans
+"""
+import os
+import sqlite3
+import sys
+import tempfile
+
+DB_DIR = tempfile.mkdtemp(prefix="query-plans-")
+DB_PATH = os.path.join(DB_DIR, "plans.db")
+os.environ["DATABASE_URL"] = f"sqlite+aiosqlite:///{DB_PATH}"
+
+from fastapi.testclient import TestClient  # noqa: E402
+from sqlalchemy import event  # noqa: E402
+
+from app.database.database import engine  # noqa: E402
+from main import app  # noqa: E402
+
+# Суффикс сценария: запрашивается вторая страница по курсору из X-Next-Cursor
+CURSOR = "#cursor"
+
+# (эндпоинт, допустимые отклонения плана с обоснованием)
+SCENARIOS: list[tuple[str, dict[str, str]]] = [
+    ("/api/projects/", {}),
+    ("/api/projects/?limit=1" + CURSOR, {}),
+    ("/api/projects/?status=open", {}),
+    ("/api/projects/?status=open&min_budget=10&max_budget=1000", {}),
+    ("/api/projects/?ids=2,1,99", {}),
+    ("/api/projects/?expand=client.role", {}),
+    ("/api/projects/?expand=client,skills", {}),
+    ("/api/projects/?search=web", {
+        "TEMP B-TREE": "сортировка по рангу BM25 выполняется только по совпавшим строкам",
+    }),
+    ("/api/proposals/", {}),
+    ("/api/proposals/?project_id=1", {}),
+    ("/api/proposals/?freelancer_id=1", {}),
+    ("/api/proposals/?status=pending", {}),
+    ("/api/proposals/?expand=project.client,freelancer.user,freelancer.skills", {}),
+    ("/api/messages/", {
+        "TEMP B-TREE": "OR по sender_id/recipient_id объединяет два индекса",
+    }),
+    ("/api/messages/?unread_only=true", {
+        "TEMP B-TREE": "OR по sender_id/recipient_id объединяет два индекса",
+    }),
+    ("/api/messages/unread-count", {}),
+    ("/api/messages/conversations", {
+        "TEMP B-TREE": "сортировка только диалогов пользователя, найденных по двум индексам",
+    }),
+    ("/api/messages/conversations/2", {}),
+    ("/api/messages/conversations/2?limit=1" + CURSOR, {}),
+    ("/api/reviews/", {}),
+    ("/api/reviews/?freelancer_id=1", {}),
+    ("/api/reviews/?project_id=1", {}),
+    ("/api/reviews/?expand=reviewer,freelancer.skills", {}),
+    ("/api/payments/", {}),
+    ("/api/payments/?status=pending", {}),
+    ("/api/payments/?proposal_id=1", {}),
+    ("/api/users/", {}),
+    ("/api/users/?limit=1" + CURSOR, {}),
+    ("/api/users/?role_id=1", {}),
+    ("/api/users/?ids=1,2", {}),
+    ("/api/freelancers/", {}),
+    ("/api/freelancers/?ids=1,2", {}),
+    ("/api/freelancers/?expand=user.role,skills", {}),
+    ("/api/freelancers/?ids=1,2&expand=skills", {}),
+    ("/api/freelancers/?search=dev", {
+        "SCAN": "поиск по подстроке (ILIKE) не индексируется",
+    }),
+    ("/api/freelancers/?min_avg_rating=4", {
+        "SCAN": "средний рейтинг - выражение по двум колонкам, читается из строки фрилансера",
+    }),
+    ("/api/skills/", {}),
+    ("/api/skills/?ids=1,2", {}),
+    ("/api/skills/?limit=1" + CURSOR, {}),
+    ("/api/freelancer-skills/?skill_id=1", {}),
+    ("/api/project-skills/?skill_id=1", {}),
+    ("/api/projects/1/matches", {}),
+]
+
+
+def seed(client: TestClient) -> None:
+    for name in ("admin", "client", "freelancer"):
+        client.post("/api/auth/roles", json={"name": name})
+    client.post("/api/auth/register", json={
+        "name": "Admin", "email": "admin@plans.local", "password": "secret", "role_id": 1,
+    })
+    response = client.post("/api/auth/login", json={
+        "email": "admin@plans.local", "password": "secret",
+    })
+    client.cookies.set("access_token", response.json()["access_token"])
+    client.post("/api/auth/register", json={
+        "name": "Client", "email": "client@plans.local", "password": "secret", "role_id": 2,
+    })
+    client.post("/api/projects/", json={"title": "Web shop", "description": "Web developer"})
+    client.post("/api/projects/", json={"title": "Logo", "description": "Design"})
+    client.post("/api/messages/", json={"content": "Привет", "recipient_id": 2})
+    client.post("/api/messages/", json={"content": "Как дела?", "recipient_id": 2})
+    client.post("/api/freelancers/", json={"user_id": 1, "bio": "dev"})
+    client.post("/api/skills/", json={"name": "python"})
+    client.post("/api/skills/", json={"name": "sql"})
+
+
+def problems_of(sql: str, plan: list[str], allowed: dict[str, str]) -> list[str]:
+    problems = []
+    has_where = " WHERE " in sql.upper()
+    for line in plan:
+        if "TEMP B-TREE" in line and "TEMP B-TREE" not in allowed:
+            problems.append(line)
+        bare_scan = line.startswith("SCAN ") and " USING " not in line and "VIRTUAL TABLE" not in line
+        # Сканирование без WHERE ограничено LIMIT и идет в порядке первичного ключа
+        if bare_scan and has_where and "SCAN" not in allowed:
+            problems.append(line)
+    return problems
+
+
+def main() -> int:
+    captured: list[tuple[str, tuple]] = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT"):
+            captured.append((statement, tuple(parameters or ())))
+
+    failures = 0
+    with TestClient(app) as client:
+        seed(client)
+        event.listen(engine.sync_engine, "before_cursor_execute", capture)
+        explain = sqlite3.connect(DB_PATH)
+
+        for url, allowed in SCENARIOS:
+            if url.endswith(CURSOR):
+                url = url.removesuffix(CURSOR)
+                cursor = client.get(url).headers.get("X-Next-Cursor")
+                if cursor is None:
+                    print(f"FAIL {url}: нет заголовка X-Next-Cursor")
+                    failures += 1
+                    continue
+                url = f"{url}&cursor={cursor}"
+
+            captured.clear()
+            response = client.get(url)
+            if response.status_code != 200:
+                print(f"FAIL {url}: HTTP {response.status_code}")
+                failures += 1
+                continue
+
+            for sql, params in captured:
+                plan = [
+                    row[3]
+                    for row in explain.execute(f"EXPLAIN QUERY PLAN {sql}", params)
+                ]
+                problems = problems_of(sql, plan, allowed)
+                status = "FAIL" if problems else "ok  "
+                print(f"{status} {url}")
+                for line in plan:
+                    print(f"       {line}")
+                for reason in allowed.values():
+                    print(f"       (допускается: {reason})")
+                failures += bool(problems)
+
+        event.remove(engine.sync_engine, "before_cursor_execute", capture)
+        explain.close()
+
+    print(f"\nПроблемных запросов: {failures}")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
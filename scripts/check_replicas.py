@@ -0,0 +1,152 @@
+"""
+Проверка маршрутизации чтений между основной БД и репликами.
+
+Поднимает приложение на временной основной БД с двумя репликами - копиями
+основного файла SQLite. В каждой копии навык #1 переименован, поэтому по
+ответу GET /api/skills/1 видно, какая БД его обслужила. Проверяется:
+- чтения распределяются по репликам по кругу (round-robin);
+- реплика, соединение с которой оборвалось во время запроса
+  (connection_invalidated), исключается из ротации и возвращается после
+  DB_REPLICA_EJECT_SECONDS;
+- после записи cookie db_primary_until направляет чтения пользователя в
+  основную БД, а по истечении окна - снова на реплики.
+
+Запуск из корня репозитория:
+    python -m scripts.check_replicas
+"""
+import asyncio
+import os
+import sqlite3
+import sys
+import tempfile
+import time
+
+DB_DIR = tempfile.mkdtemp(prefix="replicas-")
+PRIMARY_PATH = os.path.join(DB_DIR, "primary.db")
+REPLICA_PATHS = [os.path.join(DB_DIR, f"replica{i}.db") for i in range(2)]
+DB_URL = f"sqlite+aiosqlite:///{PRIMARY_PATH}"
+os.environ["DATABASE_URL"] = DB_URL
+os.environ["DATABASE_REPLICA_URLS"] = ",".join(f"sqlite+aiosqlite:///{path}" for path in REPLICA_PATHS)
+os.environ["DB_REPLICA_EJECT_SECONDS"] = "1"
+os.environ["DB_READ_YOUR_WRITES_SECONDS"] = "1"
+
+from fastapi.testclient import TestClient  # noqa: E402
+from sqlalchemy import event  # noqa: E402
+
+from app.database.replicas import PRIMARY_UNTIL_COOKIE, replica_set  # noqa: E402
+from main import app  # noqa: E402
+from scripts import seed_data  # noqa: E402
+
+SKILL_URL = "/api/skills/1"
+PRIMARY = "primary"
+REPLICAS = [f"replica{i}" for i in range(len(REPLICA_PATHS))]
+ROUNDS = 6
+
+
+def make_replicas() -> None:
+    """Копии основной БД; навык #1 в каждой копии помечен ее именем"""
+    source = sqlite3.connect(PRIMARY_PATH)
+    for path in REPLICA_PATHS:
+        target = sqlite3.connect(path)
+        source.backup(target)
+        target.close()
+    source.close()
+    for path, name in [(PRIMARY_PATH, PRIMARY), *zip(REPLICA_PATHS, REPLICAS)]:
+        conn = sqlite3.connect(path)
+        conn.execute("UPDATE skills SET name = ? WHERE id = 1", (name,))
+        conn.commit()
+        conn.close()
+
+
+class Disconnect:
+    """Обрыв соединения с репликой во время выполнения запроса"""
+
+    def __init__(self, engine) -> None:
+        self.engine = engine.sync_engine
+        self.armed = False
+        event.listen(self.engine, "before_cursor_execute", self.fail, retval=True)
+        event.listen(self.engine, "handle_error", self.mark_disconnect)
+
+    def fail(self, conn, cursor, statement, parameters, context, executemany):
+        # Ошибка должна возникнуть в драйвере, чтобы SQLAlchemy обернула ее в DBAPIError
+        if self.armed:
+            self.armed = False
+            statement = "SELECT * FROM replica_connection_lost"
+        return statement, parameters
+
+    @staticmethod
+    def mark_disconnect(context):
+        # Для SQLite такая ошибка не считается обрывом - помечаем явно,
+        # как это сделал бы драйвер сетевой БД
+        context.is_disconnect = True
+
+    def remove(self) -> None:
+        event.remove(self.engine, "before_cursor_execute", self.fail)
+        event.remove(self.engine, "handle_error", self.mark_disconnect)
+
+
+def main() -> int:
+    asyncio.run(seed_data.seed(seed_data.build_parser().parse_args(
+        ["--database-url", DB_URL, "--users", "200", "--skills", "20"]
+    )))
+    make_replicas()
+
+    failures = 0
+
+    def report(ok: bool, text: str) -> None:
+        nonlocal failures
+        print(f"{'ok  ' if ok else 'FAIL'} {text}")
+        failures += not ok
+
+    def served_by(client: TestClient) -> list[str]:
+        return [client.get(SKILL_URL).json()["name"] for _ in range(ROUNDS)]
+
+    with TestClient(app, raise_server_exceptions=False) as client:
+        # Round-robin
+        names = served_by(client)
+        report(
+            names == [REPLICAS[i % len(REPLICAS)] for i in range(ROUNDS)],
+            f"чтения по кругу: {' '.join(names)}",
+        )
+
+        # Обрыв соединения с replica0 во время запроса
+        disconnect = Disconnect(replica_set.engines[0])
+        # Следующее чтение - с replica0
+        replica_set._next = 0
+        disconnect.armed = True
+        status = client.get(SKILL_URL).status_code
+        available = [replica["available"] for replica in replica_set.stats()]
+        report(available == [False, True], f"после обрыва (HTTP {status}) доступность реплик: {available}")
+        names = served_by(client)
+        report(set(names) == {REPLICAS[1]}, f"исключенная реплика не читается: {' '.join(names)}")
+        disconnect.remove()
+
+        time.sleep(replica_set.eject_seconds + 0.1)
+        names = served_by(client)
+        report(set(names) == set(REPLICAS), f"реплика вернулась через {replica_set.eject_seconds} с: {' '.join(names)}")
+
+        # Read-your-writes
+        response = client.post("/api/auth/login", json={
+            "email": "user1@seed.example", "password": "password",
+        })
+        client.cookies.set("access_token", response.json()["access_token"])
+        client.cookies.delete(PRIMARY_UNTIL_COOKIE)
+        names = served_by(client)
+        report(PRIMARY not in names, f"без записи чтения идут на реплики: {' '.join(names)}")
+
+        response = client.put(SKILL_URL, json={"name": "renamed"})
+        cookie = client.cookies.get(PRIMARY_UNTIL_COOKIE)
+        report(response.status_code == 200 and cookie is not None, f"запись: HTTP {response.status_code}, {PRIMARY_UNTIL_COOKIE}={cookie}")
+        names = served_by(client)
+        report(set(names) == {"renamed"}, f"после записи чтения идут в основную БД: {' '.join(names)}")
+
+        time.sleep(float(cookie) - time.time() + 0.1)
+        names = served_by(client)
+        report(set(names) == set(REPLICAS), f"после окна чтения снова на репликах: {' '.join(names)}")
+
+    print(f"\nОшибок: {failures}")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
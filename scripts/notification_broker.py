@@ -0,0 +1,90 @@
+"""
+Локальный брокер push-уведомлений для нескольких воркеров uvicorn.
+
+Каждая строка (JSON), полученная от воркера, рассылается всем подключенным
+воркерам. Это замена внешнему брокеру (Redis pub/sub и т.п.) для запуска на
+одной машине.
+
+Запуск из корня репозитория:
+    python -m scripts.notification_broker
+    NOTIFY_BACKEND=broker uvicorn main:app --workers 4
+"""
+import argparse
+import asyncio
+
+from app.config import settings
+
+
+class Worker:
+    """
+    Подключенный воркер. Строки для него копятся в ограниченной очереди и
+    отправляются отдельной задачей, поэтому медленный воркер не задерживает
+    рассылку остальным: при переполнении его очереди строки отбрасываются.
+    """
+
+    def __init__(self, writer: asyncio.StreamWriter, queue_size: int) -> None:
+        self.writer = writer
+        self.dropped = 0
+        self.outgoing: asyncio.Queue[bytes] = asyncio.Queue(maxsize=queue_size)
+
+    def send(self, line: bytes) -> None:
+        try:
+            self.outgoing.put_nowait(line)
+        except asyncio.QueueFull:
+            self.dropped += 1
+
+    async def write_loop(self) -> None:
+        while True:
+            self.writer.write(await self.outgoing.get())
+            await self.writer.drain()
+
+
+workers: set[Worker] = set()
+
+
+def relay(line: bytes) -> None:
+    for worker in workers:
+        worker.send(line)
+
+
+async def handle_worker(reader: asyncio.StreamReader, writer: asyncio.StreamWriter, queue_size: int) -> None:
+    peer = writer.get_extra_info("peername")
+    print(f"Воркер подключен: {peer}")
+    worker = Worker(writer, queue_size)
+    workers.add(worker)
+    sender = asyncio.create_task(worker.write_loop())
+    try:
+        while line := await reader.readline():
+            relay(line)
+            # Отправка упала - воркер недоступен
+            if sender.done():
+                break
+    except ConnectionError:
+        pass
+    finally:
+        workers.discard(worker)
+        sender.cancel()
+        writer.close()
+        print(f"Воркер отключен: {peer} (отброшено строк: {worker.dropped})")
+
+
+async def serve(host: str, port: int, queue_size: int) -> None:
+    server = await asyncio.start_server(
+        lambda reader, writer: handle_worker(reader, writer, queue_size), host, port
+    )
+    print(f"Брокер уведомлений слушает {host}:{port}")
+    async with server:
+        await server.serve_forever()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--host", default=settings.NOTIFY_BROKER_HOST)
+    parser.add_argument("--port", type=int, default=settings.NOTIFY_BROKER_PORT)
+    parser.add_argument("--queue-size", type=int, default=settings.NOTIFY_BROKER_QUEUE_SIZE)
+    args = parser.parse_args()
+    asyncio.run(serve(args.host, args.port, args.queue_size))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,44 @@
+"""
+Сверка агрегатов рейтинга фрилансеров с таблицей отзывов.
+
+Агрегаты (rating_count, rating_sum, rating_1..rating_5) обновляются вместе с
+отзывами, но могут разойтись после ручных правок БД или импорта данных.
+Скрипт пересчитывает их и исправляет только расходящиеся строки.
+
+Запуск из корня репозитория:
+    python -m scripts.rebuild_ratings
+    python -m scripts.rebuild_ratings --freelancer-id 42
+"""
+import argparse
+import asyncio
+
+from app.database.database import async_session_maker, engine
+from app.repositories.freelancers import FreelancersRepository
+
+# Импортируем все модели, чтобы связи ORM были сконфигурированы
+from app.models import (  # noqa: F401
+    users, roles, freelancers, projects, proposals,
+    payments, reviews, messages, skills, freelancer_skills, responces,
+    unread_counters, conversations, project_skills
+)
+
+
+async def rebuild(freelancer_id: int | None) -> int:
+    async with async_session_maker() as session:
+        fixed = await FreelancersRepository(session).rebuild_ratings(freelancer_id)
+        await session.commit()
+    await engine.dispose()
+    return fixed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--freelancer-id", type=int, default=None)
+    args = parser.parse_args()
+
+    fixed = asyncio.run(rebuild(args.freelancer_id))
+    print(f"Исправлено фрилансеров: {fixed}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,488 @@
+"""
+Генератор синтетических данных для замеров производительности.
+
+Создает воспроизводимый (по --seed) набор данных заданного масштаба: роли,
+пользователи, фрилансеры, навыки и граф навыков, проекты, предложения,
+платежи, отзывы, диалоги и сообщения. Распределения неравномерные, как в
+жизни: популярность навыков и активность клиентов - по закону Ципфа, число
+предложений на проект и длина переписки - логнормальные с тяжелым хвостом.
+Денормализованные данные (агрегаты рейтинга, счетчики непрочитанных,
+последнее сообщение диалога) согласованы с исходными таблицами.
+
+Загрузка идет в обход ORM: строки генерируются столбцами в numpy и
+вставляются самым быстрым путем драйвера - executemany для SQLite,
+COPY для asyncpg. Вторичные индексы и полнотекстовый индекс строятся
+один раз после загрузки. Целевая база должна быть пустой.
+
+Пароль всех созданных пользователей - "password" (user<id>@seed.example).
+
+Запуск из корня репозитория (--users 500000 дает ~10 млн строк):
+    python -m scripts.seed_data --users 100000
+    DATABASE_URL=sqlite+aiosqlite:////tmp/seed.db python -m scripts.seed_data --users 500000
+"""
+import argparse
+import asyncio
+import time
+from operator import itemgetter
+from typing import Callable, Sequence
+
+import numpy as np
+from sqlalchemy import Table, func, insert, select, text
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine
+
+from app.config import settings
+from app.database.database import Base, build_engine
+from app.database.search import project_search
+from app.models.projects import ProjectStatus
+from app.services.versions import table_versions
+from app.utils.security import get_password_hash
+
+# Импортируем все модели, чтобы связи ORM были сконфигурированы
+from app.models import (  # noqa: F401
+    users, roles, freelancers, projects, proposals,
+    payments, reviews, messages, skills, freelancer_skills, responces,
+    unread_counters, conversations, project_skills
+)
+
+ROLES = {"admin": 1, "client": 2, "freelancer": 3}
+
+# Статусы проектов и их доли
+PROJECT_STATUSES = [
+    (ProjectStatus.OPEN, 0.50),
+    (ProjectStatus.IN_PROGRESS, 0.20),
+    (ProjectStatus.COMPLETED, 0.25),
+    (ProjectStatus.CANCELLED, 0.05),
+]
+# Распределение оценок 1..5 (большинство отзывов положительные)
+RATING_WEIGHTS = [0.03, 0.04, 0.10, 0.30, 0.53]
+
+FIRST_NAMES = ["Анна", "Иван", "Мария", "Алексей", "Елена", "Дмитрий", "Ольга", "Сергей",
+               "Наталья", "Павел", "Татьяна", "Андрей", "Юлия", "Михаил", "Ксения", "Артем"]
+LAST_NAMES = ["Иванов", "Смирнов", "Кузнецов", "Попов", "Васильев", "Петров", "Соколов",
+              "Михайлов", "Новиков", "Федоров", "Морозов", "Волков", "Алексеев", "Лебедев"]
+SYLLABLES = ["ba", "ko", "ri", "de", "web", "app", "tor", "lin", "sa", "mu",
+             "ne", "zo", "ter", "pro", "dev", "gra", "fi", "lo", "qu", "ex"]
+
+START = np.datetime64("2023-01-01T00:00:00", "s")
+PERIOD_SECONDS = 2 * 365 * 24 * 3600
+
+# Значения столбца: массив, список или функция (start, stop) -> список,
+# которая генерирует значения пачки по требованию (тексты не держатся в памяти)
+Column = np.ndarray | list | Callable[[int, int], list]
+
+
+def make_vocabulary(rng: np.random.Generator, size: int) -> list[str]:
+    """Детерминированный словарь уникальных псевдослов"""
+    words: dict[str, None] = {}
+    while len(words) < size:
+        parts = rng.integers(0, len(SYLLABLES), size=rng.integers(2, 5))
+        words["".join(SYLLABLES[part] for part in parts)] = None
+    return list(words)
+
+
+def skewed_choice(rng: np.random.Generator, ids: np.ndarray, size: int, s: float = 1.3) -> np.ndarray:
+    """
+    Выбор из ids с распределением Ципфа. Ранги перемешаны, чтобы популярными
+    были случайные объекты, а не объекты с наименьшими id.
+    """
+    order = rng.permutation(len(ids))
+    ranks = (rng.zipf(s, size=size) - 1) % len(ids)
+    return ids[order[ranks]]
+
+
+def lognormal_counts(rng: np.random.Generator, size: int, mean: float, sigma: float, high: int) -> np.ndarray:
+    """Неотрицательные целые с заданным средним и тяжелым хвостом"""
+    mu = np.log(mean) - sigma ** 2 / 2
+    return np.minimum(np.rint(rng.lognormal(mu, sigma, size=size)), high).astype(np.int64)
+
+
+def random_pairs(rng: np.random.Generator, items: int, skills: int, low: int, high: int):
+    """Пары (объект, навык) без повторов внутри объекта"""
+    degree = rng.integers(low, high + 1, size=items)
+    item_ids = np.repeat(np.arange(1, items + 1), degree)
+    skill_ids = skewed_choice(rng, np.arange(1, skills + 1), len(item_ids), s=1.2)
+    pairs = np.unique(np.stack([item_ids, skill_ids], axis=1), axis=0)
+    return pairs[:, 0], pairs[:, 1]
+
+
+def random_times(rng: np.random.Generator, size: int) -> np.ndarray:
+    return START + rng.integers(0, PERIOD_SECONDS, size=size).astype("timedelta64[s]")
+
+
+def after(rng: np.random.Generator, moments: np.ndarray, max_days: float) -> np.ndarray:
+    """Случайные моменты в пределах max_days после moments"""
+    offsets = rng.integers(60, int(max_days * 24 * 3600), size=len(moments))
+    return moments + offsets.astype("timedelta64[s]")
+
+
+def texts(seed: int, stream: int, vocabulary: list[str], low: int, high: int) -> Callable[[int, int], list]:
+    """
+    Тексты из low..high слов словаря. Генератор пачки зависит только от seed,
+    потока и начала пачки, поэтому результат не зависит от размера пачки.
+    """
+    def generate(start: int, stop: int) -> list[str]:
+        rng = np.random.default_rng([seed, stream, start])
+        lengths = rng.integers(low, high + 1, size=stop - start)
+        words = itemgetter(*rng.integers(0, len(vocabulary), size=int(lengths.sum())).tolist())(vocabulary)
+        ends = np.cumsum(lengths).tolist()
+        return [" ".join(words[end - length:end]) for end, length in zip(ends, lengths.tolist())]
+    return generate
+
+
+def generate(args: argparse.Namespace) -> dict[str, dict[str, Column]]:
+    """Все таблицы набора данных в порядке загрузки (внешние ключи - раньше)"""
+    rng = np.random.default_rng(args.seed)
+    vocabulary = make_vocabulary(rng, 5000)
+    data: dict[str, dict[str, Column]] = {}
+
+    data["roles"] = {"id": list(ROLES.values()), "name": list(ROLES)}
+
+    # ----- пользователи и фрилансеры -----
+    user_ids = np.arange(1, args.users + 1)
+    is_freelancer = rng.random(args.users) < args.freelancer_share
+    freelancer_users = user_ids[is_freelancer]
+    client_users = user_ids[~is_freelancer]
+    first = rng.integers(0, len(FIRST_NAMES), size=args.users).tolist()
+    last = rng.integers(0, len(LAST_NAMES), size=args.users).tolist()
+    password = get_password_hash("password")
+    data["users"] = {
+        "id": user_ids,
+        "name": [f"{FIRST_NAMES[f]} {LAST_NAMES[l]}" for f, l in zip(first, last)],
+        "email": lambda start, stop: [f"user{i}@seed.example" for i in range(start + 1, stop + 1)],
+        "hashed_password": lambda start, stop: [password] * (stop - start),
+        "role_id": np.where(is_freelancer, ROLES["freelancer"], ROLES["client"]),
+    }
+
+    freelancer_count = len(freelancer_users)
+    freelancer_ids = np.arange(1, freelancer_count + 1)
+    has_portfolio = (rng.random(freelancer_count) < 0.6).tolist()
+    data["skills"] = {
+        "id": np.arange(1, args.skills + 1),
+        "name": make_vocabulary(rng, args.skills),
+    }
+    fs_freelancer, fs_skill = random_pairs(rng, freelancer_count, args.skills, 3, 10)
+
+    # ----- проекты -----
+    project_count = int(len(client_users) * args.projects_per_client)
+    project_ids = np.arange(1, project_count + 1)
+    project_client = skewed_choice(rng, client_users, project_count, s=1.5)
+    project_created = random_times(rng, project_count)
+    statuses = np.array([status for status, _ in PROJECT_STATUSES], dtype=object)
+    status_code = rng.choice(len(statuses), size=project_count, p=[p for _, p in PROJECT_STATUSES])
+
+    # ----- предложения: популярные фрилансеры откликаются чаще -----
+    per_project = lognormal_counts(rng, project_count, args.proposals_per_project, 1.0, 300)
+    proposal_project = np.repeat(project_ids, per_project)
+    proposal_freelancer = skewed_choice(rng, freelancer_ids, len(proposal_project), s=1.2)
+    keys = np.unique(proposal_project * (freelancer_count + 1) + proposal_freelancer)
+    proposal_project, proposal_freelancer = keys // (freelancer_count + 1), keys % (freelancer_count + 1)
+    proposal_count = len(keys)
+    proposal_ids = np.arange(1, proposal_count + 1)
+    proposal_price = np.round(rng.lognormal(6.0, 0.9, size=proposal_count), 2)
+    proposal_submitted = after(rng, project_created[proposal_project - 1], 14)
+
+    # Проект в работе или завершен, только если есть предложения;
+    # принято первое предложение проекта, остальные отклонены
+    has_proposals = np.zeros(project_count + 1, dtype=bool)
+    has_proposals[proposal_project] = True
+    assigned_codes = (1, 2)
+    status_code[np.isin(status_code, assigned_codes) & ~has_proposals[1:]] = 0
+    _, first_proposal = np.unique(proposal_project, return_index=True)
+    project_of_first = proposal_project[first_proposal]
+    accepted = first_proposal[np.isin(status_code[project_of_first - 1], assigned_codes)]
+    proposal_code = status_code[proposal_project - 1]
+    proposal_status = np.where(np.isin(proposal_code, (0,)), "pending", "rejected").astype(object)
+    proposal_status[accepted] = "accepted"
+
+    # ----- платежи за принятые предложения -----
+    accepted_project = proposal_project[accepted]
+    paid = status_code[accepted_project - 1] == 2
+    payment_date = np.where(
+        paid, after(rng, proposal_submitted[accepted], 60), np.datetime64("NaT", "s")
+    )
+
+    # ----- отзывы клиентов о завершенных проектах -----
+    reviewed = accepted[paid & (rng.random(len(accepted)) < 0.8)]
+    review_count = len(reviewed)
+    review_freelancer = proposal_freelancer[reviewed]
+    review_rating = rng.choice(np.arange(1, 6), size=review_count, p=RATING_WEIGHTS)
+
+    # Агрегаты рейтинга (как FreelancersRepository.rebuild_ratings)
+    histogram = np.zeros((6, freelancer_count + 1), dtype=np.int64)
+    np.add.at(histogram, (review_rating, review_freelancer), 1)
+    data["freelancers"] = {
+        "id": freelancer_ids,
+        "user_id": freelancer_users,
+        "bio": texts(args.seed, 1, vocabulary, 10, 40),
+        "hourly_rate": np.round(rng.lognormal(3.3, 0.6, size=freelancer_count), 2),
+        "portfolio_url": [
+            f"https://portfolio.seed.example/{i}" if has else None
+            for i, has in zip(freelancer_ids.tolist(), has_portfolio)
+        ],
+        "rating_count": histogram[1:].sum(axis=0)[1:],
+        "rating_sum": (histogram[1:] * np.arange(1, 6)[:, None]).sum(axis=0)[1:],
+        **{f"rating_{r}": histogram[r, 1:] for r in range(1, 6)},
+    }
+    data["freelancer_skills"] = {"freelancer_id": fs_freelancer, "skill_id": fs_skill}
+
+    ps_project, ps_skill = random_pairs(rng, project_count, args.skills, 2, 6)
+    data["projects"] = {
+        "id": project_ids,
+        "title": texts(args.seed, 2, vocabulary, 3, 7),
+        "description": texts(args.seed, 3, vocabulary, 15, 60),
+        "budget": np.round(rng.lognormal(7.0, 1.0, size=project_count), 2),
+        "deadline": after(rng, project_created, 90),
+        "status": statuses[status_code],
+        "client_id": project_client,
+        "created_at": project_created,
+    }
+    data["project_skills"] = {"project_id": ps_project, "skill_id": ps_skill}
+    data["proposals"] = {
+        "id": proposal_ids,
+        "cover_message": texts(args.seed, 4, vocabulary, 10, 50),
+        "proposed_price": proposal_price,
+        "status": proposal_status,
+        "submitted_at": proposal_submitted,
+        "project_id": proposal_project,
+        "freelancer_id": proposal_freelancer,
+    }
+    data["payments"] = {
+        "id": np.arange(1, len(accepted) + 1),
+        "amount": proposal_price[accepted],
+        "currency": ["USD"] * len(accepted),
+        "status": np.where(paid, "completed", "pending").astype(object),
+        "payment_date": payment_date,
+        "proposal_id": proposal_ids[accepted],
+    }
+    data["reviews"] = {
+        "id": np.arange(1, review_count + 1),
+        "rating": review_rating,
+        "comment": texts(args.seed, 5, vocabulary, 5, 30),
+        "created_at": after(rng, proposal_submitted[reviewed], 90),
+        "project_id": proposal_project[reviewed],
+        "reviewer_id": project_client[proposal_project[reviewed] - 1],
+        "freelancer_id": review_freelancer,
+    }
+
+    # ----- переписка: клиент проекта и откликнувшийся фрилансер -----
+    wanted = max(args.users * args.messages_per_user // 8, 1)
+    picked = rng.choice(proposal_count, size=min(wanted, proposal_count), replace=False)
+    a = project_client[proposal_project[picked] - 1]
+    b = freelancer_users[proposal_freelancer[picked] - 1]
+    pairs = np.unique(np.stack([np.minimum(a, b), np.maximum(a, b)], axis=1), axis=0)
+    low, high = pairs[:, 0], pairs[:, 1]
+    conversation_count = len(pairs)
+    conversation_ids = np.arange(1, conversation_count + 1)
+    # Длина диалога подбирается так, чтобы сообщений было около users * messages_per_user
+    mean_length = max(args.users * args.messages_per_user / conversation_count, 1.0)
+    lengths = np.maximum(lognormal_counts(rng, conversation_count, mean_length, 1.0, 5000), 1)
+
+    message_conversation = np.repeat(conversation_ids, lengths)
+    message_count = len(message_conversation)
+    # Сообщения одного диалога идут подряд и по возрастанию времени
+    conversation_start = random_times(rng, conversation_count)
+    gaps = rng.integers(30, 6 * 3600, size=message_count)
+    first_message = np.cumsum(lengths) - lengths
+    elapsed = np.cumsum(gaps) - np.repeat(np.cumsum(gaps)[first_message] - gaps[first_message], lengths)
+    message_time = conversation_start[message_conversation - 1] + elapsed.astype("timedelta64[s]")
+    from_low = rng.random(message_count) < 0.5
+    sender = np.where(from_low, low[message_conversation - 1], high[message_conversation - 1])
+    recipient = np.where(from_low, high[message_conversation - 1], low[message_conversation - 1])
+    # Непрочитанными остаются последние сообщения части диалогов
+    position_from_end = np.repeat(np.cumsum(lengths), lengths) - np.arange(1, message_count + 1)
+    unread_tail = np.repeat(np.where(rng.random(conversation_count) < 0.3,
+                                     rng.integers(1, 4, size=conversation_count), 0), lengths)
+    is_unread = position_from_end < unread_tail
+
+    last_message = np.cumsum(lengths) - 1
+    unread_to_low = np.bincount(message_conversation[is_unread & ~from_low] - 1, minlength=conversation_count)
+    unread_to_high = np.bincount(message_conversation[is_unread & from_low] - 1, minlength=conversation_count)
+    data["conversations"] = {
+        "id": conversation_ids,
+        "user_low_id": low,
+        "user_high_id": high,
+        # last_message_id заполняется после загрузки сообщений (см. link_last_messages)
+        "last_message_at": message_time[last_message],
+        "unread_low": unread_to_low,
+        "unread_high": unread_to_high,
+    }
+    data["messages"] = {
+        "id": np.arange(1, message_count + 1),
+        "content": texts(args.seed, 6, vocabulary, 3, 25),
+        "timestamp": message_time,
+        "is_read": ~is_unread,
+        "sender_id": sender,
+        "recipient_id": recipient,
+        "conversation_id": message_conversation,
+    }
+
+    unread = np.bincount(recipient[is_unread], minlength=args.users + 1)
+    recipients = np.unique(recipient)
+    data["unread_counters"] = {"user_id": recipients, "count": unread[recipients]}
+    return data
+
+
+def column_length(values: Column) -> int | None:
+    return None if callable(values) else len(values)
+
+
+def take(values: Column, start: int, stop: int) -> list:
+    if callable(values):
+        return values(start, stop)
+    chunk = values[start:stop]
+    if isinstance(chunk, np.ndarray):
+        if np.issubdtype(chunk.dtype, np.datetime64):
+            # NaT превращается в None
+            chunk = chunk.astype("datetime64[us]")
+        return chunk.tolist()
+    return chunk
+
+
+class Loader:
+    """Пакетная вставка строк самым быстрым доступным путем драйвера"""
+
+    def __init__(self, conn: AsyncConnection, batch_size: int) -> None:
+        self.conn = conn
+        self.dialect = conn.dialect
+        self.batch_size = batch_size
+
+    def _processors(self, table: Table, names: Sequence[str]) -> list:
+        # Преобразования типов SQLAlchemy (Enum -> имя, DateTime -> строка в SQLite),
+        # которые при вставке через драйвер нужно выполнить самим
+        return [table.c[name].type.dialect_impl(self.dialect).bind_processor(self.dialect) for name in names]
+
+    async def _insert(self, table: Table, names: list[str], rows: list[tuple]) -> None:
+        if self.dialect.name == "sqlite":
+            placeholders = ", ".join("?" * len(names))
+            await self.conn.exec_driver_sql(
+                f"INSERT INTO {table.name} ({', '.join(names)}) VALUES ({placeholders})", rows
+            )
+        elif self.dialect.driver == "asyncpg":
+            raw = await self.conn.get_raw_connection()
+            await raw.driver_connection.copy_records_to_table(table.name, records=rows, columns=names)
+        else:
+            await self.conn.execute(insert(table), [dict(zip(names, row)) for row in rows])
+
+    async def load(self, table: Table, columns: dict[str, Column]) -> int:
+        names = list(columns)
+        total = min(length for values in columns.values() if (length := column_length(values)) is not None)
+        native = self.dialect.name == "sqlite" or self.dialect.driver == "asyncpg"
+        processors = self._processors(table, names) if native else [None] * len(names)
+
+        for start in range(0, total, self.batch_size):
+            stop = min(start + self.batch_size, total)
+            batch = []
+            for values, process in zip(columns.values(), processors):
+                chunk = take(values, start, stop)
+                if process is not None:
+                    chunk = [None if value is None else process(value) for value in chunk]
+                batch.append(chunk)
+            await self._insert(table, names, list(zip(*batch)))
+        return total
+
+
+async def prepare_schema(engine: AsyncEngine) -> None:
+    """Создает таблицы и снимает индексы, которые дешевле построить после загрузки"""
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+        if (await conn.execute(select(func.count()).select_from(Base.metadata.tables["users"]))).scalar():
+            raise SystemExit("База не пуста: генератор загружает данные только в пустую базу")
+
+        if conn.dialect.name == "sqlite":
+            # Триггеры FTS пересчитывали бы индекс на каждую вставку проекта
+            for name in ("projects_fts_ai", "projects_fts_ad", "projects_fts_au"):
+                await conn.execute(text(f"DROP TRIGGER IF EXISTS {name}"))
+            await conn.execute(text("DROP TABLE IF EXISTS projects_fts"))
+        elif conn.dialect.name == "postgresql":
+            await conn.execute(text("DROP INDEX IF EXISTS ix_projects_search_vector"))
+
+        def drop_indexes(sync_conn) -> None:
+            for table in Base.metadata.sorted_tables:
+                for index in table.indexes:
+                    index.drop(sync_conn, checkfirst=True)
+
+        await conn.run_sync(drop_indexes)
+
+
+async def finish_schema(engine: AsyncEngine) -> None:
+    """Индексы, полнотекстовый поиск, ссылки на последние сообщения и статистика"""
+    async with engine.begin() as conn:
+        def create_indexes(sync_conn) -> None:
+            for table in Base.metadata.sorted_tables:
+                for index in table.indexes:
+                    index.create(sync_conn, checkfirst=True)
+
+        await conn.run_sync(create_indexes)
+        await conn.run_sync(project_search.setup)
+        await link_last_messages(conn)
+
+        if conn.dialect.name == "postgresql":
+            # Идентификаторы вставлены явно - сдвигаем последовательности
+            for table in Base.metadata.sorted_tables:
+                if "id" in table.c and table.c.id.autoincrement is not False and table.c.id.primary_key:
+                    await conn.execute(text(
+                        f"SELECT setval(pg_get_serial_sequence('{table.name}', 'id'), "
+                        f"coalesce(max(id), 1)) FROM {table.name}"
+                    ))
+        await conn.execute(text("ANALYZE"))
+
+
+async def link_last_messages(conn: AsyncConnection) -> None:
+    # Диалоги и сообщения ссылаются друг на друга, поэтому ссылка ставится после
+    # вставки сообщений; внутри диалога id растут вместе со временем
+    await conn.execute(text(
+        "UPDATE conversations SET last_message_id = "
+        "(SELECT max(id) FROM messages WHERE messages.conversation_id = conversations.id)"
+    ))
+
+
+async def seed(args: argparse.Namespace) -> None:
+    engine = build_engine(args.database_url)
+    started = time.perf_counter()
+    data = generate(args)
+    print(f"Генерация: {time.perf_counter() - started:.1f} с")
+
+    await prepare_schema(engine)
+    total_rows = 0
+    for name, columns in data.items():
+        table_started = time.perf_counter()
+        async with engine.begin() as conn:
+            if conn.dialect.name == "sqlite":
+                # Только для соединения загрузки: данные можно сгенерировать заново
+                await conn.exec_driver_sql("PRAGMA synchronous=OFF")
+                await conn.exec_driver_sql("PRAGMA cache_size=-262144")
+            rows = await Loader(conn, args.batch_size).load(Base.metadata.tables[name], columns)
+        seconds = time.perf_counter() - table_started
+        total_rows += rows
+        print(f"{name:<18} {rows:>11,} строк  {seconds:7.1f} с  {rows / max(seconds, 1e-9):>11,.0f} строк/с")
+
+    index_started = time.perf_counter()
+    await finish_schema(engine)
+    print(f"Индексы и статистика: {time.perf_counter() - index_started:.1f} с")
+    await engine.dispose()
+
+    # Кэши ответов работающих воркеров должны увидеть новые данные
+    table_versions.bump(*data)
+    print(f"Всего: {total_rows:,} строк за {time.perf_counter() - started:.1f} с")
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--database-url", default=settings.get_db_url())
+    parser.add_argument("--users", type=int, default=100_000)
+    parser.add_argument("--freelancer-share", type=float, default=0.35)
+    parser.add_argument("--skills", type=int, default=2000)
+    parser.add_argument("--projects-per-client", type=float, default=1.5)
+    parser.add_argument("--proposals-per-project", type=float, default=5.0)
+    parser.add_argument("--messages-per-user", type=int, default=6)
+    parser.add_argument("--batch-size", type=int, default=50_000)
+    parser.add_argument("--seed", type=int, default=42)
+    return parser
+
+
+def main() -> None:
+    asyncio.run(seed(build_parser().parse_args()))
+
+
+if __name__ == "__main__":
+    main()